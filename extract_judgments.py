@@ -1,22 +1,52 @@
+import html
 import json
+import os
 import re
 import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent / 'scripts'))
+
+# One pass over the HTML: script/style blocks and tags are dropped (block-level
+# tags, group 2, leave a word break) and entities are decoded
+HTML_MARKUP_RE = re.compile(
+    r'<(?:(script|style)\b.*?</\1\s*'
+    r'|(/?(?:p|div|br|li|tr|td|th|h[1-6]|table|ul|ol|blockquote)\b[^>]*)'
+    r'|[!/?a-zA-Z][^>]*)>'
+    r'|&(?:#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);?',
+    re.IGNORECASE | re.DOTALL)
+
+# Files handed to a worker process per task
+CHUNK_SIZE = 256
+
+# Payloads repeat the same handful of entities (&nbsp;, &quot;, ...); numeric
+# ones are unbounded, so the cache is capped
+@lru_cache(maxsize=1024)
+def _unescape(token):
+    return html.unescape(token)
+
+def _replace_markup(m):
+    token = m.group()
+    if token[0] == '&':
+        return _unescape(token)
+    return ' ' if m.group(2) else ''
+
 def clean_html(raw_html):
     """
-    Remove HTML tags and entities from text.
+    Extract plain text from an HTML fragment.
+
+    Tags are dropped (block-level tags act as a word break), every entity
+    is decoded with html.unescape (named and numeric), and runs of
+    whitespace, including decoded &nbsp;, collapse to one space.
     """
     if not raw_html:
         return ""
-    # Remove HTML tags
-    cleanr = re.compile('<.*?>')
-    cleantext = re.sub(cleanr, '', raw_html)
-    # Replace common HTML entities
-    cleantext = cleantext.replace('&nbsp;', ' ').replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&').replace('&quot;', '"').replace('&hellip;', '...')
-    # Normalize whitespace
-    cleantext = re.sub(r'\s+', ' ', cleantext).strip()
-    return cleantext
+    return ' '.join(HTML_MARKUP_RE.sub(_replace_markup, raw_html).split())
 
 def extract_info(data):
     """
@@ -52,57 +82,147 @@ def extract_info(data):
 
     return info
 
+def encode_json_item(info):
+    """One element of a json.dump(indent=2) list, already indented."""
+    return json.dumps(info, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+
+def encode_jsonl(info):
+    return json.dumps(info, ensure_ascii=False)
+
+# Output encoders run inside the workers, so the parent only writes strings
+ENCODERS = {'json': encode_json_item, 'jsonl': encode_jsonl, 'dict': None}
+
+def process_file(file_path, encoding='dict'):
+    """
+    Parse and clean one judgment file.
+    Returns (file stem, info or None, error message or None, size in bytes);
+    info is encoded with ENCODERS[encoding] when one is set.
+    """
+    file_path = Path(file_path)
+    try:
+        raw = file_path.read_bytes()
+        info = extract_info(json.loads(raw))
+        encoder = ENCODERS[encoding]
+        if info and encoder:
+            info = encoder(info)
+        return file_path.stem, info, None, len(raw)
+    except Exception as e:
+        return file_path.stem, None, f"Error processing {file_path.name}: {e}", 0
+
+def process_chunk(paths, encoding='dict'):
+    return [process_file(p, encoding) for p in paths]
+
+def iter_json_files(input_path):
+    """Yield *.json paths lazily (os.scandir does not build the whole listing)."""
+    with os.scandir(input_path) as entries:
+        for entry in entries:
+            if entry.name.endswith('.json') and entry.is_file():
+                yield entry.path
+
+def iter_chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def iter_extracted(files, jobs=1, chunk_size=CHUNK_SIZE, encoding='dict'):
+    """
+    Yield process_file() results in input order.
+
+    With jobs > 1, chunks of files are parsed in a process pool; at most
+    2 * jobs chunks are in flight, so memory stays bounded however many
+    files the directory holds.
+    """
+    if jobs <= 1:
+        for f in files:
+            yield process_file(f, encoding)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = []
+        chunks = iter_chunks(files, chunk_size)
+        for chunk in chunks:
+            pending.append(pool.submit(process_chunk, chunk, encoding))
+            if len(pending) >= 2 * jobs:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
+
 def main():
     parser = argparse.ArgumentParser(description='Extract structured data from legal judgment JSON files.')
     parser.add_argument('--input_dir', default=r'C:\Users\Alemr\Desktop\judicial_decisions\details', help='Directory containing JSON files')
     parser.add_argument('--output_file', default='extracted_judgments.json', help='Output JSON file path')
+    parser.add_argument('--jsonl', metavar='FILE', help='Stream judgments to this JSONL file instead of --output_file')
+    parser.add_argument('--sqlite', metavar='DB', help='Load judgments straight into this SQLite DB (e.g. data.db) instead of writing JSON')
+    parser.add_argument('--no-dedup', action='store_true', help='With --sqlite: import judgments even if their fingerprint is already in the DB')
+    parser.add_argument('--dedup-report', metavar='FILE', help='With --sqlite: write skipped duplicates to this JSONL file')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Worker processes for parsing/cleaning (1 = serial)')
+    parser.add_argument('--chunk_size', type=int, default=CHUNK_SIZE, help='Files per worker task')
 
     args = parser.parse_args()
 
     input_path = Path(args.input_dir)
-    output_file = args.output_file
 
     if not input_path.exists():
         print(f"Error: Input directory {input_path} does not exist.")
         return
 
-    json_files = list(input_path.glob('*.json'))
-    total_files = len(json_files)
+    print(f"Reading JSON files from {input_path} with {args.jobs} worker(s)")
+
+    if args.sqlite:
+        from judgments_db import JudgmentsLoader
+        sink = JudgmentsLoader(args.sqlite, source='sa_judicial', replace='case_id',
+                               dedup=not args.no_dedup, duplicates_report=args.dedup_report)
+        encoding = 'dict'
+    elif args.jsonl:
+        from judgment_stream import JsonlJudgmentWriter
+        sink = JsonlJudgmentWriter(args.jsonl)
+        encoding = 'jsonl'
+    else:
+        from judgment_stream import JsonArrayWriter
+        sink = JsonArrayWriter(args.output_file)
+        encoding = 'json'
 
-    print(f"Found {total_files} JSON files in {input_path}")
-
-    results = []
     processed_count = 0
     success_count = 0
-
-    for file_path in json_files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            info = extract_info(data)
-
-            if info:
-                results.append(info)
-                success_count += 1
-
-        except Exception as e:
-            print(f"Error processing {file_path.name}: {e}")
-
-        processed_count += 1
-
-        if processed_count % 100 == 0:
-            print(f"Processed {processed_count}/{total_files} files...")
+    error_count = 0
+    total_bytes = 0
+    start = time.perf_counter()
 
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
-        print(f"\nExtraction complete.")
-        print(f"Successfully processed: {success_count}/{total_files}")
-        print(f"Results saved to: {output_file}")
+        for stem, info, error, size in iter_extracted(iter_json_files(input_path), args.jobs, args.chunk_size, encoding):
+            processed_count += 1
+            total_bytes += size
+            if error:
+                error_count += 1
+                print(error)
+            elif info:
+                if args.sqlite:
+                    # Same fallback as scripts/import_judgments.ts
+                    info['case_id'] = info['case_id'] or stem
+                    sink.add(info)
+                else:
+                    sink.write_encoded(info)
+                success_count += 1
 
-    except Exception as e:
-        print(f"Error saving output file: {e}")
+            if processed_count % 1000 == 0:
+                elapsed = time.perf_counter() - start
+                print(f"Processed {processed_count} files... ({processed_count / elapsed:.0f} files/s)")
+    finally:
+        sink.close()
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"\nExtraction complete.")
+    print(f"Successfully processed: {success_count}/{processed_count} ({error_count} errors)")
+    print(f"Throughput: {processed_count / elapsed:.0f} files/s, "
+          f"{success_count / elapsed:.0f} judgments/s, "
+          f"{total_bytes / elapsed / 1e6:.1f} MB/s in {elapsed:.1f}s")
+    if args.sqlite:
+        print(f"SQLite: {sink.summary()}")
+    else:
+        print(f"Results saved to: {sink.path}")
 
 if __name__ == "__main__":
     main()
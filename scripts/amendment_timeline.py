@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Amendment Timeline — point-in-time versions of amended BOE articles.
+
+The law JSON keeps an amended article as its original text plus a flat
+`amendments` list in page order (extract_all_boe._extract_amendments);
+the text in force at a given date has to be recomputed by replaying the
+paragraph amendments (boe_parser.apply_amendments) every time. This script
+materializes the whole history once:
+
+  - amendments are ordered by decree date (y/m/d and d/m/y Hijri forms,
+    Arabic-Indic digits); undated ones stay after the amendment before
+    them in page order;
+  - version 0 is the original text at the law's issue date, version N
+    the text after the N-th amendment: the text is split into keyed
+    paragraphs once (boe_parser.split_paragraphs) and each amendment
+    replaces one of them. An amendment that rewrites the whole article
+    ("تم تعديل هذه المادة ... لتكون بالنص التالي") replaces the text and is
+    split again. Amendments that cannot be applied (no new text, marker
+    not found, a phrase or multi-article change) still get a version,
+    flagged applied = 0, with the text unchanged;
+  - versions are stored as line diffs against the previous version, with
+    a full snapshot every SNAPSHOT_EVERY versions (and whenever the diff
+    would be larger than the text), so any version is at most
+    SNAPSHOT_EVERY - 1 small diffs away from a snapshot.
+
+The result replaces the `article_versions` table in data.db, keyed by
+(law_id, article_index, version); article_index is the position in the
+law file's `articles` list. GET /api/laws/:lawId/articles/:index/versions
+serves the same rows.
+
+Usage:
+  python scripts/amendment_timeline.py                      # update ./data.db
+  python scripts/amendment_timeline.py --db other.db
+  python scripts/amendment_timeline.py --show LAW_ID INDEX --as-of 1440/01/01
+"""
+
+import sys, io, json, re, time, sqlite3, argparse
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from arabic_text import to_western_digits
+from boe_parser import apply_paragraph_amendments, index_paragraphs, render_paragraphs, split_paragraphs
+
+if sys.platform == "win32" and __name__ == "__main__":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+PROJECT  = Path(__file__).resolve().parent.parent
+DB_FILE  = PROJECT / "data.db"
+LAWS_DIR = PROJECT / "client" / "public" / "data" / "laws"
+
+SNAPSHOT_EVERY = 8
+
+_DATE_RE = re.compile(r"(\d+)\s*/\s*(\d+)\s*/\s*(\d+)")
+# The line of the amendment note that says "لتكون" (before it): the article itself is
+# rewritten ("عُدلت هذه المادة ... لتكون"، "بإعادة صياغة المادة لتكون"، "لتكون المادة") and
+# not a paragraph, its preamble, several articles at once or a phrase (unless reworded)
+_REWRITE_LINE_RE = re.compile(r"[^\n]*?لتكون(?:\s+المادة\b)?")
+_WHOLE_ARTICLE_RE = re.compile(r"المادة\b")
+_PART_OF_ARTICLE_RE = re.compile(r"فقر|ديباجة|المادتين|المواد")
+_PHRASE_RE = re.compile(r"عبارة|كلمة")
+_REWORDED_RE = re.compile(r"صياغ")
+# What extract_all_boe leaves in front of the new text: only "بالنص الآتي" is stripped there
+_LEAD_IN_RE = re.compile(
+    r"^(?:المادة\s+)?(?:(?:بالنص|بالصيغة)\s+(?:ال)?(?:آتي|آتى|اتي|تالي|تالى)ة?|كما\s+(?:يلي|يلى|يأتي)"
+    r"|على\s+النحو\s+(?:الآتي|التالي))\s*:?\s*")
+# Heading the new text sometimes repeats ("المادة التاسعة: ..."); article texts have none
+_HEADING_RE = re.compile(r"^المادة\s+[^\n:()]{1,60}?:\s*")
+_QUOTED_RE = re.compile(r'["“«]\s*(.*?)\s*["”»]\s*\.?', re.S)
+NEW_TEXT_MAX = 500            # extract_all_boe cuts unquoted new text here
+
+SCHEMA = ("""
+CREATE TABLE article_versions (
+    law_id         TEXT NOT NULL,
+    article_index  INTEGER NOT NULL,   -- position in the law file's articles list
+    version        INTEGER NOT NULL,   -- 0 = original text
+    article_number INTEGER,
+    date_hijri     TEXT NOT NULL,      -- YYYY/MM/DD, '' when unknown
+    decree         TEXT NOT NULL,
+    applied        INTEGER NOT NULL,   -- 0: amendment recorded but its patch did not apply
+    snapshot       TEXT,               -- full text, or NULL when diff is set
+    diff           TEXT,               -- JSON [[start, end, [lines]], ...] against version - 1
+    PRIMARY KEY (law_id, article_index, version)
+) WITHOUT ROWID
+""",)
+
+
+# ── Dates ────────────────────────────────────────────────────────────
+def hijri_key(date) -> Optional[Tuple[int, int, int]]:
+    """(year, month, day) from "1440/11/27" or "27/11/1440", else None."""
+    m = _DATE_RE.search(to_western_digits(date or ""))
+    if not m:
+        return None
+    a, b, c = (int(g) for g in m.groups())
+    if c > 31 and a <= 31:
+        a, c = c, a
+    if a < 1000 or not 1 <= b <= 12:
+        return None
+    return a, b, c
+
+
+def format_hijri(key) -> str:
+    return f"{key[0]:04d}/{key[1]:02d}/{key[2]:02d}" if key else ""
+
+
+def order_amendments(amendments):
+    """[(date key or None, amendment)] sorted by decree date, stable for equal/unknown dates."""
+    keyed, last = [], (0, 0, 0)
+    for amd in amendments:
+        key = hijri_key(amd.get("date"))
+        keyed.append((key or last, key, amd))
+        last = key or last
+    keyed.sort(key=lambda k: k[0])
+    return [(key, amd) for _, key, amd in keyed]
+
+
+# ── Versions ─────────────────────────────────────────────────────────
+def _unwrap(text):
+    """text without the quotes or the one pair of parentheses around all of it."""
+    text = text.strip()
+    m = _QUOTED_RE.fullmatch(text)
+    if m:
+        return m.group(1)
+    inner = text.rstrip(".")
+    if inner.startswith("(") and inner.endswith(")"):
+        depth = 0
+        for i, ch in enumerate(inner):
+            depth += (ch == "(") - (ch == ")")
+            if depth == 0:
+                return inner[1:-1].strip() if i == len(inner) - 1 else text
+    # An opening quote whose text was cut before the closing one
+    return text.lstrip('"“«').strip()
+
+
+def whole_article_text(amd):
+    """The new article text of an amendment that rewrites the whole article, else None."""
+    new_text = amd.get("new_text") or ""
+    description = amd.get("description") or ""
+    line = _REWRITE_LINE_RE.search(description)
+    if not new_text or not line:
+        return None
+    line = line.group(0)
+    if not line.endswith("المادة") and (
+            not _WHOLE_ARTICLE_RE.search(line) or _PART_OF_ARTICLE_RE.search(line)
+            or (_PHRASE_RE.search(line) and not _REWORDED_RE.search(line))):
+        return None
+    if len(new_text) == NEW_TEXT_MAX and new_text in description:
+        # Cut by the extractor; the description has the rest
+        new_text = description[description.index(new_text):]
+    text = _unwrap(_LEAD_IN_RE.sub("", new_text.strip()))
+    text = _unwrap(_HEADING_RE.sub("", text))
+    return text or None
+
+
+def _as_patch(amd):
+    """
+    {"paragraph", "new_text"} for a paragraph amendment, {"new_text"} for a
+    whole-article one, else None. extract_all_boe names the paragraph
+    `affected_paragraph`, boe_parser `paragraph`.
+    """
+    para = amd.get("affected_paragraph") or amd.get("paragraph")
+    if not amd.get("new_text"):
+        return None
+    if para:
+        return {"paragraph": para, "new_text": amd["new_text"]}
+    text = whole_article_text(amd)
+    return {"new_text": text} if text else None
+
+
+def materialize(original_text, amendments, base_date=""):
+    """Every version of an article: [{version, date_hijri, decree, applied, text}, ...]."""
+    versions = [{"version": 0, "date_hijri": format_hijri(hijri_key(base_date)), "decree": "",
+                 "applied": 1, "text": original_text}]
+    # Split once; replacing a paragraph keeps every marker, so the index stays valid
+    # until a whole-article amendment replaces the text
+    paragraphs = split_paragraphs(original_text)
+    index = index_paragraphs(paragraphs)
+    text = original_text
+    for n, (key, amd) in enumerate(order_amendments(amendments), 1):
+        patch = _as_patch(amd)
+        applied = 0
+        if patch and "paragraph" not in patch:
+            text = patch["new_text"]
+            paragraphs = split_paragraphs(text)
+            index = index_paragraphs(paragraphs)
+            applied = 1
+        elif patch:
+            paragraphs, applied = apply_paragraph_amendments(paragraphs, [patch], index)
+            if applied:
+                text = render_paragraphs(paragraphs)
+        versions.append({"version": n, "date_hijri": format_hijri(key),
+                         "decree": amd.get("decree") or "", "applied": applied, "text": text})
+    return versions
+
+
+def line_diff(old: str, new: str) -> List[list]:
+    """[start, end, lines]: old lines [start:end] become lines (line numbers of old)."""
+    a, b = old.split("\n"), new.split("\n")
+    return [[i1, i2, b[j1:j2]]
+            for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes()
+            if tag != "equal"]
+
+
+def apply_diff(old: str, ops: List[list]) -> str:
+    lines = old.split("\n")
+    # Back to front, so earlier line numbers stay valid
+    for start, end, repl in reversed(ops):
+        lines[start:end] = repl
+    return "\n".join(lines)
+
+
+def encode_versions(versions):
+    """(snapshot, diff JSON) per version: snapshots every SNAPSHOT_EVERY, diffs in between."""
+    rows, prev = [], None
+    for v in versions:
+        if prev is None or v["version"] % SNAPSHOT_EVERY == 0:
+            rows.append((v["text"], None))
+        else:
+            diff = json.dumps(line_diff(prev, v["text"]), ensure_ascii=False)
+            rows.append((v["text"], None) if len(diff) >= len(v["text"]) else (None, diff))
+        prev = v["text"]
+    return rows
+
+
+def decode_version(rows, version):
+    """Text of `version` from its (snapshot, diff) rows, ordered by version."""
+    start = version
+    while rows[start][0] is None:
+        start -= 1
+    text = rows[start][0]
+    for snapshot, diff in rows[start + 1:version + 1]:
+        text = apply_diff(text, json.loads(diff))
+    return text
+
+
+# ── data.db ──────────────────────────────────────────────────────────
+def iter_amended_articles(laws_dir):
+    """(law_id, issue_date_hijri, article_index, article) for every article with amendments."""
+    for path in sorted(Path(laws_dir).glob("*_boe.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                law = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for idx, art in enumerate(law.get("articles") or []):
+            if art.get("amendments") and art.get("original_text"):
+                yield law.get("law_id") or path.stem[:-4], law.get("issue_date_hijri", ""), idx, art
+
+
+def build(conn, laws_dir, verbose=True):
+    articles = versions_total = applied = snapshots = 0
+    with conn:
+        # One transaction: the old table stays until the new one is complete
+        # (executescript would commit the DROP on its own first)
+        conn.execute("BEGIN")
+        conn.execute("DROP TABLE IF EXISTS article_versions")
+        for statement in SCHEMA:
+            conn.execute(statement)
+        for law_id, issue_date, idx, art in iter_amended_articles(laws_dir):
+            versions = materialize(art["original_text"], art["amendments"], issue_date)
+            encoded = encode_versions(versions)
+            conn.executemany(
+                "INSERT INTO article_versions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((law_id, idx, v["version"], art.get("number"), v["date_hijri"], v["decree"],
+                  v["applied"], snapshot, diff)
+                 for v, (snapshot, diff) in zip(versions, encoded)))
+            articles += 1
+            versions_total += len(versions)
+            applied += sum(v["applied"] for v in versions[1:])
+            snapshots += sum(1 for snapshot, _ in encoded if snapshot is not None)
+    if verbose:
+        print(f"  {articles:,} amended articles, {versions_total - articles:,} amendments "
+              f"({applied:,} applied), {snapshots:,} snapshots")
+    return articles
+
+
+def version_as_of(conn, law_id, article_index, date_hijri=None):
+    """(version, text) in force on date_hijri (latest version when None), or None."""
+    rows = conn.execute(
+        "SELECT version, date_hijri, snapshot, diff FROM article_versions "
+        "WHERE law_id = ? AND article_index = ? ORDER BY version",
+        (law_id, article_index)).fetchall()
+    if not rows:
+        return None
+    target = len(rows) - 1
+    if date_hijri:
+        as_of = format_hijri(hijri_key(date_hijri))
+        # Undated amendments go with the version before them
+        target = 0
+        for version, date, _, _ in rows[1:]:
+            if date and date > as_of:
+                break
+            target = version
+    return target, decode_version([(s, d) for _, _, s, d in rows], target)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Materialize point-in-time versions of amended articles")
+    ap.add_argument("--db", default=str(DB_FILE), help="SQLite database (default: ./data.db)")
+    ap.add_argument("--laws-dir", default=str(LAWS_DIR), help="Directory of *_boe.json files")
+    ap.add_argument("--show", nargs=2, metavar=("LAW_ID", "INDEX"),
+                    help="Print one article's text instead of rebuilding")
+    ap.add_argument("--as-of", help="Hijri date for --show (default: latest version)")
+    args = ap.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    if args.show:
+        found = version_as_of(conn, args.show[0], int(args.show[1]), args.as_of)
+        if found is None:
+            print("No versions for this article (not amended, or run without --show first)")
+            return 1
+        print(f"Version {found[0]}:\n{found[1]}")
+        return 0
+
+    t0 = time.time()
+    build(conn, args.laws_dir)
+    conn.close()
+    print(f"Done in {time.time() - t0:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
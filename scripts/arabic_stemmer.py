@@ -0,0 +1,120 @@
+"""
+Arabic Stemmer — light prefix/suffix stemmer for the search indexes.
+
+A Light10-style stemmer (no roots, no broken plurals) tuned for legal text:
+
+  - input is search-folded text (fts_shadow.normalize_for_search), so ة
+    is already ه and every hamza carrier is a bare letter;
+  - a leading و is stripped first, then one article/preposition prefix
+    (وبال، بال، كال، فال، لل، ال), then one suffix (ات، ون، ين، ان، يه،
+    ها، ه، ي);
+  - stems keep at least three letters (Light10 allows two), so المدعي /
+    المدعين / المدعون / المدعيه all stem to مدع while short legal words
+    (حق، عقد، نص) are left alone;
+  - words whose first or last letters belong to the word (الله، الذي،
+    وزير، وزاره، ...) are listed in PROTECTED: they are not stripped any
+    further, with or without a prefix (والوزاره -> وزاره).
+
+Every token maps to exactly one non-empty stem, so stem_text() keeps the
+token count and order of its input; fts_shadow.py relies on that to index
+stems at the original token positions.
+
+Stems are memoized in a dict keyed by the surface form (legal vocabulary
+is small next to the corpus: a judgment repeats the same few thousand
+words). New entries are also queued in `pending` so fts_shadow.py can
+persist the word -> stem dictionary to `fts_stems` for the server, which
+rewrites queries with it instead of running its own stemmer.
+
+Usage:
+    from arabic_stemmer import stem_word, stem_text
+
+    stem_word("والمحكمه")                # "محكم"
+    stem_text("قررت المحكمه العامه")     # "قررت محكم عام"
+"""
+import hashlib
+import re
+
+MIN_STEM = 3
+
+# Longest first; و is handled separately (it may be followed by another prefix)
+PREFIXES = ("وبال", "وكال", "وال", "بال", "كال", "فال", "لل", "ال")
+SUFFIXES = ("ات", "ون", "ين", "ان", "يه", "ها", "ه", "ي")
+
+# Folded forms of words that start (or end) with prefix/suffix letters of their own
+PROTECTED = frozenset("""
+الله الذي التي الذين اللذان اللتان اللاتي اللواتي الا الي الان الامر
+ولي وليه ولايه والي وزير وزاره وزراء وكيل وكاله وكلاء وثيقه وثائق وقف اوقاف وصي وصيه
+وارث ورثه وفاه واقعه وقائع وسيط وساطه وظيفه وطني وحده وقت وجه وجود وجوب وضع وعد وفق
+ولد اولاد وديعه وعاء وسيله وسائل ورقه اوراق وزن
+""".split())
+
+# Tokens as unicode61 sees them in folded text: runs of letters and digits
+_TOKEN_RE = re.compile(r"([^\W_]+)")
+_ARABIC_WORD_RE = re.compile(r"[ء-ي]+")
+
+# Memo cap: beyond this many distinct words, stems are computed but not cached
+MEMO_SIZE = 2_000_000
+
+# Part of fts_shadow's index version: changing the rules rebuilds the indexes
+STEMMER_VERSION = hashlib.sha256(
+    repr((MIN_STEM, PREFIXES, SUFFIXES, sorted(PROTECTED))).encode("utf-8")).hexdigest()[:8]
+
+
+def _stem(word: str) -> str:
+    if len(word) <= MIN_STEM or word in PROTECTED or not _ARABIC_WORD_RE.fullmatch(word):
+        return word
+    if word[0] == "و" and len(word) > MIN_STEM + 1:
+        word = word[1:]
+        if word in PROTECTED:
+            return word
+    for prefix in PREFIXES:
+        if word.startswith(prefix):
+            if len(word) - len(prefix) >= MIN_STEM:
+                word = word[len(prefix):]
+                if word in PROTECTED:
+                    return word
+            break
+    for suffix in SUFFIXES:
+        if word.endswith(suffix):
+            if len(word) - len(suffix) >= MIN_STEM:
+                word = word[:-len(suffix)]
+            break
+    return word
+
+
+class StemCache(dict):
+    """word -> stem; a miss stems the word, caches it and queues it in `pending`."""
+
+    def __init__(self):
+        super().__init__()
+        self.pending = []
+
+    def __missing__(self, word):
+        stem = _stem(word)
+        if len(self) < MEMO_SIZE:
+            self[word] = stem
+            if stem != word:
+                self.pending.append((word, stem))
+        return stem
+
+    def take_pending(self):
+        """New (word, stem) pairs since the last call, for fts_stems."""
+        pending, self.pending = self.pending, []
+        return pending
+
+
+STEMS = StemCache()
+
+
+def stem_word(word: str) -> str:
+    return STEMS[word]
+
+
+def stem_text(text: str) -> str:
+    """Replace every token with its stem; separators are kept as they are."""
+    if not text:
+        return text
+    parts = _TOKEN_RE.split(text)
+    # Odd positions are the tokens
+    parts[1::2] = map(STEMS.__getitem__, parts[1::2])
+    return "".join(parts)
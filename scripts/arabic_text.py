@@ -0,0 +1,194 @@
+"""
+Arabic Text — shared character tables and normalizers for the extractors.
+
+One place for the digit, diacritic, tatweel, zero-width and hamza tables
+that the judgment and law extractors used to rebuild per script (loops of
+str.replace, chained regexes, ad-hoc maketrans tables).
+
+Every table is a CharMap: the mapping is kept as a str.maketrans table,
+and applying it picks the fastest way for the input length.
+  - Long strings use one str.replace per character that actually occurs.
+    CPython's translate() looks up every character of a non-ASCII string
+    in the table (~130 ns/char), while `c in text` and replace() are C
+    scans, so a 10-40 entry map is 5-50x faster on article and judgment
+    texts.
+  - The chain costs one `in` scan per entry, so below a length that
+    grows with the map size (case numbers, dates, titles) a single pass
+    wins: one character-class regex sub for deletion maps (diacritics,
+    control characters), translate() for the others.
+Rewrites that are not one-character maps (whitespace runs, decomposed
+hamza) are regexes that only run when a cheap `in` check
+says there is something to rewrite, and start with a literal or a rare
+character class so the regex engine can skip ahead.
+
+Usage:
+    from arabic_text import to_western_digits, strip_diacritics, fold_for_matching
+
+    to_western_digits("١٤٤٢/٣/٥")          # "1442/3/5"
+    strip_diacritics("حُكِمَ")               # "حكم"
+    fold_for_matching("أحكام المسؤولية")    # "احكام المسوولية"
+
+Benchmarks: python scripts/test_arabic_text.py
+"""
+import re
+from typing import Mapping, Optional
+
+ARABIC_INDIC_DIGITS = "٠١٢٣٤٥٦٧٨٩"
+EXTENDED_ARABIC_INDIC_DIGITS = "۰۱۲۳۴۵۶۷۸۹"   # Persian/Urdu forms, seen in OCR output
+TATWEEL = "ـ"
+
+# Tashkeel plus Quranic annotation marks (same ranges as arabic_ocr_cleaner used)
+DIACRITICS = "".join(
+    chr(c) for lo, hi in ((0x064B, 0x065F), (0x0670, 0x0670), (0x06D6, 0x06DC), (0x06DF, 0x06E4),
+                          (0x06E7, 0x06E8), (0x06EA, 0x06ED))
+    for c in range(lo, hi + 1)
+)
+
+# Zero-width space/joiners, LRM/RLM, Arabic letter mark, BOM
+ZERO_WIDTH = "\u200b\u200c\u200d\u200e\u200f\u061c\ufeff"
+
+# Letter folds for matching: hamza carriers and alef forms, alef maqsura, ta marbuta
+HAMZA_FOLDS = {"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ؤ": "و", "ئ": "ي"}
+LETTER_FOLDS = {**HAMZA_FOLDS, "ى": "ي", "ة": "ه"}
+
+# Length up to which a single pass beats the replace chain, fitted to the
+# crossover points test_arabic_text.py measures: maps of up to ~20 entries
+# chain faster at any length, larger ones pay for each entry past that
+SINGLE_PASS_MIN_ENTRIES = 20
+TRANSLATE_CHARS_PER_ENTRY = 1
+SUB_CHARS_PER_ENTRY = 12
+
+
+class CharMap:
+    """A one-character -> string (or deletion) map applied in one call."""
+
+    def __init__(self, mapping: Mapping[str, Optional[str]]):
+        for char, repl in mapping.items():
+            if len(char) != 1:
+                raise ValueError(f"CharMap keys must be single characters: {char!r}")
+            # Sequential replaces equal translate() only if no output is re-mapped
+            if repl and any(c in mapping for c in repl):
+                raise ValueError(f"CharMap output {repl!r} is itself mapped")
+        self.mapping = dict(mapping)
+        self.table = str.maketrans(self.mapping)
+        self._pairs = tuple((char, repl or "") for char, repl in self.mapping.items())
+        self.deletes = not any(self.mapping.values())
+        if self.deletes:
+            self._sub = re.compile("[" + "".join(map(re.escape, self.mapping)) + "]").sub
+        per_entry = SUB_CHARS_PER_ENTRY if self.deletes else TRANSLATE_CHARS_PER_ENTRY
+        self.short_len = max(0, per_entry * (len(self._pairs) - SINGLE_PASS_MIN_ENTRIES))
+
+    def __call__(self, text: str) -> str:
+        if len(text) <= self.short_len:
+            return self._sub("", text) if self.deletes else text.translate(self.table)
+        for char, repl in self._pairs:
+            if char in text:
+                text = text.replace(char, repl)
+        return text
+
+    def __or__(self, other: "CharMap") -> "CharMap":
+        return CharMap({**self.mapping, **other.mapping})
+
+
+DIGITS = CharMap({d: str(i) for i, d in enumerate(ARABIC_INDIC_DIGITS)})
+ALL_DIGITS = DIGITS | CharMap({d: str(i) for i, d in enumerate(EXTENDED_ARABIC_INDIC_DIGITS)})
+DIACRITICS_MAP = CharMap(dict.fromkeys(DIACRITICS))
+TATWEEL_MAP = CharMap({TATWEEL: None})
+ZERO_WIDTH_MAP = CharMap(dict.fromkeys(ZERO_WIDTH))
+
+# Search/dedup key: harakat + tatweel dropped, letters folded, all digits Western
+MATCH_FOLD = CharMap({
+    **dict.fromkeys("\u064b\u064c\u064d\u064e\u064f\u0650\u0651\u0652\u0670" + TATWEEL),
+    **LETTER_FOLDS,
+    **ALL_DIGITS.mapping,
+})
+
+# Search key, as server/searchUtils.ts normalizeArabic folds queries: harakat
+# (064B-065F, 0670) and tatweel dropped, alef forms, alef maqsura, hamza
+# carriers and ta marbuta folded; digits kept. NFKC is left out on purpose:
+# it expands ligatures such as U+FDFA into several words, which would shift
+# FTS token positions (see fts_shadow.py).
+SEARCH_FOLD = CharMap({
+    **dict.fromkeys([chr(c) for c in range(0x064B, 0x0660)] + ["\u0670", TATWEEL]),
+    **LETTER_FOLDS,
+})
+
+# Kept for callers that translate short strings themselves
+DIGITS_TABLE = DIGITS.table
+
+# Replacement character and C0 controls except \t \n \r
+CONTROL_CHARS = "\ufffd" + "".join(chr(c) for c in (*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F))
+CONTROL_CHARS_MAP = CharMap(dict.fromkeys(CONTROL_CHARS))
+
+DIACRITICS_RE = re.compile(f"[{DIACRITICS}]")
+
+# Alef/waw/ya + combining hamza or madda, as some PDF text layers emit them
+_DECOMPOSED_HAMZA = {
+    "\u0627\u0653": "\u0622", "\u0627\u0654": "\u0623", "\u0627\u0655": "\u0625",
+    "\u0648\u0654": "\u0624", "\u064a\u0654": "\u0626", "\u0649\u0654": "\u0626",
+}
+_DECOMPOSED_HAMZA_RE = re.compile("[\u0627\u0648\u064a\u0649][\u0653-\u0655]")
+
+# Both start with a literal, so the regex engine skips ahead with a fast search
+# instead of trying a match at every single space
+_SPACE_RUN_RE = re.compile(r"  +")
+_BLANK_LINES_RE = re.compile(r"\n\n\n+")
+
+
+def to_western_digits(text: str) -> str:
+    """Arabic-Indic digits (٠-٩) to 0-9."""
+    return DIGITS(text)
+
+
+def strip_diacritics(text: str) -> str:
+    """Remove tashkeel and Quranic marks."""
+    return DIACRITICS_MAP(text)
+
+
+def strip_tatweel(text: str) -> str:
+    return TATWEEL_MAP(text)
+
+
+def strip_zero_width(text: str) -> str:
+    return ZERO_WIDTH_MAP(text)
+
+
+def strip_control_chars(text: str) -> str:
+    """Drop U+FFFD and control characters, keeping tab and newlines."""
+    return CONTROL_CHARS_MAP(text)
+
+
+def compose_hamza(text: str) -> str:
+    """Alef/waw/ya followed by a combining hamza or madda -> the precomposed letter.
+
+    Not a drop-in for the old hamza step of extract_moj_judgments'
+    normalize_arabic, which replaced each hamza letter with itself and so
+    changed nothing: decomposed forms such as "ا" + U+0654 now come out as
+    "أ", so extracted text (and any hash of it) differs where they occur.
+    """
+    if "\u0653" in text or "\u0654" in text or "\u0655" in text:
+        return _DECOMPOSED_HAMZA_RE.sub(lambda m: _DECOMPOSED_HAMZA.get(m.group(), m.group()), text)
+    return text
+
+
+def collapse_spacing(text: str) -> str:
+    """Space/tab runs -> one space, three or more newlines -> one blank line."""
+    if "\t" in text:
+        text = text.replace("\t", " ")
+    if "  " in text:
+        text = _SPACE_RUN_RE.sub(" ", text)
+    if "\n\n\n" in text:
+        text = _BLANK_LINES_RE.sub("\n\n", text)
+    return text
+
+
+def fold_for_matching(text: str) -> str:
+    """Matching key used by the dedup tools (see MATCH_FOLD)."""
+    return MATCH_FOLD(text)
+
+
+def replace_all(text: str, pairs) -> str:
+    """Apply (old, new) string replacements in order."""
+    for old, new in pairs:
+        text = text.replace(old, new)
+    return text
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""Read-only duplicate / near-duplicate article detector for the law corpus.
+
+Sibling of `legal_compliance_monitor.py`. The corpus holds overlapping
+copies of the same laws (`*_boe.json`, `*_uqn.json`, legacy files such as
+`civil_transactions_sa.json`, and `scripts/boe_laws/law_*.json`); this tool
+reports clusters of identical or near-identical articles across all of them
+without comparing every pair:
+
+1. Article text is normalized (diacritics, tatweel, hamza/alef/yaa forms,
+   digits, punctuation) and split into word 3-gram shingles.
+2. Identical normalized texts are grouped by hash.
+3. One representative per group gets a MinHash signature (one-permutation
+   hashing: one hash per shingle, binned into SIGNATURE_SIZE slots), and
+   LSH banding proposes candidate pairs.
+4. Candidates are confirmed with the exact Jaccard similarity of their
+   shingle sets and merged with union-find.
+
+Work is linear in the number of shingles plus the number of confirmed
+candidates; within an LSH bucket every pair is checked unless union-find
+already put both in the same cluster, so no candidate pair is lost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import glob
+import json
+import os
+import re
+import sys
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from arabic_text import fold_for_matching
+
+DEFAULT_GLOBS = [
+    "client/public/data/laws/*.json",
+    "scripts/boe_laws/law_*.json",
+]
+
+SHINGLE_SIZE = 3
+SIGNATURE_SIZE = 64          # MinHash slots (one-permutation bins)
+BANDS = 16                   # LSH bands of SIGNATURE_SIZE // BANDS rows
+DEFAULT_THRESHOLD = 0.8      # Jaccard similarity needed to join a cluster
+DEFAULT_MIN_WORDS = 12       # shorter articles are boilerplate (e.g. publication clauses)
+
+_BIN_BITS = SIGNATURE_SIZE.bit_length() - 1
+_VALUE_BITS = 32 - _BIN_BITS
+_MIX = 0x9E3779B1            # odd multiplier spreading word hashes into the high (bin) bits
+
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+@dataclass
+class ArticleRef:
+    file: str
+    law_id: str
+    law_name: str
+    index: int
+    number: str
+
+
+@dataclass
+class Cluster:
+    size: int
+    kind: str                # "exact" or "near"
+    min_similarity: float
+    laws: int
+    preview: str
+    members: list[ArticleRef]
+
+
+def normalize_text(text: str) -> str:
+    return _NON_WORD_RE.sub(" ", fold_for_matching(text)).strip()
+
+
+def shingles(normalized: str) -> set[int]:
+    """32-bit hashes of the word 3-grams (one CRC32 per word, combined per shingle)."""
+    word_hashes = list(map(zlib.crc32, normalized.encode("utf-8").split()))
+    if len(word_hashes) < SHINGLE_SIZE:
+        return {zlib.crc32(normalized.encode("utf-8"))}
+    return {
+        (((a * _MIX) ^ b) * _MIX ^ c) * _MIX & 0xFFFFFFFF
+        for a, b, c in zip(word_hashes, word_hashes[1:], word_hashes[2:])
+    }
+
+
+def minhash_signature(hashes: set[int]) -> tuple[int, ...]:
+    """One-permutation MinHash: the minimum hash per bin, empty bins densified."""
+    # Descending order: the last value written to each bin is its minimum
+    by_bin = {h >> _VALUE_BITS: h for h in sorted(hashes, reverse=True)}
+    if len(by_bin) == SIGNATURE_SIZE:
+        return tuple(by_bin[b] for b in range(SIGNATURE_SIZE))
+    # Rotation densification: an empty bin borrows the next non-empty one,
+    # offset by the distance so borrowed values never equal real ones
+    signature = [0] * SIGNATURE_SIZE
+    nearest = 0
+    for i in range(2 * SIGNATURE_SIZE - 1, -1, -1):
+        b = i % SIGNATURE_SIZE
+        if b in by_bin:
+            nearest = i
+        if i < SIGNATURE_SIZE:
+            signature[i] = by_bin[nearest % SIGNATURE_SIZE] + ((nearest - i) << 32)
+    return tuple(signature)
+
+
+def jaccard(a: set[int], b: set[int]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def iter_articles(paths: list[str], min_words: int):
+    """Yield (ArticleRef, normalized text) for every article long enough to compare."""
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if not isinstance(data, dict) or not isinstance(data.get("articles"), list):
+            continue
+        law_id = str(data.get("law_id", os.path.basename(path)))
+        law_name = str(data.get("law_name") or data.get("title") or "(unknown)")
+        for idx, article in enumerate(data["articles"]):
+            if not isinstance(article, dict) or not isinstance(article.get("text"), str):
+                continue
+            normalized = normalize_text(article["text"])
+            if len(normalized.split()) < min_words:
+                continue
+            number = article.get("number_text") or article.get("number")
+            yield ArticleRef(path, law_id, law_name, idx, str(number)), normalized
+
+
+def find_duplicate_clusters(
+    paths: list[str],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_words: int = DEFAULT_MIN_WORDS,
+) -> tuple[list[Cluster], dict[str, int]]:
+    refs: list[ArticleRef] = []
+    texts: list[str] = []
+    exact_groups: dict[str, list[int]] = defaultdict(list)
+    for ref, normalized in iter_articles(paths, min_words):
+        exact_groups[normalized].append(len(refs))
+        refs.append(ref)
+        texts.append(normalized)
+
+    uf = UnionFind(len(refs))
+    for members in exact_groups.values():
+        for m in members[1:]:
+            uf.union(members[0], m)
+
+    # Near duplicates: LSH over one representative per exact group
+    reps = [members[0] for members in exact_groups.values()]
+    rep_shingles = {r: shingles(texts[r]) for r in reps}
+    rows = SIGNATURE_SIZE // BANDS
+    buckets: dict[tuple, list[int]] = defaultdict(list)
+    for r in reps:
+        signature = minhash_signature(rep_shingles[r])
+        for band in range(BANDS):
+            buckets[(band, signature[band * rows:(band + 1) * rows])].append(r)
+
+    similarity: dict[tuple[int, int], float] = {}
+    candidates = 0
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for i, other in enumerate(members[1:], 1):
+            for earlier in members[:i]:
+                key = (earlier, other)
+                if key in similarity or uf.find(earlier) == uf.find(other):
+                    continue
+                candidates += 1
+                sim = jaccard(rep_shingles[earlier], rep_shingles[other])
+                similarity[key] = sim
+                if sim >= threshold:
+                    uf.union(earlier, other)
+
+    grouped: dict[int, list[int]] = defaultdict(list)
+    for i in range(len(refs)):
+        grouped[uf.find(i)].append(i)
+
+    clusters: list[Cluster] = []
+    for root, members in grouped.items():
+        if len(members) < 2:
+            continue
+        distinct = {texts[m] for m in members}
+        if len(distinct) == 1:
+            kind, min_sim = "exact", 1.0
+        else:
+            kind = "near"
+            base = rep_shingles[exact_groups[texts[root]][0]]
+            min_sim = min(jaccard(base, rep_shingles[exact_groups[t][0]]) for t in distinct)
+        clusters.append(
+            Cluster(
+                size=len(members),
+                kind=kind,
+                min_similarity=round(min_sim, 3),
+                laws=len({refs[m].file for m in members}),
+                preview=texts[root][:160],
+                members=[refs[m] for m in members],
+            )
+        )
+
+    clusters.sort(key=lambda c: (-c.size, c.members[0].file, c.members[0].index))
+    stats = {
+        "files": len(paths),
+        "articles": len(refs),
+        "exact_groups": len(exact_groups),
+        "lsh_candidates": candidates,
+        "clusters": len(clusters),
+        "duplicated_articles": sum(c.size for c in clusters),
+    }
+    return clusters, stats
+
+
+def law_overlaps(clusters: list[Cluster]) -> list[dict[str, object]]:
+    """File pairs ranked by how many duplicate clusters they share."""
+    shared: dict[tuple[str, str], int] = defaultdict(int)
+    names: dict[str, str] = {}
+    for c in clusters:
+        files = sorted({m.file for m in c.members})
+        for m in c.members:
+            names[m.file] = m.law_name
+        if len(files) > 20:
+            continue  # boilerplate shared by many laws says nothing about copies
+        for i, a in enumerate(files):
+            for b in files[i + 1:]:
+                shared[(a, b)] += 1
+    pairs = sorted(shared.items(), key=lambda kv: (-kv[1], kv[0]))
+    return [
+        {"file_a": a, "law_a": names[a], "file_b": b, "law_b": names[b], "shared_clusters": n}
+        for (a, b), n in pairs
+    ]
+
+
+def write_reports(clusters, stats, overlaps, output_dir: str) -> tuple[str, str]:
+    os.makedirs(output_dir, exist_ok=True)
+    now = dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
+    json_path = os.path.join(output_dir, "duplicate-articles-report.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "generated_at": now,
+                "stats": stats,
+                "law_overlaps": overlaps,
+                "clusters": [asdict(c) for c in clusters],
+            },
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+    md_path = os.path.join(output_dir, "duplicate-articles-report.md")
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write("# تقرير المواد المكررة والمتقاربة (قراءة فقط)\n\n")
+        f.write(f"- وقت التوليد: `{now}`\n")
+        f.write(f"- المواد المفحوصة: **{stats['articles']}** من {stats['files']} ملف\n")
+        f.write(
+            f"- المجموعات المكررة: **{stats['clusters']}** "
+            f"(تضم {stats['duplicated_articles']} مادة)\n\n"
+        )
+        if overlaps:
+            f.write("## أكثر الملفات تداخلًا\n\n")
+            for o in overlaps[:30]:
+                f.write(
+                    f"- `{o['file_a']}` ↔ `{o['file_b']}`: {o['shared_clusters']} مادة مشتركة "
+                    f"({o['law_a']})\n"
+                )
+            f.write("\n")
+        if clusters:
+            f.write("## أكبر المجموعات\n\n")
+            for idx, c in enumerate(clusters[:50], start=1):
+                label = "تطابق تام" if c.kind == "exact" else f"تشابه مع المادة الأولى ≥ {c.min_similarity}"
+                f.write(f"{idx}. **{c.size} مادة في {c.laws} ملف** — {label}\n")
+                f.write(f"   - مقتطف: {c.preview}\n")
+                for m in c.members[:5]:
+                    f.write(f"   - `{m.file}` المادة {m.number} ({m.law_name})\n")
+                if c.size > 5:
+                    f.write(f"   - ... و{c.size - 5} أخرى\n")
+                f.write("\n")
+    return json_path, md_path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Detect duplicate and near-duplicate articles")
+    parser.add_argument(
+        "--laws-glob",
+        action="append",
+        help="Glob pattern for law JSON files (repeatable; default: laws/ and boe_laws/)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="reports/legal-monitoring",
+        help="Directory to write generated reports",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Minimum Jaccard similarity of word 3-grams for near duplicates",
+    )
+    parser.add_argument(
+        "--min-words",
+        type=int,
+        default=DEFAULT_MIN_WORDS,
+        help="Ignore articles shorter than this many words",
+    )
+    args = parser.parse_args()
+
+    paths = sorted({p for g in (args.laws_glob or DEFAULT_GLOBS) for p in glob.glob(g)})
+    if not paths:
+        print("No law files matched the provided glob.")
+        return 1
+
+    clusters, stats = find_duplicate_clusters(paths, args.threshold, args.min_words)
+    overlaps = law_overlaps(clusters)
+    json_path, md_path = write_reports(clusters, stats, overlaps, args.output_dir)
+    print(f"Generated report files:\n- {json_path}\n- {md_path}")
+    print(
+        f"Articles: {stats['articles']}, clusters: {stats['clusters']} "
+        f"({stats['duplicated_articles']} articles), LSH candidates: {stats['lsh_candidates']}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
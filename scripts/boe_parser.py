@@ -4,9 +4,15 @@
 BOE Law Parser - Parse amendments and canceled articles correctly
 """
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString, Tag
 import re
+import sys
 import json
+from functools import lru_cache
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from arabic_text import fold_for_matching
 
 def parse_law_html(html_content):
     """
@@ -84,19 +90,23 @@ def parse_law_html(html_content):
                         law_data['royal_decree']['date'] = decree_match.group(2).strip()
                     break
 
+    # One pass over the page for the amendment popups, shared by all articles
+    popups = PopupIndex(soup)
     for article_div in article_divs:
         # Skip popup divs (they're amendment details)
         if 'article_item_popup' in article_div.get('class', []):
             continue
 
-        article = parse_article(article_div, soup)
+        article = parse_article(article_div, soup, popups)
         if article:
             law_data['articles'].append(article)
 
     return law_data
 
-def parse_article(article_div, soup):
-    """Parse a single article div"""
+def parse_article(article_div, soup, popups=None):
+    """Parse a single article div (popups: the page's PopupIndex, built when None)"""
+    if popups is None:
+        popups = PopupIndex(soup)
 
     article = {
         'number': None,
@@ -135,8 +145,7 @@ def parse_article(article_div, soup):
     html_container = None
     for container in all_containers:
         # Check if this container is inside a popup-list
-        parent_popup = container.find_parent('div', class_='popup-list')
-        if parent_popup is None:
+        if not popups.in_popup_list(container):
             # This container is NOT in popup - it's the original text
             html_container = container
             break
@@ -174,19 +183,70 @@ def parse_article(article_div, soup):
 
     # Extract amendments if article is amended
     if article['status'] == 'amended':
-        article['amendments'] = extract_amendments(article_div, soup)
-        # Apply amendments to get current valid text (النص الساري)
-        article['text'] = apply_amendments(article['original_text'], article['amendments'])
-        # Re-extract paragraphs from HTML if amendments changed structure
-        # For now, fallback to text-based extraction for amended text
-        article['paragraphs'] = extract_paragraphs(article['text'])
+        article['amendments'] = extract_amendments(article_div, soup, popups)
+        # Apply amendments to get current valid text (النص الساري); the HTML
+        # paragraphs key the list items the text shows without their numbers
+        article['text'] = apply_amendments(article['original_text'], article['amendments'],
+                                           article.get('paragraphs'))
+        # Same keyed update on the HTML paragraphs, so their levels survive
+        if article.get('paragraphs'):
+            article['paragraphs'], _ = apply_paragraph_amendments(article['paragraphs'], article['amendments'])
+        else:
+            article['paragraphs'] = extract_paragraphs(article['text'])
     else:
         # No amendments - current text is same as original
         article['text'] = article['original_text']
 
     return article if article['text'] else None
 
-def extract_amendments(article_div, soup):
+def element_text(elem):
+    """Text of a parsed element with <br> as line breaks, spaces collapsed per line.
+
+    Reads the existing parse tree: no str(elem) + BeautifulSoup re-parse to
+    swap the <br> tags for newlines, and the element is left untouched.
+    Same text as get_text(separator=' ') on such a copy.
+    """
+    if isinstance(elem, NavigableString):
+        parts = [elem.get_text()]
+    else:
+        types = elem.interesting_string_types
+        if isinstance(types, type):
+            types = (types,)
+        parts = ['\n' if d.name == 'br' else d
+                 for d in elem.descendants
+                 if type(d) in types or (d.name == 'br' and isinstance(d, Tag))]
+    lines = (' '.join(line.split()) for line in ' '.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+class PopupIndex:
+    """The amendment popups of one law page, indexed in a single pass.
+
+    soup.find('div', class_=article_id) per amended article and
+    find_parent('div', class_='popup-list') per HTMLContainer each walk the
+    page again, which makes heavily amended laws quadratic. This maps every
+    div class to its first div (soup.find order) and records which
+    HTMLContainers sit inside a popup-list, so both become dict/set lookups.
+    """
+
+    def __init__(self, soup):
+        self.by_class = {}
+        for div in soup.find_all('div', class_=True):
+            for cls in div.get('class'):
+                self.by_class.setdefault(cls, div)
+        self._in_popup = {id(container)
+                          for popup_list in soup.find_all('div', class_='popup-list')
+                          for container in popup_list.find_all('div', class_='HTMLContainer')}
+
+    def popup(self, article_id):
+        """The popup div of an article's amendments (class = its data-articleid), or None"""
+        return self.by_class.get(article_id)
+
+    def in_popup_list(self, container):
+        return id(container) in self._in_popup
+
+
+def extract_amendments(article_div, soup, popups=None):
     """Extract amendment history for an article"""
     amendments = []
 
@@ -201,8 +261,7 @@ def extract_amendments(article_div, soup):
         return amendments
 
     # Find popup div with amendments
-    popup_class = article_id
-    popup_div = soup.find('div', class_=popup_class)
+    popup_div = (popups or PopupIndex(soup)).popup(article_id)
 
     if not popup_div:
         return amendments
@@ -268,6 +327,61 @@ def extract_amendments(article_div, soup):
 
     return amendments
 
+# Paragraph marker a line opens with: ordinal word (ord), number (num) or
+# letter (let), optional parentheses, separator. Each extractor accepts its
+# own subset, so each MarkerGrammar compiles its own pattern from these
+# pieces and a line is accepted or rejected inside a single regex match.
+_MARKER_KINDS = {
+    'let': r'[أ-ي]|جـ',
+    'num': r'[0-9]+|[٠-٩]+',
+    'ord': r'(?:أول|ثاني|ثالث|رابع|خامس|سادس|سابع|ثامن|تاسع|عاشر)ا',
+}
+
+
+class MarkerGrammar:
+    """The markers one extractor accepts: separators per kind, which kinds
+    may be parenthesized, and whether ordinal words need their tanween.
+
+    match(line) is the compiled pattern's own match (most lines are not
+    marked, so rejecting one costs no Python call); marker_parts() unpacks
+    an accepted line."""
+
+    def __init__(self, seps, parens=(), tanween_only=False):
+        alternatives = []
+        # The kinds cannot both match a line, so the order only matters for
+        # speed: the one-letter class rejects most unmarked lines first
+        for kind, marker in _MARKER_KINDS.items():
+            if kind not in seps:
+                continue
+            if kind == 'ord':
+                marker += 'ً' if tanween_only else 'ً?'
+            opened, closed = (r'\(?', r'\)?') if kind in parens else ('', '')
+            sep = ''.join(re.escape(c) for c in seps[kind])
+            # The kind group encloses marker and body, so it closes last
+            alternatives.append(rf'(?P<{kind}>{opened}({marker}){closed}\s*[{sep}]\s*(.+))')
+        self.pattern = re.compile('|'.join(alternatives))
+        self.match = self.pattern.match
+
+
+def marker_parts(m):
+    """(kind, marker, body) of a line accepted by a MarkerGrammar"""
+    i = m.lastindex
+    return m.lastgroup, m.group(i + 1), m.group(i + 2).strip()
+
+
+# extract_all_boe: "(1) -", "أ.", "أولاً:" / "أولا –"
+BOE_MARKERS = MarkerGrammar({'ord': ':–—-', 'num': '-–—.', 'let': '-–—.'}, parens=('num', 'let'))
+# extract_paragraphs: "1-", "أ:", "أولاً -"
+TEXT_MARKERS = MarkerGrammar({'ord': '-:', 'num': '-:', 'let': '-:'}, tanween_only=True)
+# extract_paragraphs_from_html: numbered lines of a <p>, letter sub-items of an <li>
+NUMBERED_MARKERS = MarkerGrammar({'num': '-:', 'let': '-:'})
+LETTER_MARKERS = MarkerGrammar({'let': '-'})
+
+# Letter markers indented as sub-items (level 2)
+SUB_ITEM_LETTERS = frozenset(['أ', 'ب', 'ج', 'د', 'هـ', 'و', 'ز', 'ح', 'ط', 'ي', 'ك', 'ل', 'م', 'ن', 'س', 'ع', 'ف', 'ص', 'ق', 'ر', 'ش', 'ت', 'ث', 'خ', 'ذ', 'ض', 'ظ', 'غ', 'جـ'])
+
+_DEFINITION_RE = re.compile(r'^([^:]+):$')
+
 def extract_paragraphs_from_html(html_container):
     """
     Extract paragraphs with proper indentation from HTML structure.
@@ -311,8 +425,8 @@ def extract_paragraphs_from_html(html_container):
             definition_count = sum(1 for line in lines if ':' in line and len(line.split(':')[0].split()) <= 3)
 
             # Check if lines have numbered markers (1 -, 2 -, أ -, etc.)
-            numbered_pattern = r'^([0-9]+|[٠-٩]+|[أ-ي]|جـ)\s*[-:]\s*(.+)$'
-            numbered_lines = [line for line in lines if re.match(numbered_pattern, line)]
+            numbered = [NUMBERED_MARKERS.match(line) for line in lines]
+            numbered_count = sum(1 for found in numbered if found)
 
             if definition_count > 2 and len(lines) > 3:
                 # This is a definitions paragraph - split by lines
@@ -339,12 +453,12 @@ def extract_paragraphs_from_html(html_container):
                             "text": line,
                             "level": 0
                         })
-            elif len(numbered_lines) >= 2:
+            elif numbered_count >= 2:
                 # This paragraph contains numbered items
                 # First, add any intro text before first numbered item
                 intro_text = []
-                for line in lines:
-                    if not re.match(numbered_pattern, line):
+                for line, found in zip(lines, numbered):
+                    if not found:
                         intro_text.append(line)
                     else:
                         break
@@ -357,14 +471,12 @@ def extract_paragraphs_from_html(html_container):
                     })
 
                 # Now process numbered items
-                for line in lines:
-                    match = re.match(numbered_pattern, line)
-                    if match:
-                        marker_text = match.group(1)
-                        content = match.group(2).strip()
+                for found in numbered:
+                    if found:
+                        _, marker_text, content = marker_parts(found)
 
                         # Determine level: numbers are level 1, letters are level 2
-                        if marker_text in ['أ', 'ب', 'ج', 'د', 'هـ', 'و', 'ز', 'ح', 'ط', 'ي', 'ك', 'ل', 'م', 'ن', 'س', 'ع', 'ف', 'ص', 'ق', 'ر', 'ش', 'ت', 'ث', 'خ', 'ذ', 'ض', 'ظ', 'غ', 'جـ']:
+                        if marker_text in SUB_ITEM_LETTERS:
                             level = 2
                         else:
                             level = 1
@@ -404,14 +516,11 @@ def extract_paragraphs_from_html(html_container):
                 if not lines:
                     continue
 
-                # Pattern to detect Arabic letter markers: أ- ب- ج- etc.
-                letter_pattern = r'^([أ-ي]|جـ)\s*-\s*(.+)$'
-
                 # First line is the main item text (level 1)
                 main_text = lines[0]
 
                 # Check if main text ends with colon (indicates sub-items follow)
-                if main_text.endswith(':') or (len(lines) > 1 and re.match(letter_pattern, lines[1])):
+                if main_text.endswith(':') or (len(lines) > 1 and LETTER_MARKERS.match(lines[1])):
                     # Remove trailing colon and any markers from main text
                     main_text = main_text.rstrip(':').strip()
 
@@ -423,11 +532,11 @@ def extract_paragraphs_from_html(html_container):
 
                 # Process remaining lines as sub-items (level 2)
                 for line in lines[1:]:
-                    match = re.match(letter_pattern, line)
-                    if match:
-                        # This is a sub-item with Arabic letter marker
-                        marker = match.group(1) + ' -'
-                        content = match.group(2).strip()
+                    found = LETTER_MARKERS.match(line)
+                    if found:
+                        # This is a sub-item with Arabic letter marker (أ- ب- ج-)
+                        _, letter, content = marker_parts(found)
+                        marker = letter + ' -'
                         paragraphs.append({
                             "marker": marker,
                             "text": content,
@@ -471,45 +580,40 @@ def extract_paragraphs(text):
     paragraphs = []
 
     # Split text by lines
-    lines = text.split('\n')
+    lines = [line.strip() for line in text.split('\n')]
 
-    # Pattern to detect paragraph markers: "أ -" or "١-" or "1-" or "أولاً :" etc.
-    # Supports both Arabic-Indic numerals (٠-٩) and Western numerals (0-9)
-    para_pattern = r'^([أ-ي]|جـ|[٠-٩]+|[0-9]+|أولاً|ثانياً|ثالثاً|رابعاً|خامساً|سادساً|سابعاً|ثامناً|تاسعاً|عاشراً)\s*[-:]\s*(.+)$'
+    # Paragraph markers: "أ -" or "١-" or "1-" or "أولاً :" etc. (TEXT_MARKERS),
+    # each line classified once and the result reused below
+    markers = [TEXT_MARKERS.match(line) if line else None for line in lines]
+    has_markers = any(markers)
 
-    # Pattern to detect definitions: "المصطلح:" or "المصطلح :" (term followed by colon)
-    definition_pattern = r'^([^:]+):$'
-
-    # Check if text has paragraph markers
-    has_markers = any(re.match(para_pattern, line.strip()) for line in lines if line.strip())
-
-    # Check if text has definitions (multiple lines ending with colons)
-    definition_lines = [line for line in lines if re.match(definition_pattern, line.strip())]
-    has_definitions = len(definition_lines) > 2  # More than 2 definitions
+    # Definitions: "المصطلح:" or "المصطلح :" (term followed by colon)
+    terms = [_DEFINITION_RE.match(line) for line in lines]
+    has_definitions = sum(1 for term in terms if term) > 2  # More than 2 definitions
 
     if has_definitions:
         # This is a definitions article - pair each term with its definition
         i = 0
         while i < len(lines):
-            line = lines[i].strip()
+            line = lines[i]
             if not line:
                 i += 1
                 continue
 
             # Check if this is a definition term (ends with colon)
-            term_match = re.match(definition_pattern, line)
+            term_match = terms[i]
             if term_match:
                 term = term_match.group(1).strip()
                 # Get the next non-empty line as the definition
                 definition_text = ""
                 i += 1
                 while i < len(lines):
-                    next_line = lines[i].strip()
+                    next_line = lines[i]
                     if not next_line:
                         i += 1
                         continue
                     # Check if next line is another term
-                    if re.match(definition_pattern, next_line):
+                    if terms[i]:
                         break
                     definition_text = next_line
                     break
@@ -534,7 +638,7 @@ def extract_paragraphs(text):
     if not has_markers:
         # No paragraph markers and no definitions - split by line breaks to preserve formatting
         # Each non-empty line becomes a separate paragraph
-        non_empty_lines = [line.strip() for line in lines if line.strip()]
+        non_empty_lines = [line for line in lines if line]
         if len(non_empty_lines) == 1:
             # Single paragraph - keep as is
             return [{
@@ -555,28 +659,18 @@ def extract_paragraphs(text):
     # Level 1: Arabic letters (أ، ب، ج)
     # Level 2: Sub-numbers or other nested markers
 
-    for line in lines:
-        line = line.strip()
+    for line, found in zip(lines, markers):
         if not line:
             continue
 
-        match = re.match(para_pattern, line)
-        if match:
-            marker_text = match.group(1)
+        if found:
+            _, marker_text, text_content = marker_parts(found)
             marker = marker_text + ' -'
-            text_content = match.group(2).strip()
-
-            # Determine indentation level based on marker type
-            level = 1
-            if marker_text in ['أ', 'ب', 'ج', 'د', 'هـ', 'و', 'ز', 'ح', 'ط', 'ي', 'ك', 'ل', 'م', 'ن', 'س', 'ع', 'ف', 'ص', 'ق', 'ر', 'ش', 'ت', 'ث', 'خ', 'ذ', 'ض', 'ظ', 'غ', 'جـ']:
-                # Arabic letters are sub-items (level 2)
-                level = 2
-            elif marker_text in ['أولاً', 'ثانياً', 'ثالثاً', 'رابعاً', 'خامساً', 'سادساً', 'سابعاً', 'ثامناً', 'تاسعاً', 'عاشراً']:
-                # Main ordinal words (level 0)
-                level = 1
-            else:
-                # Numbers (both Arabic-Indic and Western) are main items (level 1)
-                level = 1
+
+            # Determine indentation level based on marker type: Arabic letters
+            # are sub-items (level 2); numbers (both Arabic-Indic and Western)
+            # and ordinal words (أولاً, ثانياً) are main items (level 1)
+            level = 2 if marker_text in SUB_ITEM_LETTERS else 1
 
             paragraphs.append({
                 "marker": marker,
@@ -594,53 +688,190 @@ def extract_paragraphs(text):
 
     return paragraphs
 
-def apply_amendments(original_text, amendments):
+# Paragraph marker at the start of a line: "أ -", "(ب)-", "جـ-", "١-", "12 -", "أولاً:"
+_PARA_MARKER = (r'\(?\s*(جـ|[أ-ي]|[0-9٠-٩]+|(?:أول|ثاني|ثالث|رابع|خامس|سادس|سابع|ثامن|تاسع|عاشر)اً?)'
+                r'\s*\)?\s*[-–—:][ \t]*')
+_PARA_MARKER_RE = re.compile(_PARA_MARKER)
+# Starts with a literal newline, so finditer jumps from line to line (a
+# multiline ^ is tried at every character)
+_PARA_LINE_RE = re.compile(r'\n[ \t]*' + _PARA_MARKER)
+_MARKER_PUNCT_RE = re.compile(r'[\s()\[\]\-–—:.]+')
+_QUOTES = '"\'“”«» '
+
+
+@lru_cache(maxsize=4096)
+def marker_key(marker):
     """
-    Apply amendments to original text to get current valid text
+    Lookup key of a paragraph marker, shared by the paragraph markers ("جـ -",
+    "١-", "أولاً:") and the paragraph names amendments use ("جـ", "1", "الأولى").
+    """
+    key = _MARKER_PUNCT_RE.sub('', fold_for_matching(marker or ''))
+    # الفقرة الأولى / الثانية name numbered paragraphs; أولاً، ثانياً stay words
+    if key.startswith('ال') and len(key) > 3:
+        number = extract_article_number(marker)
+        if number is not None:
+            return str(number)
+    return key
 
-    Args:
-        original_text: النص الأصلي
-        amendments: قائمة التعديلات
 
-    Returns:
-        النص الساري (بعد تطبيق التعديلات)
+def split_paragraphs(text):
     """
-    if not original_text or not amendments:
-        return original_text
+    Split article text into paragraphs for keyed amendment: every line that
+    starts with a marker opens a paragraph that runs to the next marked line;
+    the lines before the first marker are one unmarked paragraph. Each
+    paragraph keeps its exact source in 'raw', so render_paragraphs() gives
+    back the text unchanged until a paragraph is replaced.
+    """
+    text = text or ''
+    paragraphs = []
+    # Offsets in '\n' + text: a match starting at i is the line starting at text[i]
+    starts = list(_PARA_LINE_RE.finditer('\n' + text))
+    if not starts or starts[0].start() > 0:
+        head = text[:starts[0].start() - 1] if starts else text
+        paragraphs.append({"marker": "", "text": head, "level": 0, "raw": head})
+    for m, nxt in zip(starts, starts[1:] + [None]):
+        raw = text[m.start():nxt.start() - 1] if nxt else text[m.start():]
+        # أولاً.. head sections (0), numbers are items (1), letters sub-items (2)
+        name = m.group(1)
+        level = 1 if name[0].isdigit() else 0 if len(name) > 2 else 2
+        paragraphs.append({"marker": m.group(0).strip(), "text": raw[m.end() - 1 - m.start():],
+                           "level": level, "raw": raw})
+    return paragraphs
 
-    current_text = original_text
 
-    for amendment in amendments:
-        if 'paragraph' not in amendment or 'new_text' not in amendment:
+def key_paragraphs(paragraphs, html_paragraphs):
+    """
+    split_paragraphs output plus the markers the article's HTML paragraphs
+    (extract_paragraphs_from_html) carry for lines that show none: BOE
+    numbers <ol><li> items in the browser, so "1-" is in the paragraphs
+    list but not in the text. Such a line opens a paragraph flagged
+    'implicit', which render_paragraphs writes without its marker.
+    """
+    implicit = {p['text'].strip(): p for p in html_paragraphs or []
+                if p.get('marker') and p.get('text')}
+    if not implicit:
+        return paragraphs
+    keyed = []
+    for para in paragraphs:
+        lines = para['raw'].split('\n')
+        hits = [implicit.get(line.strip()) for line in lines]
+        if not any(hits[1 if para['marker'] else 0:]):
+            keyed.append(para)
+            continue
+        # Marker length in the first line: raw = marker + text
+        prefix = len(para['raw']) - len(para['text'])
+        current = None
+        for i, (line, hit) in enumerate(zip(lines, hits)):
+            if i == 0 and para['marker']:
+                current = {"marker": para['marker'], "level": para['level'], "lines": [line], "prefix": prefix}
+            elif hit:
+                if current:
+                    keyed.append(current)
+                current = {"marker": hit['marker'], "level": hit.get('level', 1), "lines": [line],
+                           "prefix": 0, "implicit": True}
+            elif current is None:
+                current = {"marker": "", "level": 0, "lines": [line], "prefix": 0}
+            else:
+                current["lines"].append(line)
+        keyed.append(current)
+    for para in keyed:
+        if 'lines' in para:
+            raw = '\n'.join(para.pop('lines'))
+            para['text'] = raw[para.pop('prefix'):]
+            para['raw'] = raw
+    return keyed
+
+
+def index_paragraphs(paragraphs):
+    """marker_key -> position of the paragraph an amendment of that name targets."""
+    index = {}
+    for pos, para in enumerate(paragraphs):
+        key = para.get('marker') and marker_key(para['marker'])
+        if not key:
             continue
+        # Markers repeat across levels (١- ... أ- ... ٢- ... أ-): the outermost one wins,
+        # then the first
+        best = index.get(key)
+        if best is None or para.get('level', 0) < paragraphs[best].get('level', 0):
+            index[key] = pos
+    return index
 
-        para = amendment['paragraph'].strip()
-        new_text = amendment['new_text'].strip()
 
-        # Check if new_text already starts with the paragraph marker (e.g., "جـ -")
-        # If so, don't add it again
-        starts_with_para = new_text.startswith(f'{para} -') or new_text.startswith(f'{para}-')
+def apply_paragraph_amendments(paragraphs, amendments, index=None):
+    """
+    Apply paragraph amendments to a paragraphs list (extract_paragraphs,
+    extract_paragraphs_from_html or split_paragraphs output): one dict lookup
+    and one list assignment per amendment.
 
-        # Try to find and replace the paragraph
-        # Pattern: "أ -" or "ب -" or "جـ -" etc.
-        # Match from paragraph marker to end of line (or until next paragraph)
-        para_pattern = rf'{re.escape(para)}\s*-\s*([^\n]+(?:\n(?![\u0623-\u064a]+\s*-)[^\n]+)*)'
+    Returns (paragraphs, applied): a new list, sharing the untouched
+    paragraph dicts, and the number of amendments applied.
+    """
+    paragraphs = list(paragraphs)
+    if index is None:
+        index = index_paragraphs(paragraphs)
+    applied = 0
+    for amendment in amendments:
+        para = (amendment.get('paragraph') or '').strip()
+        new_text = (amendment.get('new_text') or '').strip()
+        if not para or not new_text:
+            continue
+        key = marker_key(para)
+        pos = index.get(key)
+        if pos is None:
+            continue
+        # new_text often repeats the marker ("جـ - ...", "\" 1- ...")
+        body = new_text.lstrip(_QUOTES)
+        m = _PARA_MARKER_RE.match(body)
+        if m and marker_key(m.group(1)) == key:
+            new_text = body[m.end():]
+        old = paragraphs[pos]
+        paragraphs[pos] = {"marker": old.get('marker', ''), "text": new_text, "level": old.get('level', 0)}
+        if old.get('implicit'):
+            paragraphs[pos]['implicit'] = True
+        applied += 1
+    return paragraphs, applied
+
+
+def render_paragraphs(paragraphs):
+    """Paragraphs back to article text: untouched split_paragraphs entries verbatim."""
+    lines = []
+    for para in paragraphs:
+        if 'raw' in para:
+            lines.append(para['raw'])
+        elif para.get('marker') and not para.get('implicit'):
+            lines.append(f"{para['marker']} {para['text']}")
+        else:
+            lines.append(para['text'])
+    return '\n'.join(lines)
 
-        match = re.search(para_pattern, current_text, re.MULTILINE)
-        if match:
-            # Replace the old paragraph text with new text
-            old_para_full = match.group(0)
 
-            if starts_with_para:
-                # New text already has paragraph marker, use as-is
-                new_para_full = new_text
-            else:
-                # Add paragraph marker to new text
-                new_para_full = f'{para} - {new_text}'
+def apply_amendments(original_text, amendments, paragraphs=None):
+    """
+    Apply amendments to original text to get current valid text
+
+    The text is split into marker-keyed paragraphs once, each amendment
+    replaces its paragraph by key, and the text is rendered once at the
+    end. When an amendment names a paragraph the text shows no marker for,
+    the article's HTML paragraphs key the lines (key_paragraphs).
 
-            current_text = current_text.replace(old_para_full, new_para_full, 1)
+    Args:
+        original_text: النص الأصلي
+        amendments: قائمة التعديلات
+        paragraphs: فقرات المادة من extract_paragraphs_from_html (الترقيم الذي لا يظهر في النص)
+
+    Returns:
+        النص الساري (بعد تطبيق التعديلات)
+    """
+    if not original_text or not amendments:
+        return original_text
 
-    return current_text
+    keyed = split_paragraphs(original_text)
+    index = index_paragraphs(keyed)
+    if paragraphs and any(marker_key(a['paragraph']) not in index for a in amendments if a.get('paragraph')):
+        keyed = key_paragraphs(keyed, paragraphs)
+        index = index_paragraphs(keyed)
+    keyed, applied = apply_paragraph_amendments(keyed, amendments, index)
+    return render_paragraphs(keyed) if applied else original_text
 
 def extract_article_number(text):
     """Extract article number from Arabic text"""
@@ -9,6 +9,7 @@ for text cleaning, so OCR corrections learned here benefit all future sources.
 
 Usage:
     python scripts/bog_split_judgments.py [--input FILE] [--output-dir DIR] [--year YEAR] [--volume VOL]
+    python scripts/bog_split_judgments.py --input FILE --year 1442 --volume 2 --sqlite data.db
 """
 import sys, os
 if sys.platform == "win32":
@@ -22,10 +23,9 @@ from pathlib import Path
 
 # Import the generic Arabic OCR cleaner
 sys.path.insert(0, str(Path(__file__).parent))
-from arabic_ocr_cleaner import ArabicOCRCleaner
-
-# Arabic-Hindi numeral mapping
-ARABIC_HINDI_MAP = str.maketrans("٠١٢٣٤٥٦٧٨٩", "0123456789")
+from arabic_ocr_cleaner import ArabicOCRCleaner, fix_ocr_dates
+from judgment_stream import JsonlJudgmentWriter
+from arabic_text import DIGITS_TABLE as ARABIC_HINDI_MAP, to_western_digits
 
 # Initialize the generic cleaner with BOG-specific source ID
 _cleaner = ArabicOCRCleaner(source_id="bog_judicial")
@@ -37,30 +37,16 @@ def fix_ocr_date(text: str) -> str:
     Handles:
     - ه→٥/5: OCR confuses the digit 5 with the letter ه (visually identical)
     - هو→هـ: OCR misreads the Hijri suffix هـ as هو
-    - /→-: Slash to hyphen for Arabic-Indic dates (BiDi safe)
+
+    Delegates to the shared span-based engine in arabic_ocr_cleaner.
     """
-    t = text
-    # Fix ه→٥ in Arabic-Indic digit dates
-    t = re.sub(r'ه/ه(/[١][٣٤][٠-٩]{2})', r'٥/٥\1', t)
-    t = re.sub(r'ه(/[٠-٩]{1,2}/[١][٣٤][٠-٩]{2})', r'٥\1', t)
-    t = re.sub(r'([٠-٩]{1,2}/)ه(/[١][٣٤][٠-٩]{2})', r'\g<1>٥\2', t)
-    t = re.sub(r'([١][٣٤][٠-٩]{2}/[٠-٩]{1,2}/)ه(?=[^٠-٩\d]|$)', r'\g<1>٥', t)
-    t = re.sub(r'([١][٣٤][٠-٩]{2}/)ه(/[٠-٩]{1,2})', r'\g<1>٥\2', t)
-    # Fix ه→5 in Western digit dates
-    t = re.sub(r'ه/ه(/1[34]\d{2})', r'5/5\1', t)
-    t = re.sub(r'ه(/\d{1,2}/1[34]\d{2})', r'5\1', t)
-    t = re.sub(r'(\d{1,2}/)ه(/1[34]\d{2})', r'\g<1>5\2', t)
-    t = re.sub(r'(1[34]\d{2}/\d{1,2}/)ه(?=[^\d٠-٩]|$)', r'\g<1>5', t)
-    t = re.sub(r'(1[34]\d{2}/)ه(/\d{1,2})', r'\g<1>5\2', t)
-    # Fix هو→هـ after dates
-    t = re.sub(r'([\d٠-٩]+[/\-.][\d٠-٩]+[/\-.][\d٠-٩]+)\s*هو(?=[^٠-٩\w]|$)', r'\1هـ', t)
-    return t
+    return fix_ocr_dates(text)
 
 
 def to_western(text: str) -> str:
     """Convert Arabic-Indic numerals (٠-٩) to Western (0-9), after fixing OCR date issues."""
     fixed = fix_ocr_date(text)
-    return fixed.translate(ARABIC_HINDI_MAP)
+    return to_western_digits(fixed)
 
 
 def extract_western_number(text: str) -> str:
@@ -261,8 +247,15 @@ def clean_text(text: str, use_llm: bool = False) -> str:
 def split_judgments(ocr_text: str, collection_year: str = "1442",
                     volume_num: str = "1", judgment_type: str = None,
                     use_llm: bool = False):
+    """Split OCR text into individual judgments (list form of iter_judgments)."""
+    return list(iter_judgments(ocr_text, collection_year, volume_num, judgment_type, use_llm))
+
+
+def iter_judgments(ocr_text: str, collection_year: str = "1442",
+                   volume_num: str = "1", judgment_type: str = None,
+                   use_llm: bool = False):
     """
-    Split OCR text into individual judgments.
+    Split OCR text into individual judgments, yielding each one as soon as it is built.
 
     Args:
         ocr_text: Full OCR text from a volume PDF
@@ -270,7 +263,7 @@ def split_judgments(ocr_text: str, collection_year: str = "1442",
         volume_num: Volume number within the collection
         judgment_type: 'administrative', 'commercial', or 'criminal' (auto-detected if None)
 
-    Returns list of dicts with keys:
+    Yields dicts with keys:
         case_id, case_number, case_year, appeal_number, appeal_year, session_date,
         topics, category, text, source, char_count, judgment_type
     """
@@ -366,7 +359,7 @@ def split_judgments(ocr_text: str, collection_year: str = "1442",
                                         config = fallback_config
                                         break
                                 if not matches:
-                                    return []
+                                    return
 
     # Filter out index/table entries (they appear in table rows with | chars)
     real_matches = []
@@ -413,7 +406,6 @@ def split_judgments(ocr_text: str, collection_year: str = "1442",
         _cleaner.batch_llm_scan(raw_texts)
 
     # Second pass: extract metadata and clean each judgment
-    judgments = []
     for idx, (match, text_start, text_end) in enumerate(match_info):
         raw_text = raw_texts[idx]
 
@@ -623,9 +615,63 @@ def split_judgments(ocr_text: str, collection_year: str = "1442",
             "source": "bog_judicial",
             "char_count": len(cleaned),
         }
-        judgments.append(judgment)
+        yield judgment
+
+
+def stream_judgments(ocr_text: str, args):
+    """Split a volume and stream each judgment to JSONL and/or SQLite as soon as it is built."""
+    writer = JsonlJudgmentWriter(args.jsonl, append=True) if args.jsonl else None
+    loader = None
+    if args.sqlite:
+        from judgments_db import JudgmentsLoader
+        # Replace by case_id so re-running a volume does not duplicate rows
+        loader = JudgmentsLoader(args.sqlite, source="bog_judicial", replace="case_id",
+                                 dedup=not args.no_dedup, duplicates_report=args.dedup_report)
+    if writer:
+        print(f"\nStreaming judgments to: {args.jsonl}")
+    if loader:
+        print(f"\nLoading judgments into: {args.sqlite}")
 
-    return judgments
+    categories = {}
+    total = 0
+    try:
+        for j in iter_judgments(ocr_text, args.year, args.volume, args.type):
+            if writer:
+                writer.write(j)
+            if loader:
+                loader.add(j)
+            total += 1
+            cat = j["category"] or "غير مصنف"
+            categories[cat] = categories.get(cat, 0) + 1
+        # Flush once per volume so readers see the whole volume together
+        if writer:
+            writer.flush()
+    except BaseException:
+        # A volume that failed midway leaves nothing in the JSONL
+        if writer:
+            writer.discard()
+        raise
+    finally:
+        if writer:
+            writer.close()
+        if loader:
+            loader.close()
+
+    if not total:
+        print("No judgments found. Exiting.")
+        sys.exit(1)
+
+    print(f"\n{'='*60}")
+    print(f"SPLITTING COMPLETE")
+    print(f"{'='*60}")
+    print(f"Total judgments: {total}")
+    if writer:
+        print(f"JSONL file: {args.jsonl}")
+    if loader:
+        print(f"SQLite: {loader.summary()}")
+    print(f"\nCategory breakdown:")
+    for cat, count in sorted(categories.items(), key=lambda x: -x[1]):
+        print(f"  {cat}: {count}")
 
 
 def main():
@@ -643,6 +689,17 @@ def main():
     parser.add_argument("--type", type=str, default=None,
                         choices=['administrative', 'commercial', 'criminal', 'supreme_administrative'],
                         help="Judgment type (auto-detected if not specified)")
+    parser.add_argument("--jsonl", type=str, default=None,
+                        help="Stream judgments to this JSONL file as they are built (appends, "
+                             "so several volumes can share one file) instead of writing "
+                             "per-judgment and combined JSON files")
+    parser.add_argument("--sqlite", type=str, default=None, metavar="DB",
+                        help="Load judgments straight into this SQLite DB (e.g. data.db); "
+                             "judgments_fts is updated for the new rows only")
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="With --sqlite: import judgments even if their fingerprint is already in the DB")
+    parser.add_argument("--dedup-report", type=str, default=None, metavar="FILE",
+                        help="With --sqlite: write skipped duplicates to this JSONL file")
     args = parser.parse_args()
 
     input_path = Path(args.input)
@@ -657,6 +714,10 @@ def main():
         ocr_text = f.read()
     print(f"  Total length: {len(ocr_text)} characters")
 
+    if args.jsonl or args.sqlite:
+        stream_judgments(ocr_text, args)
+        return
+
     # Split into judgments
     print(f"\nSplitting into individual judgments...")
     judgments = split_judgments(ocr_text, args.year, args.volume, args.type)
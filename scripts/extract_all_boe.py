@@ -17,9 +17,15 @@ Usage:
   python scripts/extract_all_boe.py              # Extract all folders
   python scripts/extract_all_boe.py --folder 1   # Extract folder 1 only (أنظمة أساسية)
   python scripts/extract_all_boe.py --resume      # Only extract missing laws
+  python scripts/extract_all_boe.py --profile     # + cProfile stats of the slowest laws
+
+Every run appends per-law stage timings and counters (fetch, parse and its
+sub-stages, pdfs, write) to scripts/extraction_metrics.jsonl and ends with
+p50/p95/max per stage and the slowest laws.
 """
 
-import sys, io, os, re, json, time, argparse
+import sys, io, os, re, json, math, time, argparse
+from contextlib import contextmanager
 from pathlib import Path
 
 if sys.platform == "win32":
@@ -54,6 +60,11 @@ PDF_DIR   = PROJECT / "client" / "public" / "data" / "amendments_pdf"
 LIB_FILE  = PROJECT / "client" / "public" / "data" / "library.json"
 IDX_FILE  = PROJECT / "client" / "public" / "data" / "boe_laws_index.json"
 STATE_FILE = PROJECT / "scripts" / "extraction_state.json"
+METRICS_FILE = PROJECT / "scripts" / "extraction_metrics.jsonl"
+PROFILE_DIR  = PROJECT / "scripts" / "extraction_profiles"
+
+SLOWEST_LAWS = 10   # laws listed in the end-of-run summary
+PROFILE_TOP  = 3    # slowest laws whose cProfile stats --profile keeps
 
 LAWS_DIR.mkdir(parents=True, exist_ok=True)
 PDF_DIR.mkdir(parents=True, exist_ok=True)
@@ -67,7 +78,9 @@ sess.headers.update({
 })
 
 # ── Arabic helpers (from extract_folder1_laws.py) ─────────────────────
-_HINDI = str.maketrans("٠١٢٣٤٥٦٧٨٩", "0123456789")
+sys.path.insert(0, str(Path(__file__).parent))
+from arabic_text import DIGITS_TABLE as _HINDI
+from boe_parser import BOE_MARKERS, PopupIndex, element_text, marker_parts
 
 _ORDINALS = []
 _tens  = [("عشر", 20), ("ثلاث", 30), ("أربع", 40), ("خمس", 50),
@@ -142,12 +155,10 @@ def _container_to_text(container, strip_tables=False):
 
 
 # ── Paragraph extraction ─────────────────────────────────────────────
-_RE_NUM = re.compile(r"^[\(]?([0-9]+|[٠-٩]+)[\)]?\s*[-–—.]\s*(.+)$")
-_RE_LET = re.compile(r"^[\(]?([أ-ي]|جـ)[\)]?\s*[-–—.]\s*(.+)$")
-_RE_ORD = re.compile(
-    r"^(أولاً?|ثانياً?|ثالثاً?|رابعاً?|خامساً?|سادساً?|سابعاً?|ثامناً?|تاسعاً?|عاشراً?)"
-    r"\s*[:–—-]\s*(.+)$"
-)
+# Line markers: boe_parser.BOE_MARKERS labels "أولاً:" (ord), "(1)-" (num) and
+# "أ." (let) in one match. Inside a list item, letter markers may also start
+# mid-line and are split off first.
+_RE_LI_SPLIT = re.compile(r"(?=(?:^|(?<=\s))[\(]?(?:[أ-ي]|جـ)[\)]?\s*[-–—.])")
 
 
 def _make_marker(raw, add_hyphen=True):
@@ -164,19 +175,15 @@ def _paras_from_text(text):
     lines = [l.strip() for l in text.split("\n") if l.strip()]
     paras = []
     for line in lines:
-        m = _RE_ORD.match(line)
-        if m:
-            paras.append({"marker": m.group(1).strip() + ":", "text": m.group(2).strip(), "level": 0})
-            continue
-        m = _RE_NUM.match(line)
-        if m:
-            paras.append({"marker": _make_marker(m.group(1)), "text": m.group(2).strip(), "level": 1})
+        found = BOE_MARKERS.match(line)
+        if found is None:
+            paras.append({"marker": "", "text": line, "level": 0})
             continue
-        m = _RE_LET.match(line)
-        if m:
-            paras.append({"marker": _make_marker(m.group(1)), "text": m.group(2).strip(), "level": 2})
-            continue
-        paras.append({"marker": "", "text": line, "level": 0})
+        kind, raw, body = marker_parts(found)
+        if kind == "ord":
+            paras.append({"marker": raw.strip() + ":", "text": body, "level": 0})
+        else:
+            paras.append({"marker": _make_marker(raw), "text": body, "level": 1 if kind == "num" else 2})
     return paras if paras else [{"marker": "", "text": text, "level": 0}]
 
 
@@ -235,6 +242,23 @@ def _paras_from_container(container):
     return _paras_from_text(full_text)
 
 
+def _has_structure(container):
+    """Does the container hold lists or tables directly (the DOM paragraph path)?"""
+    return any(isinstance(child, Tag) and child.name in ("ol", "ul", "table")
+               for child in container.children)
+
+
+def _paras_to_text(paras):
+    """Article text rendered from its paragraph list, one line per paragraph / table row."""
+    lines = []
+    for p in paras:
+        if p.get("type") == "table":
+            lines.extend(" ".join(cells) for cells in p["table_rows"])
+        elif p["text"]:
+            lines.append(f"{p['marker']} {p['text']}" if p["marker"] else p["text"])
+    return "\n".join(lines)
+
+
 def _parse_li(li, idx, paras):
     import html as hmod
     raw_html = li.decode_contents()
@@ -246,46 +270,33 @@ def _parse_li(li, idx, paras):
         return
     all_lines = []
     for line in lines:
-        parts = re.split(r"(?=(?:^|(?<=\s))[\(]?(?:[أ-ي]|جـ)[\)]?\s*[-–—.])", line)
-        for p in parts:
+        for p in _RE_LI_SPLIT.split(line):
             p = p.strip()
             if p:
                 all_lines.append(p)
     if not all_lines:
         return
-    first = all_lines[0]
-    first_is_letter = bool(_RE_LET.match(first))
-    if first_is_letter:
-        for line in all_lines:
-            m = _RE_LET.match(line)
-            if m:
-                paras.append({"marker": _make_marker(m.group(1)), "text": m.group(2).strip(), "level": 2})
-            else:
-                mn = _RE_NUM.match(line)
-                if mn:
-                    paras.append({"marker": _make_marker(mn.group(1)), "text": mn.group(2).strip(), "level": 2})
-                elif len(line) > 5:
-                    paras.append({"marker": "", "text": line, "level": 2})
+    found = [marker_parts(m) if m else None for m in map(BOE_MARKERS.match, all_lines)]
+    first = found[0]
+    if first and first[0] == "let":
+        for line, f in zip(all_lines, found):
+            if f and f[0] != "ord":
+                paras.append({"marker": _make_marker(f[1]), "text": f[2], "level": 2})
+            elif len(line) > 5:
+                paras.append({"marker": "", "text": line, "level": 2})
     else:
         first_line = all_lines[0]
-        mn = _RE_NUM.match(first_line)
-        mo = _RE_ORD.match(first_line)
-        if mo:
-            paras.append({"marker": mo.group(1).strip() + ":", "text": mo.group(2).strip(), "level": 0})
-        elif mn:
-            paras.append({"marker": _make_marker(mn.group(1)), "text": mn.group(2).strip(), "level": 1})
+        if first and first[0] == "ord":
+            paras.append({"marker": first[1].strip() + ":", "text": first[2], "level": 0})
+        elif first:
+            paras.append({"marker": _make_marker(first[1]), "text": first[2], "level": 1})
         else:
             paras.append({"marker": _make_marker(str(idx)), "text": first_line, "level": 1})
-        for line in all_lines[1:]:
-            m = _RE_LET.match(line)
-            if m:
-                paras.append({"marker": _make_marker(m.group(1)), "text": m.group(2).strip(), "level": 2})
-            else:
-                mn2 = _RE_NUM.match(line)
-                if mn2:
-                    paras.append({"marker": _make_marker(mn2.group(1)), "text": mn2.group(2).strip(), "level": 2})
-                elif len(line) > 5:
-                    paras.append({"marker": "", "text": line, "level": 1})
+        for line, f in zip(all_lines[1:], found[1:]):
+            if f and f[0] != "ord":
+                paras.append({"marker": _make_marker(f[1]), "text": f[2], "level": 2})
+            elif len(line) > 5:
+                paras.append({"marker": "", "text": line, "level": 1})
 
 
 # ── Metadata extraction ──────────────────────────────────────────────
@@ -335,7 +346,7 @@ def _is_structural(text):
 
 
 # ── Amendment extraction ─────────────────────────────────────────────
-def _extract_amendments(article_div, soup):
+def _extract_amendments(article_div, popups):
     amendments = []
     link = article_div.find("a", class_="ancArticlePrevVersions")
     if not link:
@@ -343,7 +354,7 @@ def _extract_amendments(article_div, soup):
     aid = link.get("data-articleid")
     if not aid:
         return amendments
-    popup = soup.find("div", class_=aid)
+    popup = popups.popup(aid)
     if not popup:
         return amendments
 
@@ -426,7 +437,7 @@ def _extract_amendments(article_div, soup):
 
 
 # ── Article parser ───────────────────────────────────────────────────
-def _parse_article(adiv, soup):
+def _parse_article(adiv, popups):
     classes = " ".join(adiv.get("class", []))
     status = "active"
     if "canceled" in classes:
@@ -440,20 +451,28 @@ def _parse_article(adiv, soup):
 
     hc = None
     for c in adiv.find_all("div", class_="HTMLContainer"):
-        if c.find_parent("div", class_="popup-list") is None:
+        if not popups.in_popup_list(c):
             hc = c
             break
     if hc is None:
         return None
 
-    text_path_a = _container_to_text(hc)
-    paragraphs = _paras_from_container(hc)
-
-    dom_len = sum(len(p["text"]) for p in paragraphs)
-    if text_path_a and dom_len < len(text_path_a) * 0.5:
+    # One path per article, chosen up front: plain containers go through the
+    # text once; lists/tables through the DOM, unless that loses over half
+    # the text, and the text is then rendered from those paragraphs.
+    paragraphs = None
+    if _has_structure(hc):
+        paragraphs = _paras_from_container(hc)
+        dom_len = sum(len(p["text"]) for p in paragraphs)
+        if dom_len < sum(len(s) for s in hc.stripped_strings) * 0.5:
+            paragraphs = None
+    if paragraphs is None:
+        text_path_a = _container_to_text(hc)
         paragraphs = _paras_from_text(text_path_a)
+    else:
+        text_path_a = _paras_to_text(paragraphs)
 
-    amendments = _extract_amendments(adiv, soup) if status == "amended" else []
+    amendments = _extract_amendments(adiv, popups) if status == "amended" else []
 
     art = {
         "number": number,
@@ -524,13 +543,8 @@ def _extract_cabinet_decision(soup):
                 break
             if 'بسم الله الرحمن الرحيم' in text and len(text) < 30:
                 continue
-            # Extract clean text preserving line breaks
-            elem_copy = BeautifulSoup(str(child), 'html.parser')
-            for br in elem_copy.find_all('br'):
-                br.replace_with('\n')
-            body_text = elem_copy.get_text(separator=' ', strip=False)
-            body_lines = [' '.join(line.split()) for line in body_text.split('\n') if line.strip()]
-            body_text = '\n'.join(body_lines)
+            # Extract clean text preserving line breaks (read in place, no re-parse)
+            body_text = element_text(child)
             if body_text:
                 cabinet_body_parts.append(body_text)
 
@@ -542,53 +556,62 @@ def _extract_cabinet_decision(soup):
 
 
 # ── Full law page parser ─────────────────────────────────────────────
-def _parse_law(html, law_id):
-    soup = BeautifulSoup(html, "html.parser")
-    meta = _extract_meta(soup)
-
-    # Royal decree
-    royal_decree = {}
-    all_article_divs = [d for d in soup.find_all("div", class_=re.compile(r"^article_item"))
-                        if "article_item_popup" not in d.get("class", [])]
-
-    if all_article_divs:
-        for elem in all_article_divs[0].find_all_previous("div", class_="HTMLContainer"):
-            t = _container_to_text(elem)
-            if t and ("بعون الله" in t or "بسم الله" in t or "مرسوم ملكي" in t or "أمر ملكي" in t):
-                royal_decree["text"] = t
-                dm = re.search(
-                    r"(?:أمر|مرسوم)\s+ملكي\s+رقم\s+([^\s]+)\s+(?:بتاريخ|وتاريخ)\s+([٠-٩\d\s/]+)", t)
-                if dm:
-                    royal_decree["number"] = _clean(dm.group(1))
-                    royal_decree["date_hijri"] = dm.group(2).translate(_HINDI).strip()
-                break
-
-    # Cabinet decision (integrated extraction)
-    cabinet_text = _extract_cabinet_decision(soup)
+def _parse_law(html, law_id, metrics=None):
+    m = metrics or _LawMetrics(law_id)
+    with m.stage("parse.soup"):
+        soup = BeautifulSoup(html, "html.parser")
+    with m.stage("parse.meta"):
+        meta = _extract_meta(soup)
+
+    with m.stage("parse.preamble"):
+        # Royal decree
+        royal_decree = {}
+        all_article_divs = [d for d in soup.find_all("div", class_=re.compile(r"^article_item"))
+                            if "article_item_popup" not in d.get("class", [])]
+
+        if all_article_divs:
+            for elem in all_article_divs[0].find_all_previous("div", class_="HTMLContainer"):
+                t = _container_to_text(elem)
+                if t and ("بعون الله" in t or "بسم الله" in t or "مرسوم ملكي" in t or "أمر ملكي" in t):
+                    royal_decree["text"] = t
+                    dm = re.search(
+                        r"(?:أمر|مرسوم)\s+ملكي\s+رقم\s+([^\s]+)\s+(?:بتاريخ|وتاريخ)\s+([٠-٩\d\s/]+)", t)
+                    if dm:
+                        royal_decree["number"] = _clean(dm.group(1))
+                        royal_decree["date_hijri"] = dm.group(2).translate(_HINDI).strip()
+                    break
+
+        # Cabinet decision (integrated extraction)
+        cabinet_text = _extract_cabinet_decision(soup)
 
     # Structural headings
-    structures = []
-    for h3 in soup.find_all("h3"):
-        t = _clean(h3.get_text(strip=True))
-        kw = _is_structural(t)
-        if kw:
-            structures.append({"type": kw, "text": t})
-
-    # Articles
+    with m.stage("parse.headings"):
+        structures = []
+        for h3 in soup.find_all("h3"):
+            t = _clean(h3.get_text(strip=True))
+            kw = _is_structural(t)
+            if kw:
+                structures.append({"type": kw, "text": t})
+
+    # Articles (popups indexed once for the whole page, not searched per article)
+    with m.stage("parse.articles"):
+        popups = PopupIndex(soup)
     heading_stack = []
     articles = []
     for adiv in all_article_divs:
-        for prev_h3 in adiv.find_all_previous("h3"):
-            t = _clean(prev_h3.get_text(strip=True))
-            kw = _is_structural(t)
-            if kw:
-                lvl = _STRUCT_ORDER.get(kw, 0)
-                heading_stack = heading_stack[:lvl]
-                while len(heading_stack) <= lvl:
-                    heading_stack.append(None)
-                heading_stack[lvl] = t
-                break
-        art = _parse_article(adiv, soup)
+        with m.stage("parse.headings"):
+            for prev_h3 in adiv.find_all_previous("h3"):
+                t = _clean(prev_h3.get_text(strip=True))
+                kw = _is_structural(t)
+                if kw:
+                    lvl = _STRUCT_ORDER.get(kw, 0)
+                    heading_stack = heading_stack[:lvl]
+                    while len(heading_stack) <= lvl:
+                        heading_stack.append(None)
+                    heading_stack[lvl] = t
+                    break
+        with m.stage("parse.articles"):
+            art = _parse_article(adiv, popups)
         if art is None:
             continue
         art["heading_context"] = [h for h in heading_stack if h]
@@ -637,43 +660,57 @@ def _get_folder_laws(fid):
     return laws
 
 
-def _extract_one(law_id, name, idx, total):
+def _extract_one(law_id, name, idx, total, metrics=None):
     """Extract a single law and save to JSON."""
+    m = metrics or _LawMetrics(law_id, name)
     print(f"  [{idx}/{total}] {name[:55]}...", end=" ", flush=True)
     try:
-        r = sess.get(f"{BASE_URL}/BoeLaws/Laws/LawDetails/{law_id}/1", timeout=30)
+        with m.stage("fetch"):
+            r = sess.get(f"{BASE_URL}/BoeLaws/Laws/LawDetails/{law_id}/1", timeout=30)
         if r.status_code != 200:
+            m.status = f"http_{r.status_code}"
             print(f"HTTP {r.status_code}")
             return None
         r.encoding = 'utf-8'
+        m.count("html_bytes", len(r.content))
 
-        law = _parse_law(r.text, law_id)
+        with m.stage("parse"):
+            law = _parse_law(r.text, law_id, m)
 
         # Download amendment PDFs
         pdf_n = 0
-        for art in law.get("articles", []):
-            for amd in art.get("amendments", []):
-                if "pdf_url" in amd:
-                    try:
-                        fn = f"{law_id}_art{art.get('number','x')}_{pdf_n}.pdf"
-                        fp = PDF_DIR / fn
-                        if not fp.exists():
-                            pr = sess.get(amd["pdf_url"], timeout=30)
-                            if pr.status_code == 200 and len(pr.content) > 100:
-                                fp.write_bytes(pr.content)
-                                amd["pdf_local_path"] = f"amendments_pdf/{fn}"
-                                pdf_n += 1
-                    except Exception:
-                        pass
+        with m.stage("pdfs"):
+            for art in law.get("articles", []):
+                for amd in art.get("amendments", []):
+                    if "pdf_url" in amd:
+                        try:
+                            fn = f"{law_id}_art{art.get('number','x')}_{pdf_n}.pdf"
+                            fp = PDF_DIR / fn
+                            if not fp.exists():
+                                pr = sess.get(amd["pdf_url"], timeout=30)
+                                m.count("pdf_requests")
+                                if pr.status_code == 200 and len(pr.content) > 100:
+                                    fp.write_bytes(pr.content)
+                                    amd["pdf_local_path"] = f"amendments_pdf/{fn}"
+                                    pdf_n += 1
+                                    m.count("pdf_bytes", len(pr.content))
+                        except Exception:
+                            pass
 
         # Save
-        out = LAWS_DIR / f"{law_id}_boe.json"
-        out.write_text(json.dumps(law, ensure_ascii=False, indent=2), encoding="utf-8")
+        with m.stage("write"):
+            out = LAWS_DIR / f"{law_id}_boe.json"
+            data = json.dumps(law, ensure_ascii=False, indent=2)
+            out.write_text(data, encoding="utf-8")
+        m.count("json_chars", len(data))
 
         na = len(law["articles"])
         na_amd = sum(1 for a in law["articles"] if a["status"] == "amended")
         na_cnl = sum(1 for a in law["articles"] if a["status"] == "canceled")
         has_cd = bool(law.get("cabinet_decision_text"))
+        m.count("articles", na)
+        m.count("amended", na_amd)
+        m.count("amendments", sum(len(a["amendments"]) for a in law["articles"]))
         info = f"{na} art"
         if na_amd: info += f", {na_amd} amd"
         if na_cnl: info += f", {na_cnl} cnl"
@@ -682,6 +719,8 @@ def _extract_one(law_id, name, idx, total):
         return law
 
     except Exception as e:
+        m.status = "error"
+        m.error = str(e)
         print(f"ERROR: {e}")
         return None
 
@@ -748,6 +787,17 @@ def _update_indexes():
     return len(lib), len(idx)
 
 
+def _update_articles_index():
+    """Refresh law_articles / law_articles_fts in data.db for the laws that changed."""
+    sys.path.insert(0, str(Path(__file__).parent))
+    from law_articles_index import DB_FILE, update_law_articles_index
+    if not DB_FILE.exists():
+        print("  data.db not found — skipping law_articles index "
+              "(run scripts/download-db.sh or scripts/law_articles_index.py)")
+        return None
+    return update_law_articles_index(DB_FILE, LIB_FILE, LAWS_DIR)
+
+
 # ── State management ─────────────────────────────────────────────────
 def _load_state():
     if STATE_FILE.exists():
@@ -758,6 +808,78 @@ def _save_state(state):
     STATE_FILE.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
+# ── Metrics ──────────────────────────────────────────────────────────
+class _LawMetrics:
+    """Per-stage wall time (seconds) and counters for one law.
+
+    Stages: fetch, parse (with parse.soup / .meta / .preamble / .headings /
+    .articles inside it), pdfs, write; main adds total.
+    """
+
+    def __init__(self, law_id, name=""):
+        self.law_id = law_id
+        self.name = name
+        self.status = "ok"
+        self.error = None
+        self.stages = {}
+        self.counts = {}
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - t0
+
+    def count(self, name, n=1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def record(self, run):
+        rec = {"run": run, "law_id": self.law_id, "name": self.name, "status": self.status,
+               "seconds": {k: round(v, 4) for k, v in self.stages.items()}, "counts": self.counts}
+        if self.error:
+            rec["error"] = self.error
+        return rec
+
+
+def _percentile(sorted_values, q):
+    """Nearest-rank percentile of an ascending list."""
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def _print_metrics_summary(all_metrics):
+    if not all_metrics:
+        return
+    stages = sorted({s for m in all_metrics for s in m.stages})
+    print(f"\n  Stage timings over {len(all_metrics)} laws (seconds):")
+    print(f"  {'stage':<16} {'p50':>8} {'p95':>8} {'max':>8} {'sum':>9}")
+    for stage in stages:
+        # Over the laws that reached the stage (an HTTP error has no parse)
+        vals = sorted(m.stages[stage] for m in all_metrics if stage in m.stages)
+        print(f"  {stage:<16} {_percentile(vals, 0.5):8.3f} {_percentile(vals, 0.95):8.3f} "
+              f"{vals[-1]:8.3f} {sum(vals):9.1f}")
+
+    # Innermost stages only, so the slowest stage of a law is never just "parse"
+    leaves = [s for s in stages if s != "total" and not any(o.startswith(s + ".") for o in stages)]
+    print(f"\n  Slowest laws:")
+    for m in sorted(all_metrics, key=lambda m: -m.stages.get("total", 0.0))[:SLOWEST_LAWS]:
+        worst = max(leaves, key=lambda s: m.stages.get(s, 0.0), default="")
+        print(f"  {m.stages.get('total', 0.0):7.2f}s  {worst:<16} {m.counts.get('articles', 0):>4} art  "
+              f"{m.law_id}  {m.name[:40]}")
+
+
+def _dump_profiles(profiles):
+    """Save and print the cProfile stats kept for the slowest laws."""
+    import pstats
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    for seconds, m, prof in profiles:
+        out = PROFILE_DIR / f"{m.law_id}.prof"
+        prof.dump_stats(str(out))
+        print(f"\n{'─' * 65}\n  Profile: {m.name[:50]} ({seconds:.2f}s) -> {out.relative_to(PROJECT)}")
+        pstats.Stats(prof, stream=sys.stdout).sort_stats("cumulative").print_stats(15)
+
+
 # ── Main ─────────────────────────────────────────────────────────────
 def main():
     parser = argparse.ArgumentParser(description="Extract all BOE laws")
@@ -765,6 +887,10 @@ def main():
     parser.add_argument("--resume", action="store_true", help="Skip already-extracted laws")
     parser.add_argument("--limit", type=int, default=0, help="Limit laws per folder (0=all)")
     parser.add_argument("--delay", type=float, default=0.5, help="Delay between requests (seconds)")
+    parser.add_argument("--metrics", default=str(METRICS_FILE),
+                        help="Per-law stage timings, appended as JSON lines")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"cProfile every law, keep and print the {PROFILE_TOP} slowest")
     args = parser.parse_args()
 
     # Always resume by default (skip existing files)
@@ -794,6 +920,13 @@ def main():
     total_errors = 0
     total_skipped = 0
 
+    run = time.strftime("%Y-%m-%dT%H:%M:%S")
+    all_metrics = []
+    profiles = []   # (seconds, metrics, cProfile.Profile), slowest PROFILE_TOP laws
+    if args.profile:
+        import cProfile
+    metrics_out = open(args.metrics, "a", encoding="utf-8")
+
     for folder in folders:
         fid = folder["id"]
         fname = folder["name_ar"]
@@ -830,7 +963,20 @@ def main():
         print(f"  Extracting {len(to_extract)} laws...\n")
 
         for i, law_info in enumerate(to_extract, 1):
-            d = _extract_one(law_info["id"], law_info["name"], i, len(to_extract))
+            metrics = _LawMetrics(law_info["id"], law_info["name"])
+            prof = cProfile.Profile() if args.profile else None
+            with metrics.stage("total"):
+                if prof:
+                    d = prof.runcall(_extract_one, law_info["id"], law_info["name"], i, len(to_extract), metrics)
+                else:
+                    d = _extract_one(law_info["id"], law_info["name"], i, len(to_extract), metrics)
+            all_metrics.append(metrics)
+            metrics_out.write(json.dumps(metrics.record(run), ensure_ascii=False) + "\n")
+            metrics_out.flush()
+            if prof:
+                profiles.append((metrics.stages["total"], metrics, prof))
+                profiles.sort(key=lambda p: -p[0])
+                del profiles[PROFILE_TOP:]
             if d:
                 total_extracted += 1
                 existing_ids.add(law_info["id"])
@@ -849,12 +995,15 @@ def main():
         state["last_folder"] = fid
         _save_state(state)
 
+    metrics_out.close()
+
     # Update indexes with ALL extracted laws
     print(f"\n{'─' * 65}")
     print(f"  Updating indexes...")
     nl, ni = _update_indexes()
     print(f"  library.json: {nl} entries")
     print(f"  boe_laws_index.json: {ni} entries")
+    _update_articles_index()
 
     # Final summary
     print(f"\n{'=' * 65}")
@@ -865,6 +1014,12 @@ def main():
     print(f"  Total in library: {nl}")
     print(f"{'=' * 65}")
 
+    if all_metrics:
+        _print_metrics_summary(all_metrics)
+        print(f"\n  Metrics: {args.metrics}")
+    if profiles:
+        _dump_profiles(profiles)
+
 
 if __name__ == "__main__":
     main()
@@ -13,10 +13,20 @@ BOE page structure before first article:
   <p>  بسم الله الرحمن الرحيم
   <h4> قرار مجلس الوزراء رقم ...
   <p>  إن مجلس الوزراء ...
+
+Usage:
+  python scripts/extract_cabinet_decisions.py                       # fetch each page from BOE
+  python scripts/extract_cabinet_decisions.py --html-dir pages/     # use cached <law_id>.html first
+  python scripts/extract_cabinet_decisions.py --offline [--html-dir pages/]
+
+--offline never touches the network: cached pages are used when there
+are any, otherwise the decision is taken from the law JSON itself, where
+some royal decree texts run on into it ("قرار رقم ... / إن مجلس الوزراء").
 """
 
 import requests
 from bs4 import BeautifulSoup
+import argparse
 import json
 import time
 import sys
@@ -25,6 +35,9 @@ import re
 from pathlib import Path
 import urllib3
 
+sys.path.insert(0, str(Path(__file__).parent))
+from boe_parser import element_text
+
 # Fix Windows encoding
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -56,14 +69,17 @@ def fetch_law_page(law_id):
         return None
 
 
+def load_cached_page(html_dir, law_id):
+    """Cached law page <html_dir>/<law_id>.html, or None"""
+    path = Path(html_dir) / f"{law_id}.html"
+    if not path.exists():
+        return None
+    return path.read_text(encoding='utf-8', errors='replace')
+
+
 def clean_text(elem):
     """Extract clean text from an element, preserving line breaks"""
-    elem_copy = BeautifulSoup(str(elem), 'html.parser')
-    for br in elem_copy.find_all('br'):
-        br.replace_with('\n')
-    text = elem_copy.get_text(separator=' ', strip=False)
-    lines = [' '.join(line.split()) for line in text.split('\n') if line.strip()]
-    return '\n'.join(lines)
+    return element_text(elem)
 
 
 def extract_cabinet_decision(html_content):
@@ -75,9 +91,13 @@ def extract_cabinet_decision(html_content):
       <h4> قرار مجلس الوزراء رقم ...
       <p>  إن مجلس الوزراء ...
 
+    html_content may also be an already-parsed BeautifulSoup.
     Returns: (header_text, body_text) or (None, None)
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    if isinstance(html_content, BeautifulSoup):
+        soup = html_content
+    else:
+        soup = BeautifulSoup(html_content, 'html.parser')
 
     # Find first article div
     article_divs = soup.find_all('div', class_=re.compile(r'article_item'))
@@ -141,9 +161,36 @@ def extract_cabinet_decision(html_content):
     return None, None
 
 
+# "قرار رقم (٣٦٦) وتاريخ ..." / "قرار مجلس الوزراء رقم ..." followed by "إن مجلس الوزراء"
+_DECISION_HEADER_RE = re.compile(r'^قرار\s+(?:مجلس الوزراء\s+)?رقم\b.*\n\s*إن مجلس الوزراء', re.M)
+
+
+def cabinet_decision_from_law(law_data):
+    """
+    Cabinet decision already inside a law JSON, without the page.
+
+    Some royal decree texts were extracted together with the decision that
+    follows them on the page. Returns the text from the decision header on,
+    or None.
+    """
+    decree = law_data.get('royal_decree')
+    text = decree.get('text') if isinstance(decree, dict) else None
+    if not text:
+        return None
+    m = _DECISION_HEADER_RE.search(text)
+    return text[m.start():].strip() if m else None
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Add cabinet_decision_text to BOE law files")
+    parser.add_argument("--html-dir", help="Cached law pages (<law_id>.html), used before fetching")
+    parser.add_argument("--offline", action="store_true",
+                        help="No network: cached pages, else the decision inside the law JSON")
+    parser.add_argument("--delay", type=float, default=2, help="Delay after each fetch (seconds)")
+    args = parser.parse_args()
+
     print("=" * 60)
-    print("Extract Cabinet Decisions from BOE")
+    print("Extract Cabinet Decisions from BOE" + (" (offline)" if args.offline else ""))
     print("=" * 60 + "\n")
 
     # Find all BOE law files
@@ -168,15 +215,22 @@ def main():
 
         print(f"[{i}/{len(boe_files)}] {title[:60]}...")
 
-        # Fetch page from BOE
-        html = fetch_law_page(law_id)
-        if not html:
-            results['error'].append(law_id)
-            time.sleep(2)
-            continue
+        html = load_cached_page(args.html_dir, law_id) if args.html_dir else None
+        fetched = False
+        if html is None and not args.offline:
+            # Fetch page from BOE
+            html = fetch_law_page(law_id)
+            fetched = True
+            if not html:
+                results['error'].append(law_id)
+                time.sleep(args.delay)
+                continue
 
         # Extract cabinet decision
-        header, full_text = extract_cabinet_decision(html)
+        if html is not None:
+            header, full_text = extract_cabinet_decision(html)
+        else:
+            full_text = cabinet_decision_from_law(law_data)
 
         if full_text:
             # Add to existing data WITHOUT modifying anything else
@@ -194,7 +248,8 @@ def main():
             results['no_decision'].append(law_id)
 
         # Be nice to the server
-        time.sleep(2)
+        if fetched:
+            time.sleep(args.delay)
 
     # Summary
     print(f"\n{'=' * 60}")
@@ -55,7 +55,8 @@ sess.headers.update({
 })
 
 # ── Arabic helpers ────────────────────────────────────────────────────
-_HINDI = str.maketrans("٠١٢٣٤٥٦٧٨٩", "0123456789")
+sys.path.insert(0, str(Path(__file__).parent))
+from arabic_text import DIGITS_TABLE as _HINDI
 
 # Ordinals — longest first so الحادية عشرة matches before الأولى
 _ORDINALS = []
@@ -793,6 +794,17 @@ def _update_indexes(laws):
     return len(lib), len(idx)
 
 
+def _update_articles_index():
+    """Refresh law_articles / law_articles_fts in data.db for the laws that changed."""
+    sys.path.insert(0, str(Path(__file__).parent))
+    from law_articles_index import DB_FILE, update_law_articles_index
+    if not DB_FILE.exists():
+        print("  data.db not found — skipping law_articles index "
+              "(run scripts/download-db.sh or scripts/law_articles_index.py)")
+        return None
+    return update_law_articles_index(DB_FILE, LIB_FILE, LAWS_DIR)
+
+
 # ── Main ─────────────────────────────────────────────────────────────
 
 def main():
@@ -819,6 +831,7 @@ def main():
     nl, ni = _update_indexes(extracted)
     print(f"  library.json: {nl} entries")
     print(f"  boe_laws_index.json: {ni} entries")
+    _update_articles_index()
 
     # Dist sync
     import shutil
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FTS Shadow — normalized full-text indexes for law_articles and judgments.
+
+law_articles_fts / judgments_fts index the stored text as is, and the FTS5
+`unicode61 remove_diacritics 2` tokenizer does not fold أ/إ/آ/ا or ة/ه, so a
+query for "المحكمه" or "الاستئناق" misses every correctly spelled row (and
+vice versa). The server fixes those spellings only in the text it serves
+(server/arabicTextNormalizer.ts), which is too late for MATCH.
+
+This stage builds a second, normalized index per table:
+
+  law_articles_norm_fts(law_name, article_text, article_heading, stem)
+  judgments_norm_fts(text, court_body, stem)
+
+Both are external-content tables over the original rows (through the
+views law_articles_norm_src / judgments_norm_src, which add `stem` as a
+second copy of article_text / text), but the terms they hold come from
+the normalized text:
+  - LEGAL_CORRECTIONS, read from server/arabicTextNormalizer.ts so both
+    sides share one table, applied in the same order;
+  - then SEARCH_FOLD (arabic_text.py), the fold server/searchUtils.ts
+    applies to queries: harakat and tatweel dropped, أ/إ/آ/ٱ -> ا, ى -> ي,
+    ؤ -> و, ئ -> ي, ة -> ه;
+  - the `stem` column holds the normalized text with every word replaced
+    by its light stem (arabic_stemmer.py), so والمحكمه, للمحكمه and
+    المحكمه are all the term محكم there.
+snippet()/highlight() re-tokenize the original row from the content
+table, so the normalized text must split into exactly the same tokens.
+unicode61 treats harakat as separators ("قُدِّم" is three tokens), so the
+shadow tables declare them as tokenchars: vocalized words stay one token
+in the original and match their bare form in the shadow text. Letter folds,
+the corrections (word for word) and stemming (one stem per word) never
+change the token count.
+
+The server runs the query through the same corrections and fold
+(buildNormalizedFtsQuery) and MATCHes the shadow table; no variant
+expansion and no per-hit normalization at request time. Non-exact queries
+go to the `stem` column instead (buildStemmedFtsQuery): every word found in
+`fts_stems` — the stem dictionary this stage writes while indexing — becomes
+one exact stem term instead of a prefix scan.
+
+`fts_shadow_state` records the row count, max id and normalizer version
+each shadow index was built for; server/db.ts only switches to a shadow
+index whose state matches its base table. law_articles_index.py and
+judgments_db.JudgmentsLoader keep a built shadow index current as they
+insert and delete rows; anything else that writes those tables (the
+TypeScript importers, server/db.ts's own reindex) leaves it stale until
+this script runs again.
+
+Usage:
+  python scripts/fts_shadow.py                      # build/refresh both (./data.db)
+  python scripts/fts_shadow.py --table judgments
+  python scripts/fts_shadow.py --db other.db --full # rebuild even if current
+"""
+
+import re
+import sys
+import time
+import sqlite3
+import hashlib
+import argparse
+import unicodedata
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+if sys.platform == "win32" and __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+sys.path.insert(0, str(Path(__file__).parent))
+from arabic_text import SEARCH_FOLD, replace_all
+from arabic_stemmer import STEMMER_VERSION, STEMS, stem_text
+
+PROJECT = Path(__file__).resolve().parent.parent
+DB_FILE = PROJECT / "data.db"
+TS_NORMALIZER = PROJECT / "server" / "arabicTextNormalizer.ts"
+
+# Same tuning as server/db.ts
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA mmap_size = 268435456",
+]
+
+# Rows normalized and indexed per transaction during a rebuild
+BATCH_SIZE = 2000
+
+
+
+class ShadowIndex(NamedTuple):
+    base: str                 # base table
+    fts: str                  # normalized FTS5 table
+    source: str               # content view: base columns plus `stem`
+    columns: Tuple[str, ...]  # indexed columns (same names as in the base table)
+    stemmed: str              # column whose stems fill the `stem` column
+
+
+SHADOWS = {
+    "law_articles": ShadowIndex("law_articles", "law_articles_norm_fts", "law_articles_norm_src",
+                                ("law_name", "article_text", "article_heading"), "article_text"),
+    "judgments": ShadowIndex("judgments", "judgments_norm_fts", "judgments_norm_src",
+                             ("text", "court_body"), "text"),
+}
+
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fts_shadow_state (
+    base_table TEXT PRIMARY KEY,
+    row_count INTEGER NOT NULL,
+    max_id INTEGER NOT NULL,
+    version TEXT NOT NULL,
+    built_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+CREATE TABLE IF NOT EXISTS fts_stems (
+    word TEXT PRIMARY KEY,
+    stem TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+_CORRECTIONS_BLOCK_RE = re.compile(r"const LEGAL_CORRECTIONS\b[^=]*=\s*\[(.*?)\n\];", re.S)
+_CORRECTION_PAIR_RE = re.compile(r"\[\s*'([^']+)'\s*,\s*'([^']*)'\s*\]")
+
+
+def load_legal_corrections(path: Path = TS_NORMALIZER):
+    """[(wrong, right), ...] from LEGAL_CORRECTIONS in arabicTextNormalizer.ts, in order."""
+    m = _CORRECTIONS_BLOCK_RE.search(Path(path).read_text(encoding="utf-8"))
+    pairs = _CORRECTION_PAIR_RE.findall(m.group(1)) if m else []
+    if not pairs:
+        raise ValueError(f"No LEGAL_CORRECTIONS table found in {path}")
+    return pairs
+
+
+LEGAL_CORRECTIONS = load_legal_corrections()
+
+# The combining marks SEARCH_FOLD drops are token characters here (see above)
+TOKEN_MARKS = "".join(sorted(c for c, repl in SEARCH_FOLD.mapping.items()
+                             if repl is None and unicodedata.category(c) == "Mn"))
+TOKENIZER = f"unicode61 remove_diacritics 2 tokenchars '{TOKEN_MARKS}'"
+
+# Changes whenever the corrections, the fold, the stemmer or the tokenizer
+# change, so a stale shadow index is rebuilt instead of being extended
+NORMALIZER_VERSION = hashlib.sha256(repr(
+    (LEGAL_CORRECTIONS, sorted(SEARCH_FOLD.mapping.items()), STEMMER_VERSION, TOKENIZER)
+).encode("utf-8")).hexdigest()[:16]
+
+
+def normalize_for_search(text: Optional[str]) -> Optional[str]:
+    """Text as the shadow index sees it: LEGAL_CORRECTIONS, then SEARCH_FOLD."""
+    if not text:
+        return text
+    return SEARCH_FOLD(replace_all(text, LEGAL_CORRECTIONS))
+
+
+def _index_rows(spec, rows):
+    """(id, *normalized columns, stems) for rows selected with _select_sql()."""
+    i = spec.columns.index(spec.stemmed)
+    for row in rows:
+        values = [normalize_for_search(v) for v in row[1:]]
+        yield (row[0], *values, stem_text(values[i]))
+
+
+def _select_sql(spec):
+    return f"SELECT id, {', '.join(spec.columns)} FROM {spec.base}"
+
+
+def _fts_columns(spec):
+    return (*spec.columns, "stem")
+
+
+def _insert_sql(spec, delete=False):
+    cols = _fts_columns(spec)
+    marks = ", ".join("?" for _ in cols)
+    if delete:
+        return f"INSERT INTO {spec.fts}({spec.fts}, rowid, {', '.join(cols)}) VALUES ('delete', ?, {marks})"
+    return f"INSERT INTO {spec.fts}(rowid, {', '.join(cols)}) VALUES (?, {marks})"
+
+
+def save_stems(conn):
+    """Add the stems computed since the last call to fts_stems (read by the server)."""
+    pending = STEMS.take_pending()
+    if pending:
+        conn.executemany("INSERT OR IGNORE INTO fts_stems (word, stem) VALUES (?, ?)", pending)
+    return len(pending)
+
+
+def ensure_schema(conn, name):
+    """Create the shadow table, its content view and the state/stem tables."""
+    spec = SHADOWS[name]
+    conn.executescript(STATE_SCHEMA)
+    existing = [row[1] for row in conn.execute(f"PRAGMA table_info({spec.fts})")]
+    if existing and existing != list(_fts_columns(spec)):
+        # Built by an older layout (no stem column): start over
+        conn.executescript(f"""
+            DROP TABLE {spec.fts};
+            DELETE FROM fts_shadow_state WHERE base_table = '{name}';
+        """)
+    # Stems from another stemmer version are wrong for every table
+    stems_version = conn.execute(
+        "SELECT version FROM fts_shadow_state WHERE base_table = 'fts_stems'").fetchone()
+    if stems_version is None or stems_version[0] != NORMALIZER_VERSION:
+        conn.executescript(f"""
+            DELETE FROM fts_stems;
+            INSERT OR REPLACE INTO fts_shadow_state (base_table, row_count, max_id, version)
+            VALUES ('fts_stems', 0, 0, '{NORMALIZER_VERSION}');
+        """)
+        STEMS.pending = [(w, s) for w, s in STEMS.items() if w != s]
+    conn.executescript(f"""
+        CREATE VIEW IF NOT EXISTS {spec.source} AS
+            SELECT id, {', '.join(spec.columns)}, {spec.stemmed} AS stem FROM {spec.base};
+        CREATE VIRTUAL TABLE IF NOT EXISTS {spec.fts} USING fts5(
+            {', '.join(_fts_columns(spec))},
+            content='{spec.source}',
+            content_rowid='id',
+            tokenize="{TOKENIZER}"
+        );
+    """)
+
+
+def is_current(conn, name) -> bool:
+    """True if the shadow index was built with this normalizer (writers then keep it in sync)."""
+    try:
+        row = conn.execute("SELECT version FROM fts_shadow_state WHERE base_table = ?",
+                           (name,)).fetchone()
+    except sqlite3.OperationalError:
+        return False
+    return row is not None and row[0] == NORMALIZER_VERSION
+
+
+def index_after(conn, name, last_id) -> int:
+    """Add rows with id > last_id (just inserted) to the shadow index."""
+    spec = SHADOWS[name]
+    rows = conn.execute(f"{_select_sql(spec)} WHERE id > ? ORDER BY id", (last_id,)).fetchall()
+    conn.executemany(_insert_sql(spec), _index_rows(spec, rows))
+    save_stems(conn)
+    return len(rows)
+
+
+def delete_where(conn, name, where, params=()) -> int:
+    """
+    Remove rows matching `where` from the shadow index. Call it before the
+    rows are deleted from the base table: external-content FTS needs the
+    exact values that were indexed, recomputed here from the stored text.
+    """
+    spec = SHADOWS[name]
+    rows = conn.execute(f"{_select_sql(spec)} WHERE {where}", params).fetchall()
+    conn.executemany(_insert_sql(spec, delete=True), _index_rows(spec, rows))
+    return len(rows)
+
+
+def reset(conn, name):
+    """Empty the shadow index and forget its state (the base table is being emptied or rebuilt)."""
+    fts = SHADOWS[name].fts
+    conn.execute(f"INSERT INTO {fts}({fts}) VALUES('delete-all')")
+    conn.execute("DELETE FROM fts_shadow_state WHERE base_table = ?", (name,))
+
+
+def record_state(conn, name):
+    """Store the base table's row count and max id next to the normalizer version."""
+    count, max_id = conn.execute(
+        f"SELECT count(*), COALESCE(MAX(id), 0) FROM {SHADOWS[name].base}").fetchone()
+    conn.execute(
+        "INSERT OR REPLACE INTO fts_shadow_state (base_table, row_count, max_id, version, built_at) "
+        "VALUES (?, ?, ?, ?, datetime('now'))", (name, count, max_id, NORMALIZER_VERSION))
+
+
+def record_changes(conn, name, added, removed):
+    """Cheap state update for writers that know how many rows they added/removed."""
+    conn.execute(
+        f"UPDATE fts_shadow_state SET row_count = row_count + ?, "
+        f"max_id = (SELECT COALESCE(MAX(id), 0) FROM {SHADOWS[name].base}), "
+        f"built_at = datetime('now') WHERE base_table = ?", (added - removed, name))
+
+
+def _base_exists(conn, name):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                        (SHADOWS[name].base,)).fetchone() is not None
+
+
+def rebuild(conn, name, batch_size=BATCH_SIZE, verbose=True) -> int:
+    """Rebuild one shadow index from its base table, batch by batch."""
+    spec = SHADOWS[name]
+    ensure_schema(conn, name)
+    insert_sql = _insert_sql(spec)
+    t0 = time.perf_counter()
+
+    conn.execute("BEGIN")
+    reset(conn, name)
+    conn.execute("COMMIT")
+
+    last_id, total = 0, 0
+    while True:
+        rows = conn.execute(f"{_select_sql(spec)} WHERE id > ? ORDER BY id LIMIT ?",
+                            (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        conn.execute("BEGIN")
+        conn.executemany(insert_sql, _index_rows(spec, rows))
+        save_stems(conn)
+        conn.execute("COMMIT")
+        last_id = rows[-1][0]
+        total += len(rows)
+        if verbose and total % (batch_size * 50) == 0:
+            print(f"  {spec.fts}: {total} rows ({total / (time.perf_counter() - t0):.0f} rows/s)")
+
+    conn.execute("BEGIN")
+    record_state(conn, name)
+    conn.execute("COMMIT")
+    conn.execute(f"INSERT INTO {spec.fts}({spec.fts}) VALUES('optimize')")
+    if verbose:
+        print(f"  {spec.fts}: {total} rows indexed in {time.perf_counter() - t0:.1f}s "
+              f"({len(STEMS)} distinct words stemmed)")
+    return total
+
+
+def refresh(conn, name, full=False, verbose=True):
+    """Rebuild the shadow index unless its state already matches the base table."""
+    if not _base_exists(conn, name):
+        if verbose:
+            print(f"  {name}: no such table, skipped")
+        return
+    ensure_schema(conn, name)
+    if not full and is_current(conn, name):
+        state = conn.execute("SELECT row_count, max_id FROM fts_shadow_state WHERE base_table = ?",
+                             (name,)).fetchone()
+        live = conn.execute(
+            f"SELECT count(*), COALESCE(MAX(id), 0) FROM {SHADOWS[name].base}").fetchone()
+        if tuple(state) == tuple(live):
+            if verbose:
+                print(f"  {SHADOWS[name].fts}: up to date ({live[0]} rows)")
+            return
+    rebuild(conn, name, verbose=verbose)
+
+
+def open_db(db_path=DB_FILE):
+    conn = sqlite3.connect(str(db_path), isolation_level=None)
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build normalized shadow FTS indexes in data.db")
+    parser.add_argument("--db", default=str(DB_FILE), help="SQLite database (default: ./data.db)")
+    parser.add_argument("--table", choices=sorted(SHADOWS), action="append",
+                        help="Base table to index (repeatable; default: all)")
+    parser.add_argument("--full", action="store_true", help="Rebuild even if the index is current")
+    args = parser.parse_args()
+
+    conn = open_db(args.db)
+    try:
+        for name in args.table or sorted(SHADOWS):
+            refresh(conn, name, full=args.full)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Judgment Dedup — persistent fingerprint index for extracted judgments.
+
+The same ruling can reach data.db more than once: from the MOJ portal JSON
+(extract_judgments.py), the 1435 PDF volumes (extract_moj_judgments.py),
+the BOG OCR volumes (bog_split_judgments.py), or a re-run of any of them.
+Every judgment gets two fingerprints:
+
+  - text_hash: sha1 of the normalized text (diacritics, tatweel, hamza and
+    alef forms, digits, punctuation and whitespace folded); '' when nothing
+    is left after normalizing, and such records never match by text;
+  - key_hash: sha1 of the normalized case number + judgment date, when
+    both are present.
+
+The fingerprints live in the `judgment_fingerprints` table of an SQLite
+file (data.db by default), so a batch is checked with a few indexed IN
+queries — O(batch), whatever the size of the corpus. A judgment is a
+duplicate when either fingerprint is already owned by a different
+(source, case_id); re-importing the same record is not a duplicate.
+
+The judgments already in the database (loaded before the index existed,
+or by the TypeScript importers) are fingerprinted when the table is first
+created, and again with --backfill for rows added since without the loader.
+
+Usage as a module (JudgmentsLoader does this when given dedup=True):
+    from judgment_dedup import JudgmentDedupIndex
+
+    index = JudgmentDedupIndex(conn)
+    fresh, duplicates = index.filter_batch(judgments, source="bog_judicial")
+
+Usage as a tool, before a JSON/JSONL import:
+    python scripts/judgment_dedup.py output/all_moj_judgments.jsonl --source moj_research \
+        --output deduped.jsonl --report duplicates.jsonl
+    python scripts/judgment_dedup.py --backfill     # fingerprint the judgments table
+"""
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from arabic_text import fold_for_matching
+from judgment_stream import JsonlJudgmentWriter, iter_jsonl
+
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parent.parent / "data.db"
+
+FINGERPRINT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS judgment_fingerprints (
+    text_hash TEXT NOT NULL,
+    key_hash TEXT,
+    source TEXT NOT NULL,
+    case_id TEXT NOT NULL,
+    PRIMARY KEY (source, case_id)
+);
+CREATE INDEX IF NOT EXISTS jf_text_hash_idx ON judgment_fingerprints(text_hash);
+CREATE INDEX IF NOT EXISTS jf_key_hash_idx ON judgment_fingerprints(key_hash);
+"""
+
+# SQLite's default limit on host parameters is 999
+_QUERY_CHUNK = 500
+
+_NON_WORD_RE = re.compile(r'[\W_]+')
+_DIGIT_RUN_RE = re.compile(r'\d+')
+
+
+def normalize_text(text: str) -> str:
+    """Fold the variations OCR and HTML cleaning introduce into one canonical form."""
+    return _NON_WORD_RE.sub(' ', fold_for_matching(text or '')).strip()
+
+
+def normalize_case_number(value) -> str:
+    return ''.join(_DIGIT_RUN_RE.findall(fold_for_matching(str(value or ''))))
+
+
+def normalize_date(value) -> str:
+    """Digits of a Hijri date, year first (1435/5/3 and 3/5/1435 agree)."""
+    parts = [p.lstrip('0') or '0' for p in _DIGIT_RUN_RE.findall(fold_for_matching(str(value or '')))]
+    if len(parts) >= 3 and len(parts[-1]) == 4 and len(parts[0]) != 4:
+        parts.reverse()
+    return '/'.join(parts)
+
+
+def fingerprint(judgment: dict) -> tuple[str, Optional[str]]:
+    """(text_hash or '', key_hash or None) for one extractor record or judgments row."""
+    text = normalize_text(judgment.get('text'))
+    # Every empty text would share sha1('')
+    text_hash = hashlib.sha1(text.encode('utf-8')).hexdigest() if text else ''
+    number = normalize_case_number(
+        judgment.get('case_number_raw') or judgment.get('case_number') or judgment.get('judgment_number'))
+    date = normalize_date(judgment.get('judgment_date') or judgment.get('session_date'))
+    key_hash = hashlib.sha1(f"{number}|{date}".encode('utf-8')).hexdigest() if number and date else None
+    return text_hash, key_hash
+
+
+class JudgmentDedupIndex:
+    """Fingerprint index stored in an SQLite connection (usually data.db)."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        created = not self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'judgment_fingerprints'").fetchone()
+        self.conn.executescript(FINGERPRINT_SCHEMA)
+        if created:
+            self.backfill()
+
+    @classmethod
+    def open(cls, path=DEFAULT_INDEX_PATH) -> "JudgmentDedupIndex":
+        conn = sqlite3.connect(str(path), isolation_level=None)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return cls(conn)
+
+    def _lookup(self, column: str, hashes: set) -> dict:
+        """hash -> (source, case_id) of the first owner in the index."""
+        found = {}
+        hashes = [h for h in hashes if h]
+        for i in range(0, len(hashes), _QUERY_CHUNK):
+            chunk = hashes[i:i + _QUERY_CHUNK]
+            rows = self.conn.execute(
+                f"SELECT {column}, source, case_id FROM judgment_fingerprints "
+                f"WHERE {column} IN ({', '.join('?' for _ in chunk)})", chunk)
+            for h, source, case_id in rows:
+                found.setdefault(h, (source, case_id))
+        return found
+
+    def filter_batch(self, judgments: list, source: str, record: bool = True):
+        """
+        Split a batch into (fresh, duplicates).
+
+        duplicates is a list of (judgment, match) where match describes the
+        record already owning the fingerprint: {"by", "source", "case_id"}.
+        With record=True the fresh judgments' fingerprints are added to the
+        index (the caller runs this inside its import transaction).
+        """
+        prints = [fingerprint(j) for j in judgments]
+        by_text = self._lookup('text_hash', {t for t, _ in prints})
+        by_key = self._lookup('key_hash', {k for _, k in prints})
+
+        fresh, duplicates, rows = [], [], []
+        for j, (text_hash, key_hash) in zip(judgments, prints):
+            me = (source, str(j.get('case_id')))
+            match = None
+            owner = by_text.get(text_hash) if text_hash else None
+            if owner and owner != me:
+                match = {'by': 'text', 'source': owner[0], 'case_id': owner[1]}
+            elif key_hash:
+                owner = by_key.get(key_hash)
+                if owner and owner != me:
+                    match = {'by': 'case_number+date', 'source': owner[0], 'case_id': owner[1]}
+            if match:
+                duplicates.append((j, match))
+                continue
+            fresh.append(j)
+            rows.append((text_hash, key_hash, me[0], me[1]))
+            # Later records in the same batch see this one
+            if text_hash:
+                by_text.setdefault(text_hash, me)
+            if key_hash:
+                by_key.setdefault(key_hash, me)
+
+        if record and rows:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO judgment_fingerprints (text_hash, key_hash, source, case_id) "
+                "VALUES (?, ?, ?, ?)", rows)
+        return fresh, duplicates
+
+    def backfill(self, batch_size: int = 1000) -> int:
+        """
+        Fingerprint the `judgments` rows of this database that have none yet
+        (loaded before the index existed, or by the TypeScript importers).
+        Returns the number of rows added; one transaction.
+        """
+        if not self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'judgments'").fetchone():
+            return 0
+        added = 0
+        self.conn.execute("BEGIN")
+        try:
+            cur = self.conn.execute(
+                "SELECT j.source, j.case_id, j.text, j.judgment_number, j.judgment_date FROM judgments j "
+                "WHERE NOT EXISTS (SELECT 1 FROM judgment_fingerprints f "
+                "                  WHERE f.source = j.source AND f.case_id = j.case_id) "
+                "ORDER BY j.id")
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                prints = []
+                for source, case_id, text, number, date in rows:
+                    text_hash, key_hash = fingerprint(
+                        {'text': text, 'judgment_number': number, 'judgment_date': date})
+                    prints.append((text_hash, key_hash, source, str(case_id)))
+                # The first row of a (source, case_id) keeps it, as the loader's lookups do
+                added += self.conn.executemany(
+                    "INSERT OR IGNORE INTO judgment_fingerprints (text_hash, key_hash, source, case_id) "
+                    "VALUES (?, ?, ?, ?)", prints).rowcount
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def forget_source(self, source: str):
+        """Drop a source's fingerprints (its rows are being replaced wholesale)."""
+        self.conn.execute("DELETE FROM judgment_fingerprints WHERE source = ?", (source,))
+
+    def close(self):
+        self.conn.close()
+
+
+def _iter_records(path: Path) -> Iterator[dict]:
+    if path.suffix == '.jsonl':
+        yield from iter_jsonl(path)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+
+
+def _batches(records: Iterable[dict], size: int) -> Iterator[list]:
+    batch = []
+    for r in records:
+        batch.append(r)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check extracted judgments against the dedup index")
+    parser.add_argument("input", nargs="?", help="Judgments .json (list) or .jsonl file")
+    parser.add_argument("--source", choices=["sa_judicial", "moj_research", "bog_judicial"],
+                        help="Source the records will be imported as (required with input)")
+    parser.add_argument("--backfill", action="store_true",
+                        help="First fingerprint the judgments rows of the index database that have none")
+    parser.add_argument("--index", default=str(DEFAULT_INDEX_PATH),
+                        help="SQLite file holding judgment_fingerprints (default: data.db)")
+    parser.add_argument("--output", help="Write the non-duplicate records to this JSONL file")
+    parser.add_argument("--report", help="Write duplicates (record + match) to this JSONL file")
+    parser.add_argument("--record", action="store_true",
+                        help="Add the fresh records' fingerprints to the index")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    if args.input and not args.source:
+        parser.error("--source is required with an input file")
+    if not args.input and not args.backfill:
+        parser.error("give an input file or --backfill")
+
+    index = JudgmentDedupIndex.open(args.index)
+    if args.backfill:
+        print(f"Backfill: {index.backfill()} judgments fingerprinted")
+    if not args.input:
+        index.close()
+        return
+    # One volume-less stream each: written per batch, fsynced at close
+    output = JsonlJudgmentWriter(args.output, flush_every=args.batch_size) if args.output else None
+    report = JsonlJudgmentWriter(args.report, flush_every=args.batch_size) if args.report else None
+    total = dup_count = 0
+    by_reason = {}
+    try:
+        for batch in _batches(_iter_records(Path(args.input)), args.batch_size):
+            index.conn.execute("BEGIN")
+            fresh, duplicates = index.filter_batch(batch, args.source, record=args.record)
+            index.conn.execute("COMMIT")
+            total += len(batch)
+            dup_count += len(duplicates)
+            for j in fresh:
+                if output:
+                    output.write(j)
+            for j, match in duplicates:
+                by_reason[match['by']] = by_reason.get(match['by'], 0) + 1
+                if report:
+                    report.write({'case_id': j.get('case_id'), 'duplicate_of': match, 'record': j})
+    finally:
+        for writer in (output, report):
+            if writer:
+                writer.close()
+        index.close()
+
+    print(f"{total} judgments checked: {total - dup_count} fresh, {dup_count} duplicates")
+    for reason, count in sorted(by_reason.items()):
+        print(f"  by {reason}: {count}")
+
+
+if __name__ == "__main__":
+    main()
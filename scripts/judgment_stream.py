@@ -0,0 +1,173 @@
+"""
+Judgment Stream — JSONL output shared by the judgment extractors.
+
+Extractors (bog_split_judgments.py, moj_judgments/extract_moj_judgments.py)
+write each judgment as one JSON line as soon as it is built, instead of
+collecting everything and dumping one large indented JSON at the end.
+Lines are held until the end of the volume, then written and fsynced
+once, so memory stays bounded by one volume and importers can read the
+file while the extraction is still running (they see whole volumes).
+
+Usage as a module:
+    from judgment_stream import JsonlJudgmentWriter, iter_jsonl
+
+    with JsonlJudgmentWriter("out/judgments.jsonl") as writer:
+        for volume in volumes:
+            for judgment in build_judgments(volume):
+                writer.write(judgment)
+            writer.flush()  # end of the volume: one write, one fsync
+
+    for judgment in iter_jsonl("out/judgments.jsonl"):
+        ...
+
+The older indented JSON array files (all_moj_judgments.json, ...) can be
+streamed the same way with iter_json_array() and JsonArrayWriter.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+
+class JsonlJudgmentWriter:
+    """
+    Append-only JSONL writer for extracted judgments.
+
+    Lines are buffered until flush(), the end of a volume, which writes
+    them and fsyncs once; a reader tailing the file only ever sees whole
+    volumes. If the volume fails, discard() (or leaving the with-block on
+    an exception) drops its buffered records instead of writing them.
+    """
+
+    def __init__(self, path: Union[str, Path], append: bool = False, flush_every: Optional[int] = None):
+        """
+        Args:
+            path: Output .jsonl file (parent directories are created).
+            append: Append to an existing file instead of truncating it.
+            flush_every: For outputs without volumes: also write (without
+                fsync) after this many buffered records, to bound memory.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.count = 0
+        self._buffer = []
+        self._unsynced = False
+        self._file = open(self.path, 'a' if append else 'w', encoding='utf-8')
+
+    def write(self, judgment: dict):
+        """Queue one judgment; it reaches the file on the next flush."""
+        self.write_encoded(json.dumps(judgment, ensure_ascii=False))
+
+    def write_encoded(self, line: str):
+        """Queue a judgment that is already serialized to one JSON line."""
+        self._buffer.append(line)
+        self.count += 1
+        if self.flush_every and len(self._buffer) >= self.flush_every:
+            self._write_buffer()
+
+    def _write_buffer(self):
+        if self._buffer:
+            self._file.write('\n'.join(self._buffer) + '\n')
+            self._buffer.clear()
+            self._unsynced = True
+
+    def flush(self):
+        """End of a volume: write the buffered judgments and fsync once."""
+        self._write_buffer()
+        if self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = False
+
+    def discard(self):
+        """Drop the buffered judgments (a volume that failed midway)."""
+        self.count -= len(self._buffer)
+        self._buffer.clear()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.discard()
+        self.close()
+
+
+class JsonArrayWriter:
+    """Streams a list to a JSON file with the same layout as json.dump(indent=2)."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.count = 0
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._file.write('[')
+
+    def write(self, item):
+        self.write_encoded(json.dumps(item, ensure_ascii=False, indent=2).replace('\n', '\n  '))
+
+    def write_encoded(self, body: str):
+        """Append an item already encoded with indent=2 and shifted by two spaces."""
+        self._file.write((',\n  ' if self.count else '\n  ') + body)
+        self.count += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.write('\n]' if self.count else ']')
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def iter_jsonl(path: Union[str, Path]) -> Iterator[dict]:
+    """Yield records from a JSONL file one at a time (blank lines are skipped)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_json_array(path: Union[str, Path], chunk_size: int = 1 << 20) -> Iterator[dict]:
+    """Yield the items of a top-level JSON array file without loading the whole file."""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = f.read(chunk_size)
+        pos = 0
+        started = eof = False
+        while True:
+            while pos < len(buf) and (buf[pos].isspace() or buf[pos] == ','):
+                pos += 1
+            if pos == len(buf):
+                if eof:
+                    raise ValueError(f"{path}: unexpected end of JSON array")
+                chunk = f.read(chunk_size)
+                buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+                continue
+            if not started:
+                if buf[pos] != '[':
+                    raise ValueError(f"{path}: expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == ']':
+                return
+            try:
+                item, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # The item continues past the buffer: read more and retry
+                chunk = f.read(chunk_size)
+                buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+                continue
+            yield item
@@ -0,0 +1,315 @@
+"""
+Judgments DB — direct-to-SQLite bulk loader for extracted judgments.
+
+Shared by extract_judgments.py (MOJ portal JSON), bog_split_judgments.py
+(BOG OCR) and moj_judgments/extract_moj_judgments.py (1435 PDF volumes).
+Records are streamed into the `judgments` table of data.db with batched
+executemany() inside transactions, and `judgments_fts` is updated
+incrementally for the new rows only — no TypeScript import step and no
+full FTS rebuild (scripts/rebuild_fts.cjs) afterwards. Once
+judgments_norm_fts has been built (fts_shadow.py), it is kept current the
+same way.
+
+The table and FTS definitions mirror shared/models/judgments.ts and
+server/db.ts, so the loader also works on a fresh database.
+
+Usage as a module:
+    from judgments_db import JudgmentsLoader
+
+    with JudgmentsLoader("data.db", source="bog_judicial", replace="case_id") as loader:
+        for judgment in judgments:
+            loader.add(judgment)
+    print(loader.inserted, loader.skipped)
+"""
+import json
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Optional, Union
+
+sys.path.insert(0, str(Path(__file__).parent))
+import fts_shadow
+from judgment_dedup import JudgmentDedupIndex
+from judgment_stream import JsonlJudgmentWriter
+
+# data.db at the repository root (next to package.json)
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data.db"
+
+# Same tuning as server/db.ts
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA mmap_size = 268435456",
+]
+
+JUDGMENTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS judgments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    case_id TEXT NOT NULL,
+    year_hijri INTEGER,
+    city TEXT,
+    court_body TEXT,
+    circuit_type TEXT,
+    judgment_number TEXT,
+    judgment_date TEXT,
+    text TEXT NOT NULL,
+    principle_text TEXT,
+    source TEXT NOT NULL DEFAULT 'sa_judicial',
+    appeal_type TEXT,
+    judges TEXT,
+    pdf_url TEXT,
+    created_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+CREATE INDEX IF NOT EXISTS judgments_source_idx ON judgments(source);
+CREATE INDEX IF NOT EXISTS judgments_case_id_idx ON judgments(case_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS judgments_fts USING fts5(
+    text,
+    court_body,
+    content='judgments',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+# Columns written by the loader (created_at keeps the table default)
+JUDGMENT_COLUMNS = [
+    "case_id", "year_hijri", "city", "court_body", "circuit_type",
+    "judgment_number", "judgment_date", "text", "principle_text",
+    "source", "appeal_type", "judges", "pdf_url",
+]
+
+_CONTROL_CHARS_RE = re.compile(r'[\ufffd\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _principle_text(j: dict, source: str) -> Optional[str]:
+    """Summary text stored in principle_text, per source."""
+    if j.get("principle_text"):
+        return j["principle_text"]
+    if source == "moj_research":
+        # Same composition as scripts/moj_judgments/import_moj_judgments.ts
+        parts = [
+            j.get("summary") or "",
+            f"الكلمات المفتاحية: {j['keywords']}" if j.get("keywords") else "",
+            f"السند النظامي: {j['legal_basis']}" if j.get("legal_basis") else "",
+        ]
+        return "\n\n".join(p for p in parts if p) or None
+    if source == "bog_judicial":
+        return j.get("topics") or None
+    return None
+
+
+def judgment_to_row(j: dict, source: str) -> Optional[tuple]:
+    """
+    Map an extractor's judgment dict to a `judgments` row (JUDGMENT_COLUMNS order).
+
+    Returns None for records that cannot be stored (no case_id or no text).
+    """
+    text = _CONTROL_CHARS_RE.sub('', j.get("text") or "").strip()
+    case_id = j.get("case_id")
+    if not text or not case_id:
+        return None
+
+    if source == "moj_research":
+        appeal_type = j.get("circuit_type")
+    elif source == "bog_judicial":
+        appeal_type = j.get("judgment_type")
+    else:
+        appeal_type = j.get("appeal_type")
+
+    judges = j.get("judges")
+    if judges is not None and not isinstance(judges, str):
+        judges = json.dumps(judges, ensure_ascii=False)
+
+    year = j.get("year_hijri")
+    try:
+        year = int(year) if year not in (None, "") else None
+    except (TypeError, ValueError):
+        year = None
+
+    return (
+        str(case_id),
+        year,
+        j.get("city") or None,
+        j.get("court_body") or None,
+        j.get("circuit_type") or None,
+        str(j.get("judgment_number") or j.get("case_number") or "") or None,
+        j.get("judgment_date") or j.get("session_date") or None,
+        text,
+        _principle_text(j, source),
+        source,
+        appeal_type or None,
+        judges,
+        j.get("pdf_url") or None,
+    )
+
+
+class JudgmentsLoader:
+    """
+    Batched loader into data.db's `judgments` + `judgments_fts`.
+
+    Every flush() is one transaction: optional replacement of existing
+    rows, the dedup check, one executemany() insert, then FTS rows for
+    exactly the new ids.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_DB_PATH, source: str = "sa_judicial",
+                 replace: Optional[str] = None, batch_size: int = 1000, min_text_length: int = 1,
+                 dedup: bool = True, duplicates_report: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            db_path: SQLite database (created if missing).
+            source: Value stored in judgments.source.
+            replace: None to only insert; "case_id" to replace rows of this
+                     source with the same case_id (idempotent re-runs);
+                     "source" to delete every existing row of this source
+                     before the first insert.
+            batch_size: Records per executemany() transaction.
+            min_text_length: Skip records whose cleaned text is shorter.
+            dedup: Skip judgments whose text or case number + date fingerprint
+                   already belongs to another record (see judgment_dedup.py);
+                   the judgments already in the database are fingerprinted
+                   when the index is first created.
+            duplicates_report: Optional JSONL file listing the skipped duplicates.
+        """
+        if replace not in (None, "case_id", "source"):
+            raise ValueError(f"replace must be None, 'case_id' or 'source', got {replace!r}")
+        self.db_path = Path(db_path)
+        self.source = source
+        self.replace = replace
+        self.batch_size = batch_size
+        self.min_text_length = min_text_length
+        self.inserted = 0
+        self.replaced = 0
+        self.skipped = 0
+        self.duplicates = 0
+        self._rows = []
+
+        self.conn = sqlite3.connect(str(self.db_path), isolation_level=None)
+        for pragma in SQLITE_PRAGMAS:
+            self.conn.execute(pragma)
+        self.conn.executescript(JUDGMENTS_SCHEMA)
+        self._ensure_columns()
+
+        self.dedup = JudgmentDedupIndex(self.conn) if dedup else None
+        # Maintain judgments_norm_fts only if it exists and is current
+        self.shadow = fts_shadow.is_current(self.conn, "judgments")
+        self._report = JsonlJudgmentWriter(duplicates_report) if duplicates_report else None
+
+        insert_cols = ", ".join(JUDGMENT_COLUMNS)
+        placeholders = ", ".join("?" for _ in JUDGMENT_COLUMNS)
+        self._insert_sql = f"INSERT INTO judgments ({insert_cols}) VALUES ({placeholders})"
+
+        if replace == "source":
+            self._delete_where("source = ?", (source,))
+
+    def _ensure_columns(self):
+        """Older databases predate principle_text / pdf_url (see server/db.ts)."""
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(judgments)")}
+        for column in ("principle_text", "pdf_url", "appeal_type", "judges"):
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE judgments ADD COLUMN {column} TEXT")
+
+    def _delete_where(self, where: str, params: tuple):
+        """Delete judgments and their FTS entries (external-content FTS needs 'delete')."""
+        self.conn.execute("BEGIN")
+        try:
+            self.conn.execute(
+                "INSERT INTO judgments_fts(judgments_fts, rowid, text, court_body) "
+                f"SELECT 'delete', id, text, court_body FROM judgments WHERE {where}", params)
+            if self.shadow:
+                fts_shadow.delete_where(self.conn, "judgments", where, params)
+            cur = self.conn.execute(f"DELETE FROM judgments WHERE {where}", params)
+            self.replaced += cur.rowcount
+            if self.shadow:
+                fts_shadow.record_changes(self.conn, "judgments", 0, cur.rowcount)
+            if self.dedup is not None:
+                self.dedup.forget_source(self.source)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def add(self, judgment: dict) -> bool:
+        """Queue one judgment; returns False if it was skipped."""
+        row = judgment_to_row(judgment, self.source)
+        if row is None or len(row[7]) < self.min_text_length:
+            self.skipped += 1
+            return False
+        self._rows.append((judgment, row))
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+        return True
+
+    def flush(self):
+        """Write the queued batch and index just those rows in judgments_fts."""
+        if not self._rows:
+            return
+        pending, self._rows = self._rows, []
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.dedup is not None:
+                fresh, duplicates = self.dedup.filter_batch([j for j, _ in pending], self.source)
+                fresh_ids = {id(j) for j in fresh}
+                rows = [row for j, row in pending if id(j) in fresh_ids]
+            else:
+                duplicates = []
+                rows = [row for _, row in pending]
+            removed = 0
+            if self.replace == "case_id":
+                case_ids = sorted({row[0] for row in rows})
+                for i in range(0, len(case_ids), 500):
+                    chunk = case_ids[i:i + 500]
+                    where = f"source = ? AND case_id IN ({', '.join('?' for _ in chunk)})"
+                    params = (self.source, *chunk)
+                    self.conn.execute(
+                        "INSERT INTO judgments_fts(judgments_fts, rowid, text, court_body) "
+                        f"SELECT 'delete', id, text, court_body FROM judgments WHERE {where}", params)
+                    if self.shadow:
+                        fts_shadow.delete_where(self.conn, "judgments", where, params)
+                    removed += self.conn.execute(
+                        f"DELETE FROM judgments WHERE {where}", params).rowcount
+
+            last_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM judgments").fetchone()[0]
+            self.conn.executemany(self._insert_sql, rows)
+            self.conn.execute(
+                "INSERT INTO judgments_fts(rowid, text, court_body) "
+                "SELECT id, text, court_body FROM judgments WHERE id > ?", (last_id,))
+            if self.shadow:
+                fts_shadow.index_after(self.conn, "judgments", last_id)
+                fts_shadow.record_changes(self.conn, "judgments", len(rows), removed)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.replaced += removed
+        self.inserted += len(rows)
+        self.duplicates += len(duplicates)
+        if self._report is not None:
+            for j, match in duplicates:
+                self._report.write({"case_id": j.get("case_id"), "duplicate_of": match, "record": j})
+
+    def close(self):
+        if self.conn is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self.conn.close()
+            self.conn = None
+            if self._report is not None:
+                self._report.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._rows.clear()  # do not commit a half-built batch
+        self.close()
+
+    def summary(self) -> str:
+        return (f"{self.inserted} inserted, {self.replaced} replaced, "
+                f"{self.duplicates} duplicates, {self.skipped} skipped → {self.db_path}")
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Law Articles Index — incremental builder for law_articles / law_articles_fts.
+
+server/db.ts only fills `law_articles` when the table is empty, reading
+every law JSON listed in library.json, so any law update meant dropping
+the table and re-indexing everything at server start. This script keeps
+the table in data.db up to date instead:
+
+  - every law's rows are hashed (sha256 over the article rows it produces)
+    and the hash is stored in `law_articles_state`;
+  - laws whose file is untouched (same mtime/size/title) are skipped
+    without even parsing the JSON;
+  - changed laws have their rows deleted (including their FTS entries,
+    via the external-content 'delete' command) and reinserted;
+  - laws removed from library.json are dropped;
+  - law_articles_norm_fts (fts_shadow.py) follows the same deletes and
+    inserts, and is built once if it does not exist yet.
+
+Run it after extraction (extract_all_boe.py / extract_folder1_laws.py call
+it after _update_indexes) and ship the resulting data.db (see
+scripts/download-db.sh) so the server cold start finds a populated index.
+Rows are built exactly like server/db.ts (same file lookup order and
+column defaults), so the server sees no difference.
+
+Usage:
+  python scripts/law_articles_index.py                 # update ./data.db
+  python scripts/law_articles_index.py --db other.db
+  python scripts/law_articles_index.py --full          # rebuild from scratch
+  python scripts/law_articles_index.py --release       # also write data.db.gz
+"""
+
+import sys, io, json, time, gzip, shutil, hashlib, sqlite3, argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import fts_shadow
+
+if sys.platform == "win32" and __name__ == "__main__":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+PROJECT  = Path(__file__).resolve().parent.parent
+DB_FILE  = PROJECT / "data.db"
+LAWS_DIR = PROJECT / "client" / "public" / "data" / "laws"
+LIB_FILE = PROJECT / "client" / "public" / "data" / "library.json"
+
+# Same lookup order as server/db.ts
+LAW_FILE_SUFFIXES = ("", "_boe", "_uqn")
+
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA mmap_size = 268435456",
+]
+
+# law_articles / law_articles_fts mirror server/db.ts
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS law_articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    law_id TEXT NOT NULL,
+    law_name TEXT NOT NULL,
+    article_number INTEGER,
+    article_text TEXT NOT NULL,
+    article_heading TEXT
+);
+CREATE INDEX IF NOT EXISTS la_law_id_idx ON law_articles(law_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS law_articles_fts USING fts5(
+    law_id UNINDEXED,
+    law_name,
+    article_number UNINDEXED,
+    article_text,
+    article_heading,
+    content='law_articles',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS law_articles_state (
+    law_id TEXT PRIMARY KEY,
+    source_file TEXT,
+    stat_key TEXT,
+    content_hash TEXT NOT NULL,
+    article_count INTEGER NOT NULL,
+    indexed_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+"""
+
+ARTICLE_COLUMNS = "law_id, law_name, article_number, article_text, article_heading"
+
+
+def find_law_file(law_id, laws_dir=LAWS_DIR):
+    for suffix in LAW_FILE_SUFFIXES:
+        path = laws_dir / f"{law_id}{suffix}.json"
+        if path.exists():
+            return path
+    return None
+
+
+def law_rows(item, law):
+    """Article rows for one library item, as server/db.ts builds them."""
+    articles = law.get("articles") if isinstance(law, dict) else None
+    if not isinstance(articles, list):
+        return []
+    law_name = law.get("law_name") or item.get("title_ar") or ""
+    return [
+        (item["id"], law_name, a.get("number") or 0, a.get("text") or "", a.get("heading") or "")
+        for a in articles if isinstance(a, dict)
+    ]
+
+
+def rows_hash(rows):
+    return hashlib.sha256(
+        json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+
+def _stat_key(path, item):
+    st = path.stat()
+    return f"{st.st_mtime_ns}:{st.st_size}:{item.get('title_ar') or ''}"
+
+
+def _delete_law(conn, law_id, shadow=False):
+    if shadow:
+        fts_shadow.delete_where(conn, "law_articles", "law_id = ?", (law_id,))
+    conn.execute(
+        f"INSERT INTO law_articles_fts(law_articles_fts, rowid, {ARTICLE_COLUMNS}) "
+        f"SELECT 'delete', id, {ARTICLE_COLUMNS} FROM law_articles WHERE law_id = ?", (law_id,))
+    return conn.execute("DELETE FROM law_articles WHERE law_id = ?", (law_id,)).rowcount
+
+
+def _insert_law(conn, rows, shadow=False):
+    last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM law_articles").fetchone()[0]
+    conn.executemany(f"INSERT INTO law_articles ({ARTICLE_COLUMNS}) VALUES (?, ?, ?, ?, ?)", rows)
+    conn.execute(
+        f"INSERT INTO law_articles_fts(rowid, {ARTICLE_COLUMNS}) "
+        f"SELECT id, {ARTICLE_COLUMNS} FROM law_articles WHERE id > ?", (last_id,))
+    if shadow:
+        fts_shadow.index_after(conn, "law_articles", last_id)
+
+
+def open_db(db_path=DB_FILE):
+    conn = sqlite3.connect(str(db_path), isolation_level=None)
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    conn.executescript(SCHEMA)
+    fts_shadow.ensure_schema(conn, "law_articles")
+    return conn
+
+
+def update_law_articles_index(db_path=DB_FILE, lib_file=LIB_FILE, laws_dir=LAWS_DIR,
+                              full=False, verbose=True):
+    """
+    Bring law_articles / law_articles_fts (and law_articles_norm_fts) in
+    line with library.json.
+
+    Returns a stats dict: laws, unchanged, updated, removed, articles
+    (rows inserted) and seconds.
+    """
+    t0 = time.perf_counter()
+    library = json.loads(Path(lib_file).read_text(encoding="utf-8"))
+    conn = open_db(db_path)
+    stats = {"laws": 0, "unchanged": 0, "updated": 0, "removed": 0, "articles": 0}
+
+    try:
+        if full:
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM law_articles")
+            conn.execute("DELETE FROM law_articles_state")
+            conn.execute("INSERT INTO law_articles_fts(law_articles_fts) VALUES('delete-all')")
+            fts_shadow.reset(conn, "law_articles")
+            conn.execute("COMMIT")
+
+        # A table populated by server/db.ts has rows but no state: start over once
+        has_state = conn.execute("SELECT 1 FROM law_articles_state LIMIT 1").fetchone()
+        has_rows = conn.execute("SELECT 1 FROM law_articles LIMIT 1").fetchone()
+        if has_rows and not has_state:
+            if verbose:
+                print("  law_articles has no hash state yet — reindexing all laws once")
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM law_articles")
+            conn.execute("INSERT INTO law_articles_fts(law_articles_fts) VALUES('delete-all')")
+            fts_shadow.reset(conn, "law_articles")
+            conn.execute("COMMIT")
+
+        # A current shadow index is updated row by row below; otherwise it is
+        # rebuilt from the finished table at the end
+        shadow = fts_shadow.is_current(conn, "law_articles")
+        state = {
+            law_id: (stat_key, content_hash)
+            for law_id, stat_key, content_hash in conn.execute(
+                "SELECT law_id, stat_key, content_hash FROM law_articles_state")
+        }
+
+        seen = set()
+        conn.execute("BEGIN")
+        for item in library:
+            law_id = item.get("id")
+            if not law_id or law_id in seen:
+                continue
+            seen.add(law_id)
+            stats["laws"] += 1
+
+            path = find_law_file(law_id, Path(laws_dir))
+            stat_key = _stat_key(path, item) if path else None
+            old = state.get(law_id)
+            if old and stat_key is not None and old[0] == stat_key:
+                stats["unchanged"] += 1
+                continue
+
+            rows = []
+            if path:
+                try:
+                    rows = law_rows(item, json.loads(path.read_text(encoding="utf-8")))
+                except (OSError, ValueError):
+                    rows = []
+            content_hash = rows_hash(rows)
+
+            if old and old[1] == content_hash:
+                # File touched but articles identical: only refresh the stat key
+                conn.execute("UPDATE law_articles_state SET stat_key = ? WHERE law_id = ?",
+                             (stat_key, law_id))
+                stats["unchanged"] += 1
+                continue
+
+            if old:
+                _delete_law(conn, law_id, shadow)
+            if rows:
+                _insert_law(conn, rows, shadow)
+            conn.execute(
+                "INSERT OR REPLACE INTO law_articles_state "
+                "(law_id, source_file, stat_key, content_hash, article_count, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, datetime('now'))",
+                (law_id, path.name if path else None, stat_key, content_hash, len(rows)))
+            stats["updated"] += 1
+            stats["articles"] += len(rows)
+
+        for law_id in set(state) - seen:
+            _delete_law(conn, law_id, shadow)
+            conn.execute("DELETE FROM law_articles_state WHERE law_id = ?", (law_id,))
+            stats["removed"] += 1
+        if shadow:
+            fts_shadow.record_state(conn, "law_articles")
+        conn.execute("COMMIT")
+
+        if stats["updated"] or stats["removed"]:
+            conn.execute("INSERT INTO law_articles_fts(law_articles_fts) VALUES('optimize')")
+        if not shadow:
+            fts_shadow.rebuild(conn, "law_articles", verbose=verbose)
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+    stats["seconds"] = round(time.perf_counter() - t0, 2)
+    if verbose:
+        print(f"  law_articles: {stats['laws']} laws — {stats['updated']} reindexed "
+              f"({stats['articles']} articles), {stats['unchanged']} unchanged, "
+              f"{stats['removed']} removed in {stats['seconds']}s")
+    return stats
+
+
+def package_release(db_path=DB_FILE):
+    """Checkpoint the WAL and write data.db.gz for the GitHub release (download-db.sh)."""
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    gz_path = Path(str(db_path) + ".gz")
+    with open(db_path, "rb") as src, gzip.open(gz_path, "wb", compresslevel=9) as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+    print(f"  Release archive: {gz_path} ({gz_path.stat().st_size / 1e6:.1f} MB)")
+    return gz_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally index law articles into data.db")
+    parser.add_argument("--db", default=str(DB_FILE), help="SQLite database (default: ./data.db)")
+    parser.add_argument("--library", default=str(LIB_FILE), help="library.json path")
+    parser.add_argument("--laws-dir", default=str(LAWS_DIR), help="Directory of law JSON files")
+    parser.add_argument("--full", action="store_true", help="Drop all indexed laws and rebuild")
+    parser.add_argument("--release", action="store_true",
+                        help="Write <db>.gz afterwards for the prebuilt data.db release")
+    args = parser.parse_args()
+
+    update_law_articles_index(args.db, args.library, args.laws_dir, full=args.full)
+    if args.release:
+        package_release(args.db)
+
+
+if __name__ == "__main__":
+    main()
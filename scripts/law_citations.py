@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Law Citations — law-to-law citation graph for data.db.
+
+Laws cite each other all the time ("نظام المرافعات الشرعية", "المادة
+(العشرين) من نظام مجلس الوزراء") in their articles, royal decrees and
+cabinet decisions. This script extracts those references once, so "laws
+citing this law" is an index lookup instead of a full-text scan:
+
+  - a TitleMatcher is built from boe_laws_index.json: titles are folded
+    (fold_for_matching) and keyed by their token tuple, grouped by their
+    first word (نظام، تنظيم، لائحة ...). Scanning a text is one dict
+    lookup per token plus one per candidate title length at the few
+    tokens that are such a word (with و/ب/ل/ال prefixes stripped);
+    the longest title wins;
+  - titles that repeat in the index (a law and the one that replaced
+    it) resolve to the one in force, then the most recent;
+  - "المادة (X) من" right before a title is kept as the cited article;
+  - every law file in client/public/data/laws is scanned (articles,
+    royal_decree, cabinet_decision_text, preamble_text); mentions of the
+    law's own title (its name without a trailing year) are skipped.
+
+The result replaces the `law_citations` table in data.db: one row per
+(citing law, cited law) pair with the mention count and the citing /
+cited article lists as JSON. The primary key serves outbound lookups and
+law_citations_dst_idx inbound ones (GET /api/laws/:lawId/citations).
+
+Usage:
+  python scripts/law_citations.py                  # update ./data.db
+  python scripts/law_citations.py --db other.db
+  python scripts/law_citations.py --top 20         # print the most cited laws
+"""
+
+import sys, io, json, re, time, sqlite3, argparse
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from arabic_text import fold_for_matching, to_western_digits
+
+if sys.platform == "win32" and __name__ == "__main__":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+PROJECT  = Path(__file__).resolve().parent.parent
+DB_FILE  = PROJECT / "data.db"
+LAWS_DIR = PROJECT / "client" / "public" / "data" / "laws"
+IDX_FILE = PROJECT / "client" / "public" / "data" / "boe_laws_index.json"
+
+# First words of citable titles (folded, without ال). Index entries that do
+# not start with one of them are scraping errors ("التفاصيل", error pages).
+TITLE_WORDS = frozenset(fold_for_matching(w) for w in (
+    "نظام", "تنظيم", "لائحة", "قانون", "ترتيبات", "ترتيب", "قواعد", "ضوابط", "تنظيمات",
+))
+# Prefixes a title word can carry in running text
+WORD_PREFIXES = ("وبال", "وال", "بال", "لل", "ال", "و", "ب", "ل", "ف")
+# Every prefixed form -> its title word, so spotting one is a single dict lookup
+TITLE_FORMS = {prefix + word: word for word in TITLE_WORDS for prefix in ("", *WORD_PREFIXES)}
+
+ACTIVE_STATUS = "ساري"
+
+# Words, including vocalized ones (harakat are not \w) and tatweel
+_TOKEN_RE = re.compile(r"[\wً-ٰٟـ]+")
+ARTICLE_WORD = "الماد"                       # المادة، المادتين
+FROM_WORD = "من"
+MAX_ARTICLE_TOKENS = 4                       # "المادة (الحادية والعشرين) من"
+# Year or date some law names end with ("نظام البريد 1406ه", "... 12/ 1440هـ");
+# the index titles of the same laws do not carry it
+_TRAILING_DATE_RE = re.compile(r"(?:[\s/.\u200f-]*[\d٠-٩]+\s*(?:هـ+|ه|م)?)+[\s.]*$")
+
+SCHEMA = ("""
+CREATE TABLE law_citations (
+    src_law_id   TEXT NOT NULL,
+    dst_law_id   TEXT NOT NULL,
+    src_name     TEXT NOT NULL,
+    dst_name     TEXT NOT NULL,
+    mentions     INTEGER NOT NULL,
+    src_articles TEXT NOT NULL,   -- JSON list: citing article numbers (0 = decree / preamble)
+    dst_articles TEXT NOT NULL,   -- JSON list: cited article references as written
+    PRIMARY KEY (src_law_id, dst_law_id)
+) WITHOUT ROWID
+""", """
+CREATE INDEX law_citations_dst_idx ON law_citations (dst_law_id, src_law_id)
+""")
+
+
+class _FoldCache(dict):
+    """token -> fold_for_matching(token); the corpus vocabulary is small and repetitive."""
+
+    def __missing__(self, token):
+        folded = self[token] = fold_for_matching(token)
+        return folded
+
+
+class TitleMatcher:
+    """Finds law titles from boe_laws_index.json in running text."""
+
+    def __init__(self, index_entries):
+        candidates = defaultdict(list)
+        for entry in index_entries:
+            key = self.title_key(entry.get("title") or "")
+            if key:
+                candidates[key].append(entry)
+        # key -> (law_id, title); repeated titles resolve to the law in force, then the newest
+        self.titles = {}
+        for key, entries in candidates.items():
+            best = max(entries, key=lambda e: (e.get("status") == ACTIVE_STATUS,
+                                               e.get("issue_date_hijri") or ""))
+            self.titles[key] = (best["id"], best["title"])
+        # first word -> candidate title lengths, longest first
+        lengths = defaultdict(set)
+        for key in self.titles:
+            lengths[key[0]].add(len(key))
+        self.lengths = {word: sorted(ns, reverse=True) for word, ns in lengths.items()}
+        self._folded = _FoldCache()
+
+    @staticmethod
+    def title_key(title):
+        words = [fold_for_matching(w) for w in _TOKEN_RE.findall(title)]
+        if len(words) < 2 or words[0] not in TITLE_FORMS:
+            return None
+        return (TITLE_FORMS[words[0]], *words[1:])
+
+    def find(self, text):
+        """Yield (law_id, cited_article or None) for every title mentioned in text."""
+        tokens = _TOKEN_RE.findall(text)
+        folded = list(map(self._folded.__getitem__, tokens))
+        i, n = 0, len(folded)
+        while i < n:
+            first = TITLE_FORMS.get(folded[i])
+            lengths = self.lengths.get(first) if first else None
+            if lengths:
+                for length in lengths:
+                    if i + length > n:
+                        continue
+                    hit = self.titles.get((first, *folded[i + 1:i + length]))
+                    if hit:
+                        yield hit[0], self._article_before(tokens, folded, i)
+                        i += length
+                        break
+                else:
+                    i += 1
+                continue
+            i += 1
+
+    @staticmethod
+    def _article_before(tokens, folded, i):
+        """"X" for "المادة X من <title>" ending at token i, else None."""
+        if i < 2 or folded[i - 1] != FROM_WORD:
+            return None
+        for j in range(i - 2, max(i - 2 - MAX_ARTICLE_TOKENS, -1), -1):
+            if folded[j].startswith(ARTICLE_WORD):
+                ref = " ".join(tokens[j + 1:i - 1])
+                return to_western_digits(ref) if ref else None
+        return None
+
+
+def law_texts(data):
+    """(article number, text) for every part of a law file that can cite another law."""
+    for article in data.get("articles") or []:
+        if isinstance(article, dict) and isinstance(article.get("text"), str):
+            yield article.get("number") or 0, article["text"]
+    decree = data.get("royal_decree")
+    if isinstance(decree, dict):
+        decree = decree.get("text")
+    for text in (decree, data.get("cabinet_decision_text"), data.get("preamble_text")):
+        if isinstance(text, str) and text:
+            yield 0, text
+
+
+def extract_citations(matcher, paths, verbose=True):
+    """{(src_law_id, dst_law_id): edge dict} over the given law files."""
+    edges = {}
+    names = {}
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if not isinstance(data, dict) or not data.get("law_id"):
+            continue
+        src = str(data["law_id"])
+        names[src] = data.get("law_name") or data.get("title") or ""
+        own_key = matcher.title_key(_TRAILING_DATE_RE.sub("", names[src]))
+        own_id = matcher.titles.get(own_key, (None,))[0] if own_key else None
+        for number, text in law_texts(data):
+            for dst, cited_article in matcher.find(text):
+                if dst == src or dst == own_id:
+                    continue
+                edge = edges.get((src, dst))
+                if edge is None:
+                    edge = edges[(src, dst)] = {"mentions": 0, "src_articles": [], "dst_articles": []}
+                edge["mentions"] += 1
+                if number not in edge["src_articles"]:
+                    edge["src_articles"].append(number)
+                if cited_article and cited_article not in edge["dst_articles"]:
+                    edge["dst_articles"].append(cited_article)
+    if verbose:
+        print(f"  {len(paths):,} files, {len(names):,} laws, {len(edges):,} citation edges")
+    return edges, names
+
+
+def write_citations(conn, edges, names, dst_titles):
+    with conn:
+        # One transaction: the old table stays until the new one is complete
+        # (executescript would commit the DROP on its own first)
+        conn.execute("BEGIN")
+        conn.execute("DROP TABLE IF EXISTS law_citations")
+        for statement in SCHEMA:
+            conn.execute(statement)
+        conn.executemany(
+            "INSERT INTO law_citations VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((src, dst, names.get(src, ""), dst_titles.get(dst, ""), e["mentions"],
+              json.dumps(e["src_articles"], ensure_ascii=False),
+              json.dumps(e["dst_articles"], ensure_ascii=False))
+             for (src, dst), e in sorted(edges.items())))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build the law-to-law citation graph in data.db")
+    ap.add_argument("--db", default=str(DB_FILE), help="SQLite database (default: ./data.db)")
+    ap.add_argument("--laws-dir", default=str(LAWS_DIR), help="Directory of law JSON files")
+    ap.add_argument("--index", default=str(IDX_FILE), help="boe_laws_index.json")
+    ap.add_argument("--top", type=int, default=10, help="Print the N most cited laws")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    with open(args.index, "r", encoding="utf-8") as f:
+        matcher = TitleMatcher(json.load(f))
+    print(f"Title matcher: {len(matcher.titles):,} titles, {len(matcher.lengths)} title words")
+
+    paths = sorted(Path(args.laws_dir).glob("*.json"))
+    edges, names = extract_citations(matcher, paths)
+    dst_titles = {law_id: title for law_id, title in matcher.titles.values()}
+
+    conn = sqlite3.connect(args.db)
+    write_citations(conn, edges, names, dst_titles)
+
+    if args.top:
+        print(f"\nMost cited laws:")
+        for dst, name, laws, mentions in conn.execute(
+                "SELECT dst_law_id, dst_name, count(*), sum(mentions) FROM law_citations "
+                "GROUP BY dst_law_id ORDER BY count(*) DESC LIMIT ?", (args.top,)):
+            print(f"  {laws:>5} laws {mentions:>6} mentions  {name}")
+    conn.close()
+    print(f"\nDone in {time.time() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,12 +10,20 @@ from __future__ import annotations
 import argparse
 import datetime as dt
 import glob
+import hashlib
 import json
 import os
 import re
+import sys
 from collections import Counter
-from dataclasses import dataclass, asdict
-from typing import Any
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+sys.path.insert(0, str(Path(__file__).parent))
+import arabic_text
+from arabic_text import DIGITS_TABLE as ARABIC_TO_WESTERN, to_western_digits
 
 MANDATORY_FIELDS = [
     "law_id",
@@ -28,6 +36,8 @@ MANDATORY_FIELDS = [
 ]
 
 ALLOWED_ARTICLE_STATUSES = {"active", "amended", "repealed", "", None}
+# Text-pattern rules are fused into one alternation, each rule's patterns
+# under its own inline flags (the placeholder markers are case-insensitive).
 PLACEHOLDER_PATTERNS = [
     r"\bTODO\b",
     r"\bFIXME\b",
@@ -36,6 +46,8 @@ PLACEHOLDER_PATTERNS = [
     r"يُضاف\s+لاحقًا",
 ]
 
+CACHE_FILENAME = "findings-cache.json"
+
 
 @dataclass
 class Finding:
@@ -47,11 +59,8 @@ class Finding:
     location: str
 
 
-ARABIC_TO_WESTERN = str.maketrans("٠١٢٣٤٥٦٧٨٩", "0123456789")
-
-
 def normalize_digits(value: str) -> str:
-    return value.translate(ARABIC_TO_WESTERN)
+    return to_western_digits(value)
 
 
 def parse_article_number(number_value: Any) -> int | None:
@@ -64,140 +73,317 @@ def parse_article_number(number_value: Any) -> int | None:
     return None
 
 
-def scan_file(path: str) -> list[Finding]:
-    findings: list[Finding] = []
+# ── Rule engine ─────────────────────────────────────────────────────
+#
+# A rule declares its scope and the fields it reads:
+#   - "law" rules see the law's top-level fields,
+#   - "article" rules see one article's fields (plus its index),
+#   - "summary" rules run once after the traversal, on what article rules
+#     collected in the ScanContext.
+# Check functions yield (message, location) pairs. Text-pattern rules only
+# supply regexes: all of them for the same field are fused into a single
+# compiled alternation that runs once per article.
 
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
 
-    law_id = str(data.get("law_id", os.path.basename(path)))
-    law_name = str(data.get("law_name", "(unknown)"))
+@dataclass
+class ScanContext:
+    law_id: str
+    law_name: str
+    numbers: list[int] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class Rule:
+    code: str
+    severity: str
+    scope: str
+    fields: tuple[str, ...]
+    check: Callable[..., Iterable[tuple[str, str]]]
+
 
-    for field in MANDATORY_FIELDS:
-        value = data.get(field)
+@dataclass(frozen=True)
+class TextPatternRule:
+    code: str
+    severity: str
+    field: str
+    patterns: tuple[str, ...]
+    message: str
+    flags: int = 0
+    scope: str = "article"
+
+
+RULES: list[Rule | TextPatternRule] = []
+
+
+def rule(code: str, severity: str, scope: str, fields: tuple[str, ...]):
+    """Register a check function as a rule."""
+    def register(check):
+        RULES.append(Rule(code, severity, scope, fields, check))
+        return check
+    return register
+
+
+def text_rule(code: str, severity: str, field: str, patterns: list[str], message: str,
+              flags: int = 0) -> None:
+    """Register a rule that fires when any pattern matches an article field."""
+    RULES.append(TextPatternRule(code, severity, field, tuple(patterns), message, flags))
+
+
+@rule("MISSING_MANDATORY_FIELD", "high", "law", tuple(MANDATORY_FIELDS))
+def check_mandatory_fields(values, ctx):
+    for name in MANDATORY_FIELDS:
+        value = values[name]
         if value is None or (isinstance(value, str) and not value.strip()):
-            findings.append(
-                Finding(
-                    severity="high",
-                    code="MISSING_MANDATORY_FIELD",
-                    law_id=law_id,
-                    law_name=law_name,
-                    message=f"الحقل الإلزامي `{field}` مفقود أو فارغ.",
-                    location=f"$.{field}",
-                )
-            )
+            yield f"الحقل الإلزامي `{name}` مفقود أو فارغ.", f"$.{name}"
 
-    articles = data.get("articles") if isinstance(data.get("articles"), list) else []
 
-    total_articles = data.get("total_articles")
+@rule("TOTAL_ARTICLES_MISMATCH", "medium", "law", ("total_articles", "articles"))
+def check_total_articles(values, ctx):
+    total_articles = values["total_articles"]
+    articles = values["articles"] if isinstance(values["articles"], list) else []
     if isinstance(total_articles, int) and total_articles != len(articles):
-        findings.append(
-            Finding(
-                severity="medium",
-                code="TOTAL_ARTICLES_MISMATCH",
-                law_id=law_id,
-                law_name=law_name,
-                message=(
-                    "قيمة `total_articles` لا تطابق عدد المواد الفعلي "
-                    f"({total_articles} != {len(articles)})."
-                ),
-                location="$.total_articles",
-            )
+        yield (
+            "قيمة `total_articles` لا تطابق عدد المواد الفعلي "
+            f"({total_articles} != {len(articles)}).",
+            "$.total_articles",
         )
 
-    numbers: list[int] = []
-    for idx, article in enumerate(articles):
-        location = f"$.articles[{idx}]"
-        number = parse_article_number(article.get("number"))
-        if number is None:
-            findings.append(
-                Finding(
-                    severity="medium",
-                    code="INVALID_ARTICLE_NUMBER",
-                    law_id=law_id,
-                    law_name=law_name,
-                    message="رقم المادة غير قابل للتحليل كرقم صحيح.",
-                    location=f"{location}.number",
-                )
-            )
-        else:
-            numbers.append(number)
-
-        text = article.get("text")
-        if not isinstance(text, str) or not text.strip():
-            findings.append(
-                Finding(
-                    severity="high",
-                    code="EMPTY_ARTICLE_TEXT",
-                    law_id=law_id,
-                    law_name=law_name,
-                    message="نص المادة فارغ أو مفقود.",
-                    location=f"{location}.text",
-                )
-            )
-        else:
-            normalized_text = normalize_digits(text)
-            for pattern in PLACEHOLDER_PATTERNS:
-                if re.search(pattern, normalized_text, flags=re.IGNORECASE):
-                    findings.append(
-                        Finding(
-                            severity="low",
-                            code="PLACEHOLDER_TEXT",
-                            law_id=law_id,
-                            law_name=law_name,
-                            message="تم اكتشاف مؤشر نص تجريبي/غير نهائي داخل المادة.",
-                            location=f"{location}.text",
-                        )
-                    )
-                    break
-
-        status = article.get("status")
-        if status not in ALLOWED_ARTICLE_STATUSES:
-            findings.append(
-                Finding(
-                    severity="low",
-                    code="UNKNOWN_ARTICLE_STATUS",
-                    law_id=law_id,
-                    law_name=law_name,
-                    message=f"حالة المادة غير معروفة: `{status}`.",
-                    location=f"{location}.status",
-                )
-            )
 
-    if numbers:
-        counter = Counter(numbers)
-        duplicate_numbers = [n for n, c in counter.items() if c > 1]
-        for n in sorted(duplicate_numbers):
-            findings.append(
-                Finding(
-                    severity="high",
-                    code="DUPLICATE_ARTICLE_NUMBER",
-                    law_id=law_id,
-                    law_name=law_name,
-                    message=f"رقم المادة `{n}` مكرر أكثر من مرة.",
-                    location="$.articles[*].number",
-                )
+@rule("INVALID_ARTICLE_NUMBER", "medium", "article", ("number",))
+def check_article_number(values, ctx, location):
+    number = parse_article_number(values["number"])
+    if number is None:
+        yield "رقم المادة غير قابل للتحليل كرقم صحيح.", f"{location}.number"
+    else:
+        ctx.numbers.append(number)
+
+
+@rule("EMPTY_ARTICLE_TEXT", "high", "article", ("text",))
+def check_article_text(values, ctx, location):
+    text = values["text"]
+    if not isinstance(text, str) or not text.strip():
+        yield "نص المادة فارغ أو مفقود.", f"{location}.text"
+
+
+text_rule(
+    "PLACEHOLDER_TEXT", "low", "text", PLACEHOLDER_PATTERNS,
+    "تم اكتشاف مؤشر نص تجريبي/غير نهائي داخل المادة.", flags=re.IGNORECASE,
+)
+
+
+@rule("UNKNOWN_ARTICLE_STATUS", "low", "article", ("status",))
+def check_article_status(values, ctx, location):
+    status = values["status"]
+    if status not in ALLOWED_ARTICLE_STATUSES:
+        yield f"حالة المادة غير معروفة: `{status}`.", f"{location}.status"
+
+
+@rule("DUPLICATE_ARTICLE_NUMBER", "high", "summary", ())
+def check_duplicate_numbers(ctx):
+    counter = Counter(ctx.numbers)
+    for n in sorted(n for n, c in counter.items() if c > 1):
+        yield f"رقم المادة `{n}` مكرر أكثر من مرة.", "$.articles[*].number"
+
+
+@rule("ARTICLE_NUMBER_GAPS", "medium", "summary", ())
+def check_number_gaps(ctx):
+    if not ctx.numbers:
+        return
+    missing = sorted(set(range(1, max(ctx.numbers) + 1)) - set(ctx.numbers))
+    if missing:
+        preview = ", ".join(map(str, missing[:10]))
+        suffix = " ..." if len(missing) > 10 else ""
+        yield f"توجد فجوات في ترقيم المواد: {preview}{suffix}", "$.articles[*].number"
+
+
+def _scoped(pattern: str, flags: int) -> str:
+    """pattern under inline flags, so rules with different flags share one regex."""
+    letters = "".join(letter for flag, letter in ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"))
+                      if flags & flag)
+    return f"(?{letters}:{pattern})" if letters else pattern
+
+
+class RuleEngine:
+    """Runs registered rules over a law in one pass over its articles."""
+
+    def __init__(self, rules: list[Rule | TextPatternRule]):
+        self.law_rules = [r for r in rules if isinstance(r, Rule) and r.scope == "law"]
+        self.summary_rules = [r for r in rules if isinstance(r, Rule) and r.scope == "summary"]
+
+        # Article steps keep registration order; each field's text-pattern
+        # rules run as one fused regex at the position of the first of them.
+        self.article_steps: list[tuple] = []
+        fused: dict[str, list[TextPatternRule]] = {}
+        for r in rules:
+            if isinstance(r, TextPatternRule):
+                if r.field not in fused:
+                    fused[r.field] = []
+                    self.article_steps.append(("patterns", r.field))
+                fused[r.field].append(r)
+            elif r.scope == "article":
+                self.article_steps.append(("rule", r))
+
+        self.fused: dict[str, tuple[re.Pattern, dict[str, TextPatternRule]]] = {}
+        for field_name, text_rules in fused.items():
+            groups = {f"r{i}": r for i, r in enumerate(text_rules)}
+            alternation = "|".join(
+                f"(?P<{name}>{_scoped('|'.join(r.patterns), r.flags)})" for name, r in groups.items()
             )
+            self.fused[field_name] = (re.compile(alternation), groups)
 
-        max_num = max(numbers)
-        expected = set(range(1, max_num + 1))
-        actual = set(numbers)
-        missing = sorted(expected - actual)
-        if missing:
-            preview = ", ".join(map(str, missing[:10]))
-            suffix = " ..." if len(missing) > 10 else ""
-            findings.append(
-                Finding(
-                    severity="medium",
-                    code="ARTICLE_NUMBER_GAPS",
-                    law_id=law_id,
-                    law_name=law_name,
-                    message=f"توجد فجوات في ترقيم المواد: {preview}{suffix}",
-                    location="$.articles[*].number",
-                )
-            )
+        self.article_fields = sorted(
+            {f for kind, r in self.article_steps if kind == "rule" for f in r.fields} | set(fused)
+        )
+
+    def scan(self, data: dict[str, Any], law_id: str, law_name: str) -> list[Finding]:
+        findings: list[Finding] = []
+        ctx = ScanContext(law_id, law_name)
+
+        def emit(r, hits):
+            for message, location in hits:
+                findings.append(Finding(r.severity, r.code, law_id, law_name, message, location))
 
-    return findings
+        for r in self.law_rules:
+            emit(r, r.check({f: data.get(f) for f in r.fields}, ctx))
+
+        articles = data.get("articles") if isinstance(data.get("articles"), list) else []
+        fields = self.article_fields
+        for idx, article in enumerate(articles):
+            location = f"$.articles[{idx}]"
+            values = {f: article.get(f) for f in fields}
+            for kind, step in self.article_steps:
+                if kind == "rule":
+                    emit(step, step.check(values, ctx, location))
+                    continue
+                text = values[step]
+                if not isinstance(text, str) or not text.strip():
+                    continue
+                regex, groups = self.fused[step]
+                hit: set[str] = set()
+                for m in regex.finditer(text):
+                    hit.update(name for name in groups if m.start(name) != -1)
+                    if len(hit) == len(groups):
+                        break
+                for name, r in groups.items():
+                    if name in hit:
+                        emit(r, [(r.message, f"{location}.{r.field}")])
+
+        for r in self.summary_rules:
+            emit(r, r.check(ctx))
+
+        return findings
+
+
+_ENGINE: RuleEngine | None = None
+
+
+def get_engine() -> RuleEngine:
+    global _ENGINE
+    if _ENGINE is None:
+        _ENGINE = RuleEngine(RULES)
+    return _ENGINE
+
+
+def scan_file(path: str) -> list[Finding]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    law_id = str(data.get("law_id", os.path.basename(path)))
+    law_name = str(data.get("law_name", "(unknown)"))
+    return get_engine().scan(data, law_id, law_name)
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def rules_fingerprint() -> str:
+    """Hash of the sources the rules run on (this module and arabic_text, which
+    folds the digits): a change to either invalidates the cache."""
+    return hashlib.sha256(
+        "".join(file_sha256(path) for path in (__file__, arabic_text.__file__)).encode()
+    ).hexdigest()
+
+
+def load_cache(cache_path: str, rules: str) -> dict[str, dict[str, Any]]:
+    """Cached entries keyed by law path: {"sha256", "stat", "findings"}."""
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("rules") != rules:
+        return {}
+    return cache.get("files", {})
+
+
+def save_cache(cache_path: str, rules: str, files: dict[str, dict[str, Any]]) -> None:
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"rules": rules, "files": files}, f, ensure_ascii=False)
+    os.replace(tmp_path, cache_path)
+
+
+def _stat_key(path: str) -> str:
+    st = os.stat(path)
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def _scan_entry(path: str) -> dict[str, Any]:
+    """Scan one file and return its cache entry (runs in worker processes)."""
+    return {
+        "sha256": file_sha256(path),
+        "stat": _stat_key(path),
+        "findings": [asdict(f) for f in scan_file(path)],
+    }
+
+
+def scan_corpus(
+    law_paths: list[str],
+    jobs: int = 1,
+    cache_path: str | None = None,
+) -> tuple[list[Finding], dict[str, int]]:
+    """Scan law files, reusing cached findings for files whose hash is unchanged.
+
+    Findings are returned in `law_paths` order whatever the job count.
+    """
+    rules = rules_fingerprint()
+    cached = load_cache(cache_path, rules) if cache_path else {}
+    entries: dict[str, dict[str, Any]] = {}
+    to_scan: list[str] = []
+    stats = {"files": len(law_paths), "cached": 0, "scanned": 0}
+
+    for path in law_paths:
+        entry = cached.get(path)
+        if entry is not None:
+            # Same mtime/size: trust the entry without re-hashing the file
+            if entry.get("stat") == _stat_key(path) or entry.get("sha256") == file_sha256(path):
+                entry["stat"] = _stat_key(path)
+                entries[path] = entry
+                stats["cached"] += 1
+                continue
+        to_scan.append(path)
+
+    if jobs > 1 and len(to_scan) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunksize = max(1, len(to_scan) // (jobs * 8))
+            for path, entry in zip(to_scan, pool.map(_scan_entry, to_scan, chunksize=chunksize)):
+                entries[path] = entry
+    else:
+        for path in to_scan:
+            entries[path] = _scan_entry(path)
+    stats["scanned"] = len(to_scan)
+
+    if cache_path:
+        save_cache(cache_path, rules, entries)
+
+    findings = [Finding(**f) for path in law_paths for f in entries[path]["findings"]]
+    return findings, stats
 
 
 def write_reports(findings: list[Finding], output_dir: str) -> tuple[str, str]:
@@ -254,6 +440,17 @@ def main() -> int:
         default="reports/legal-monitoring",
         help="Directory to write generated reports",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for scanning changed files",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Rescan every file instead of reusing {CACHE_FILENAME} in the output directory",
+    )
     args = parser.parse_args()
 
     law_paths = sorted(glob.glob(args.laws_glob))
@@ -261,9 +458,9 @@ def main() -> int:
         print("No law files matched the provided glob.")
         return 1
 
-    all_findings: list[Finding] = []
-    for path in law_paths:
-        all_findings.extend(scan_file(path))
+    cache_path = None if args.no_cache else os.path.join(args.output_dir, CACHE_FILENAME)
+    all_findings, stats = scan_corpus(law_paths, jobs=args.jobs, cache_path=cache_path)
+    print(f"Scanned {stats['scanned']} changed file(s), reused {stats['cached']} from cache")
 
     json_path, md_path = write_reports(all_findings, args.output_dir)
     print(f"Generated report files:\n- {json_path}\n- {md_path}")
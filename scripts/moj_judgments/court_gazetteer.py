@@ -0,0 +1,213 @@
+"""
+معجم المحاكم والمدن (Gazetteer) المشترك بين سكربتات أحكام وزارة العدل
+=====================================================================
+
+أسماء المحاكم تتكرر آلاف المرات في المجلدات، لذلك يُحل كل اسم محكمة
+خام مرة واحدة فقط (ذاكرة LRU مفتاحها الاسم كما هو) ويُعاد الناتج من
+الذاكرة في بقية المرات.
+
+- city_from_court(): الأنماط المرتبة (محكمة محافظة X العامة، محكمة X
+  العامة، المحكمة العامة بـX، دوائر ... بـX) ثم البحث عن المدن المعروفة
+  بتعبير منتظم واحد مُجمَّع بدل المرور على القائمة مدينة مدينة.
+- city_after_preposition(): نمط "املحكمة العامة بضمد" الذي يستخدمه
+  extract_moj_judgments أثناء الاستخراج.
+- fix_court_name(): تصحيح أخطاء OCR في اسم المحكمة نفسه.
+- canonical_city() / city_id(): جدول موحّد يربط كل صيغة مشوهة (OCR) بالاسم
+  المعتمد، وكل اسم معتمد برقم ثابت.
+
+الاستخدام:
+    from court_gazetteer import city_from_court, canonical_city, city_id
+"""
+
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from arabic_text import replace_all
+
+# =============================================================================
+# جدول التصحيح: الصيغة كما تظهر -> الاسم المعتمد
+# =============================================================================
+
+CITY_CORRECTIONS = {
+    # أسماء مشوهة بـ OCR (حرف الـ "ال" يظهر كـ "امل" أو "اجل" أو "اإل" أو "اخل" أو "األ")
+    'املذنب': 'المذنب',
+    'املويه': 'المويه',
+    'املظيلف': 'المظيلف',
+    'اجلبيل': 'الجبيل',
+    'اجلموم': 'الجموم',
+    'اجلفر': 'الجفر',
+    'اإلحساء': 'الأحساء',
+    'األسياح': 'الأسياح',
+    'اخلرمة': 'الخرمة',
+
+    # أسماء ناقصة بسبب OCR (حرف مفقود)
+    'ربيدة': 'بريدة',  # الباء اختفت
+
+    # أسماء بها "رقم" بالخطأ (regex لم يقطع بشكل صحيح)
+    'الرياض رقم القضية': 'الرياض',
+    'جدة رقم': 'جدة',
+    'جازان رقم': 'جازان',
+    'الدمام رقم': 'الدمام',
+    'نجران رقم': 'نجران',
+
+    # أسماء بها اسم المحكمة كاملاً
+    'المحكمة العامة بجدة': 'جدة',
+
+    # أسماء مشوهة أخرى
+    'دائع العامة': 'البدائع',  # من "محكمة البدائع العامة"
+    'أحد املسارحة': 'أحد المسارحة',
+    'وادي الدوارس': 'وادي الدواسر',
+    'البكريية': 'البكيرية',
+    'العرضية الشاملية': 'العرضية الشمالية',
+    'النامص': 'النماص',
+    'رجال أملع': 'رجال ألمع',
+    'حوطة بني متيم': 'حوطة بني تميم',
+    'دومة اجلندل': 'دومة الجندل',
+
+    # أسماء صحيحة (للتأكيد)
+    'العامر': 'العامرية',
+    'الشعف': 'الشعف',  # مدينة حقيقية - محافظة في الباحة
+}
+
+# تصحيحات OCR الخاصة بنمط "بـX" أثناء الاستخراج (extract_moj_judgments)
+EXTRACTION_CITY_FIXES = {
+    'الريا9ض': 'الرياض',
+    'مكة املكرمة': 'مكة المكرمة',
+    'املدينة املنورة': 'المدينة المنورة',
+    'حمافظة جدة': 'جدة',
+    'اخلرب': 'الخبر',
+    'اخلرج': 'الخرج',
+    'أهبا': 'أبها',
+    'مخيس مشيط': 'خميس مشيط',
+    'صبياء': 'صبيا',
+    'أيب عريش': 'أبي عريش',
+    'جيزان': 'جازان',
+    'االحساء': 'الأحساء',
+    'األحساء': 'الأحساء',
+    'املزامحية': 'المزاحمية',
+    'عيون اجلواء': 'عيون الجواء',
+    'عسري': 'عسير',
+}
+
+# أسماء مدن معروفة لاستخراجها من اسم المحكمة (الترتيب = الأولوية)
+KNOWN_CITIES = [
+    'شرورة', 'أحد رفيدة', 'العيون', 'رفحاء', 'الرياض', 'جدة', 'مكة',
+    'المدينة المنورة', 'الدمام', 'الطائف', 'تبوك', 'حائل', 'عرعر',
+    'أبها', 'نجران', 'جازان', 'الباحة', 'الأحساء', 'القطيف', 'الخبر',
+    'بريدة', 'عنيزة', 'سكاكا', 'ينبع', 'خميس مشيط', 'الخرج',
+]
+
+# جدول الأرقام الثابتة للمدن المعتمدة: تُضاف المدن الجديدة في آخر القوائم
+# أعلاه حتى لا تتغير أرقام المدن الموجودة
+CITY_IDS = {
+    city: i for i, city in enumerate(dict.fromkeys([
+        *KNOWN_CITIES,
+        *CITY_CORRECTIONS.values(),
+        *EXTRACTION_CITY_FIXES.values(),
+        'المدينة المنورة', 'مكة المكرمة', 'صبيا', 'ضمد', 'القصيم',
+    ]), start=1)
+}
+
+# تصحيحات OCR في اسم المحكمة نفسه (تُطبق بالترتيب)
+COURT_NAME_FIXES = [
+    ('حمكمة', 'محكمة'),
+    ('املحكمة', 'المحكمة'),
+    ('اجلزائية', 'الجزائية'),
+    ('اجلنائية', 'الجنائية'),
+    ('حمافظة', 'محافظة'),
+    ('رشورة', 'شرورة'),
+]
+
+# =============================================================================
+# الأنماط
+# =============================================================================
+
+# نمط: "محكمة محافظة X العامة" أو "محكمة X العامة" (بالترتيب: أول نمط يطابق يفوز)
+COURT_CITY_PATTERNS = [
+    # محكمة محافظة X العامة / الجزائية
+    re.compile(r'محكمة\s+محافظة\s+(.+?)\s+(?:العامة|الجزائية|الجزئية)'),
+    # محكمة X العامة / الجزائية (بدون "محافظة")
+    re.compile(r'محكمة\s+(.+?)\s+(?:العامة|الجزائية|الجزئية)'),
+    # المحكمة العامة بـ X / الجزائية بـ X
+    re.compile(r'(?:المحكمة|املحكمة)\s+(?:العامة|الجزائية|الجزئية)\s+ب(.+?)(?:\s*$|\s*[،,])'),
+    # دوائر ... بـ X
+    re.compile(r'دوائر\s+.+?\s+ب(.+?)(?:\s*$|\s*[،,])'),
+]
+
+# كل الأنماط أعلاه تبدأ بـ "محكمة" أو "املحكمة" أو "دوائر" (والجزء المشترك "حكمة"):
+# إن لم تظهر في الاسم لا داعي لتجربتها
+_COURT_PATTERN_TRIGGER = re.compile(r'حكمة|دوائر')
+
+# كل المدن المعروفة في تعبير واحد؛ الأطول أولاً، ثم تُختار المدينة الأعلى أولوية
+_KNOWN_CITY_RANK = {city: i for i, city in enumerate(KNOWN_CITIES)}
+_KNOWN_CITIES_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(c) for c in sorted(KNOWN_CITIES, key=len, reverse=True)) + '))')
+
+_PREPOSITION_CITY_RE = re.compile(
+    r'ب(?:منطقة\s*|محافظة\s*|حمافظة\s*)?([أ-ي\u0600-\u06FF\s]+?)(?:\s*$|\s*[،,\n\t])')
+
+_SPACES_RE = re.compile(r'\s+')
+
+# حجم ذاكرة الأسماء: أسماء المحاكم المختلفة بضعة آلاف على الأكثر
+MEMO_SIZE = 16384
+
+
+def canonical_city(name: str) -> str:
+    """الاسم المعتمد لصيغة مدينة (تُعاد كما هي إن لم تكن في جدول التصحيح)"""
+    return CITY_CORRECTIONS.get(name) or EXTRACTION_CITY_FIXES.get(name) or name
+
+
+def city_id(name: str) -> Optional[int]:
+    """الرقم الثابت للمدينة بعد توحيد اسمها، أو None إن لم تكن في الجدول"""
+    return CITY_IDS.get(canonical_city(name))
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def city_from_court(court_name: str) -> str:
+    """استخراج المدينة من اسم المحكمة بأنماط متعددة (دون تطبيق جدول التصحيح)"""
+    if not court_name:
+        return ''
+
+    if _COURT_PATTERN_TRIGGER.search(court_name):
+        for pattern in COURT_CITY_PATTERNS:
+            m = pattern.search(court_name)
+            if m:
+                city = _SPACES_RE.sub(' ', m.group(1).strip())
+                # تصحيح OCR
+                city = city.replace('رشورة', 'شرورة').replace('األحوال', '')
+                if city and len(city) > 1:
+                    return city
+
+    # البحث عن أسماء مدن معروفة في اسم المحكمة
+    found = {m.group(1) for m in _KNOWN_CITIES_RE.finditer(court_name)}
+    if found:
+        return min(found, key=_KNOWN_CITY_RANK.__getitem__)
+    return ''
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def city_after_preposition(court_name: str) -> str:
+    """المدينة بعد حرف الباء: "املحكمة العامة بضمد" أو "بمحافظة جدة" أو "بمنطقة عسري" """
+    if not court_name:
+        return ''
+    m = _PREPOSITION_CITY_RE.search(court_name)
+    if not m:
+        return ''
+    city = _SPACES_RE.sub(' ', m.group(1).strip())
+    return EXTRACTION_CITY_FIXES.get(city, city)
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def fix_court_name(court_name: str) -> str:
+    """تصحيح حرف الـ "ال" المشوه وأخطاء OCR الشائعة في اسم المحكمة"""
+    return replace_all(court_name, COURT_NAME_FIXES)
+
+
+def memo_info() -> dict:
+    """إحصائيات الذاكرة (للتقارير)"""
+    return {fn.__name__: fn.cache_info()._asdict()
+            for fn in (city_from_court, city_after_preposition, fix_court_name)}
@@ -19,15 +19,23 @@
 الهدف: استخراج كل حكم مع بياناته الوصفية + أرقام الصفحات لإنشاء رابط PDF مباشر
 """
 
-import fitz  # PyMuPDF
 import re
 import json
 import os
 import sys
+import gzip
+import hashlib
+import argparse
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from arabic_text import collapse_spacing, compose_hamza, strip_control_chars, to_western_digits
+from judgment_stream import JsonlJudgmentWriter
+from court_gazetteer import city_after_preposition
+
 # =============================================================================
 # ثوابت
 # =============================================================================
@@ -49,6 +57,13 @@ PDF_URLS = {
     13: "https://faculty.ksu.edu.sa/sites/default/files/13_12_0.pdf",
 }
 
+# عدد الصفحات في كل مهمة عند الاستخراج المتوازي (--jobs)
+PARALLEL_CHUNK_PAGES = 64
+
+# مجلد ذاكرة نصوص الصفحات (JSONL مضغوط لكل مجلد، مفتاحه بصمة ملف PDF)
+PAGE_CACHE_DIR = Path(__file__).parent / 'output' / 'page_cache'
+PAGE_CACHE_VERSION = 1
+
 # أنماط اكتشاف بداية حكم جديد (صفحة الملخص)
 # الرقم التسلسلي يظهر في أعلى صفحة الملخص
 SERIAL_PATTERN = re.compile(
@@ -111,18 +126,16 @@ def normalize_arabic(text: str) -> str:
         return ""
 
     # إزالة أحرف التحكم وأحرف الاستبدال
-    text = text.replace('\ufffd', '')
-    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', text)
+    text = strip_control_chars(text)
 
-    # تطبيع الهمزات
-    text = text.replace('أ', 'أ').replace('إ', 'إ').replace('آ', 'آ')
+    # تطبيع الهمزات (الألف + همزة/مدة منفصلة -> الحرف المركب)
+    text = compose_hamza(text)
 
     # إزالة التشكيل (اختياري - نبقيه لأن النصوص القانونية قد تحتاجه)
-    # text = re.sub(r'[\u064B-\u065F\u0670]', '', text)
+    # text = strip_diacritics(text)
 
-    # تنظيف المسافات المتعددة
-    text = re.sub(r'[ \t]+', ' ', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    # تنظيف المسافات المتعددة والأسطر الفارغة المتتالية (تعبير واحد)
+    text = collapse_spacing(text)
 
     # تنظيف الأسطر الفارغة في البداية والنهاية
     text = text.strip()
@@ -132,10 +145,7 @@ def normalize_arabic(text: str) -> str:
 
 def convert_arabic_numerals(text: str) -> str:
     """تحويل الأرقام العربية-الهندية إلى أرقام عادية"""
-    arabic_digits = '٠١٢٣٤٥٦٧٨٩'
-    for i, d in enumerate(arabic_digits):
-        text = text.replace(d, str(i))
-    return text
+    return to_western_digits(text)
 
 
 def clean_ocr_artifacts(text: str) -> str:
@@ -389,12 +399,12 @@ def is_judgment_header_page(text: str) -> bool:
     return has_serial and has_court and has_case
 
 
-def find_section_title_pages(doc) -> set:
-    """إيجاد صفحات عناوين الأبواب/الأقسام (ليست أحكاماً)"""
+def find_section_title_pages(raw_pages: list) -> set:
+    """إيجاد صفحات عناوين الأبواب/الأقسام (ليست أحكاماً) من النص الخام لكل صفحة"""
     title_pages = set()
 
-    for i in range(doc.page_count):
-        text = doc[i].get_text('text').strip()
+    for i, raw_text in enumerate(raw_pages):
+        text = raw_text.strip()
 
         # صفحات العناوين عادة قصيرة جداً وتحتوي فقط على اسم القسم
         if len(text) < 100:
@@ -414,25 +424,171 @@ def find_section_title_pages(doc) -> set:
     return title_pages
 
 
-def extract_judgments_from_volume(pdf_path: str, volume_num: int) -> list:
-    """استخراج جميع الأحكام من مجلد واحد"""
+# =============================================================================
+# قراءة نصوص الصفحات (تسلسلياً أو بالتوازي)
+# =============================================================================
+
+def get_page_count(pdf_path: str) -> int:
+    """عدد صفحات ملف PDF"""
+    import fitz  # PyMuPDF — لا يُحمَّل إلا عند قراءة PDF فعلياً
+    doc = fitz.open(pdf_path)
+    try:
+        return doc.page_count
+    finally:
+        doc.close()
+
 
+def read_page_texts(pdf_path: str, start: int = 0, end: Optional[int] = None) -> list:
+    """قراءة النص الخام للصفحات [start, end) من ملف PDF (تعمل أيضاً داخل عملية فرعية)"""
+    import fitz  # PyMuPDF
     doc = fitz.open(pdf_path)
-    total_pages = doc.page_count
+    try:
+        end = doc.page_count if end is None else min(end, doc.page_count)
+        return [doc[i].get_text('text') for i in range(start, end)]
+    finally:
+        doc.close()
+
+
+def file_sha256(path) -> str:
+    """بصمة SHA-256 لملف (تُقرأ على دفعات دون تحميل الملف كاملاً)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def page_cache_path(pdf_path, cache_dir: Path) -> Path:
+    """مسار ذاكرة نصوص صفحات مجلد؛ الاسم يتضمن بصمة PDF فيتغير تلقائياً بتغير الملف"""
+    return Path(cache_dir) / f"{Path(pdf_path).stem}.{file_sha256(pdf_path)[:16]}.jsonl.gz"
+
+
+def load_page_cache(cache_path: Path) -> Optional[list]:
+    """قراءة نصوص الصفحات من الذاكرة (None إن لم توجد أو كانت تالفة/ناقصة)"""
+    if not cache_path.exists():
+        return None
+    try:
+        with gzip.open(cache_path, 'rt', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            if header.get('version') != PAGE_CACHE_VERSION:
+                return None
+            raw_pages = [None] * header['page_count']
+            for line in f:
+                record = json.loads(line)
+                raw_pages[record['page']] = record['text']
+    except (OSError, EOFError, ValueError, KeyError, IndexError, TypeError):
+        return None
+    if any(text is None for text in raw_pages):
+        return None
+    return raw_pages
+
+
+def save_page_cache(cache_path: Path, raw_pages: list):
+    """حفظ نصوص الصفحات: سطر رأس ثم سطر لكل صفحة {"page", "text"} (كتابة ذرية)"""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        f.write(json.dumps({'version': PAGE_CACHE_VERSION, 'page_count': len(raw_pages)}) + '\n')
+        for i, text in enumerate(raw_pages):
+            f.write(json.dumps({'page': i, 'text': text}, ensure_ascii=False) + '\n')
+    os.replace(tmp_path, cache_path)
+
+
+def load_volume_pages(pdf_path: str, cache_dir: Optional[Path] = None) -> list:
+    """نصوص صفحات مجلد كامل: من الذاكرة إن وُجدت، وإلا من PDF ثم تُحفظ في الذاكرة"""
+    if cache_dir is None:
+        return read_page_texts(pdf_path)
+    cache_path = page_cache_path(pdf_path, cache_dir)
+    raw_pages = load_page_cache(cache_path)
+    if raw_pages is None:
+        raw_pages = read_page_texts(pdf_path)
+        save_page_cache(cache_path, raw_pages)
+    else:
+        print(f"  (نصوص الصفحات من الذاكرة: {cache_path.name})")
+    return raw_pages
+
+
+def read_volumes_parallel(pdf_files: dict, jobs: int, chunk_pages: int = PARALLEL_CHUNK_PAGES,
+                          cache_dir: Optional[Path] = None):
+    """
+    قراءة نصوص صفحات عدة مجلدات بمجموعة عمليات (process pool).
+
+    كل مجلد يُقسَّم إلى نطاقات صفحات بحجم chunk_pages، وتُوزَّع كل النطاقات من كل
+    المجلدات على العمليات معاً، فيستغرق الاستخراج زمن أكبر مجلد تقريباً بدلاً من
+    مجموع المجلدات. النتائج تُدمج بترتيب الصفحات وتُعاد بترتيب المجلدات.
+    المجلدات الموجودة في ذاكرة الصفحات (cache_dir) لا تُرسل إلى العمليات أصلاً.
+
+    Yields:
+        (رقم المجلد, قائمة النصوص الخام للصفحات أو None, الخطأ أو None)
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {}
+        cache_paths = {}
+        for vol, pdf_path in sorted(pdf_files.items()):
+            try:
+                if cache_dir is not None:
+                    cache_paths[vol] = page_cache_path(pdf_path, cache_dir)
+                    if cache_paths[vol].exists():
+                        continue  # تُقرأ من الذاكرة عند دور المجلد
+                page_count = get_page_count(str(pdf_path))
+            except Exception as e:
+                futures[vol] = e
+                continue
+            futures[vol] = [
+                pool.submit(read_page_texts, str(pdf_path), start, start + chunk_pages)
+                for start in range(0, page_count, chunk_pages)
+            ]
+
+        for vol in sorted(pdf_files):
+            if vol not in futures:
+                try:
+                    yield vol, load_volume_pages(str(pdf_files[vol]), cache_dir), None
+                except Exception as e:
+                    yield vol, None, e
+                continue
+            if isinstance(futures[vol], Exception):
+                yield vol, None, futures[vol]
+                continue
+            try:
+                raw_pages = []
+                for future in futures[vol]:
+                    raw_pages.extend(future.result())
+                if vol in cache_paths:
+                    save_page_cache(cache_paths[vol], raw_pages)
+                yield vol, raw_pages, None
+            except Exception as e:
+                yield vol, None, e
+
+
+def extract_judgments_from_volume(pdf_path: str, volume_num: int, raw_pages: Optional[list] = None,
+                                  cache_dir: Optional[Path] = None) -> list:
+    """استخراج جميع الأحكام من مجلد واحد (انظر iter_judgments_from_volume)"""
+    return list(iter_judgments_from_volume(pdf_path, volume_num, raw_pages, cache_dir))
+
+
+def iter_judgments_from_volume(pdf_path: str, volume_num: int, raw_pages: Optional[list] = None,
+                               cache_dir: Optional[Path] = None):
+    """استخراج أحكام مجلد واحد حكماً بعد حكم (كل حكم يُعاد فور بنائه)
+
+    Args:
+        raw_pages: نصوص الصفحات الخام إن كانت مقروءة مسبقاً (مثل الوضع المتوازي)،
+                   وإلا تُقرأ هنا (من ذاكرة الصفحات cache_dir إن وُجدت، أو من PDF).
+        cache_dir: مجلد ذاكرة نصوص الصفحات (None = بدون ذاكرة).
+    """
+
+    # الخطوة 1: استخراج نص كل صفحة (مرة واحدة، ويُعاد استخدامه في كل المراحل)
+    if raw_pages is None:
+        raw_pages = load_volume_pages(pdf_path, cache_dir)
+    total_pages = len(raw_pages)
 
     print(f"\n{'='*60}")
     print(f"  المجلد {volume_num} — {total_pages} صفحة — {os.path.basename(pdf_path)}")
     print(f"{'='*60}")
 
-    # الخطوة 1: استخراج نص كل صفحة
-    pages_text = []
-    for i in range(total_pages):
-        text = doc[i].get_text('text')
-        text = clean_ocr_artifacts(text)
-        pages_text.append(text)
+    pages_text = [clean_ocr_artifacts(text) for text in raw_pages]
 
     # الخطوة 2: تحديد صفحات عناوين الأقسام (نتجاهلها)
-    title_pages = find_section_title_pages(doc)
+    title_pages = find_section_title_pages(raw_pages)
 
     # الخطوة 3: إيجاد جميع صفحات بداية الأحكام (صفحات الملخص)
     judgment_starts = []
@@ -445,11 +601,9 @@ def extract_judgments_from_volume(pdf_path: str, volume_num: int) -> list:
     print(f"  تم اكتشاف {len(judgment_starts)} حكم")
 
     if not judgment_starts:
-        doc.close()
-        return []
+        return
 
     # الخطوة 4: استخراج كل حكم
-    judgments = []
     pdf_url = PDF_URLS.get(volume_num, '')
 
     for idx, start_page in enumerate(judgment_starts):
@@ -558,64 +712,20 @@ def extract_judgments_from_volume(pdf_path: str, volume_num: int) -> list:
             'page_count': end_page - start_page + 1,
         }
 
-        judgments.append(judgment)
-
         # طباعة تقدم
         text_preview = full_text[:80].replace('\n', ' ') if full_text else '(فارغ)'
         court_display = (court_name or 'غير محدد')[:30]
         case_display = (metadata.get('case_number') or 'N/A')[:15]
         print(f"  [{idx+1}] p{start_page+1}-{end_page+1} | {court_display} | {case_display} | {text_preview}...")
 
-    doc.close()
-    return judgments
+        yield judgment
 
 
 def extract_city_from_court(court_name: str) -> str:
-    """استخراج اسم المدينة من اسم المحكمة"""
-    if not court_name:
-        return ''
-
+    """استخراج اسم المدينة من اسم المحكمة (عبر معجم المحاكم المشترك court_gazetteer)"""
     # أنماط: "املحكمة العامة بضمد" أو "املحكمة العامة بمحافظة جدة" أو "بمنطقة عسري"
-    # الباء قد تكون متصلة بالكلمة التالية
-    city_match = re.search(
-        r'ب(?:منطقة\s*|محافظة\s*|حمافظة\s*)?([أ-ي\u0600-\u06FF\s]+?)(?:\s*$|\s*[،,\n\t])',
-        court_name
-    )
-    if city_match:
-        city = city_match.group(1).strip()
-        # تنظيف
-        city = re.sub(r'\s+', ' ', city)
-
-        # تصحيح أسماء المدن الشائعة من OCR
-        city_fixes = {
-            'الريا9ض': 'الرياض', 'الرياض': 'الرياض',
-            'مكة املكرمة': 'مكة المكرمة', 'مكة المكرمة': 'مكة المكرمة',
-            'املدينة املنورة': 'المدينة المنورة', 'المدينة المنورة': 'المدينة المنورة',
-            'جدة': 'جدة', 'حمافظة جدة': 'جدة',
-            'الدمام': 'الدمام', 'اخلرب': 'الخبر', 'الخبر': 'الخبر',
-            'اخلرج': 'الخرج', 'الخرج': 'الخرج',
-            'بريدة': 'بريدة', 'عنيزة': 'عنيزة',
-            'أهبا': 'أبها', 'أبها': 'أبها',
-            'مخيس مشيط': 'خميس مشيط', 'خميس مشيط': 'خميس مشيط',
-            'جازان': 'جازان', 'صبيا': 'صبيا', 'صبياء': 'صبيا',
-            'أيب عريش': 'أبي عريش', 'أبي عريش': 'أبي عريش',
-            'حائل': 'حائل', 'تبوك': 'تبوك',
-            'عرعر': 'عرعر', 'سكاكا': 'سكاكا',
-            'الطائف': 'الطائف', 'الباحة': 'الباحة',
-            'نجران': 'نجران', 'جيزان': 'جازان',
-            'ضمد': 'ضمد', 'القطيف': 'القطيف',
-            'االحساء': 'الأحساء', 'األحساء': 'الأحساء', 'الأحساء': 'الأحساء',
-            'املزامحية': 'المزاحمية', 'المزاحمية': 'المزاحمية',
-            'عيون اجلواء': 'عيون الجواء', 'عيون الجواء': 'عيون الجواء',
-            'القصيم': 'القصيم', 'عسري': 'عسير', 'عسير': 'عسير',
-        }
-        for wrong, correct in city_fixes.items():
-            if city == wrong or city.strip() == wrong:
-                return correct
-
-        return city
-
-    return ''
+    # الباء قد تكون متصلة بالكلمة التالية؛ النتيجة محفوظة لكل اسم محكمة
+    return city_after_preposition(court_name)
 
 
 def extract_hijri_year(date_str: str) -> Optional[int]:
@@ -643,6 +753,28 @@ def extract_hijri_year(date_str: str) -> Optional[int]:
 # =============================================================================
 
 def main():
+    parser = argparse.ArgumentParser(description='استخراج أحكام مجلدات وزارة العدل 1435هـ')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='عدد العمليات لقراءة صفحات PDF بالتوازي (1 = تسلسلي)')
+    parser.add_argument('--chunk-pages', type=int, default=PARALLEL_CHUNK_PAGES,
+                        help='عدد الصفحات في كل مهمة عند القراءة المتوازية')
+    parser.add_argument('--page-cache-dir', type=str, default=str(PAGE_CACHE_DIR),
+                        help='مجلد ذاكرة نصوص الصفحات (تُعاد بين التشغيلات دون PyMuPDF)')
+    parser.add_argument('--no-page-cache', action='store_true',
+                        help='قراءة الصفحات من PDF دائماً دون ذاكرة')
+    parser.add_argument('--jsonl', action='store_true',
+                        help='كتابة كل حكم فور بنائه في all_moj_judgments.jsonl (ذاكرة ثابتة) '
+                             'بدلاً من ملفات JSON المجمّعة')
+    parser.add_argument('--sqlite', type=str, default=None, metavar='DB',
+                        help='تحميل الأحكام مباشرة في قاعدة SQLite (مثل data.db) مع تحديث '
+                             'judgments_fts للصفوف الجديدة فقط (يستبدل أحكام moj_research السابقة)')
+    parser.add_argument('--no-dedup', action='store_true',
+                        help='مع --sqlite: استيراد الأحكام حتى لو كانت بصمتها موجودة في القاعدة من مصدر آخر')
+    parser.add_argument('--dedup-report', type=str, default=None, metavar='FILE',
+                        help='مع --sqlite: كتابة الأحكام المكررة المستبعدة في ملف JSONL')
+    args = parser.parse_args()
+    cache_dir = None if args.no_page_cache else Path(args.page_cache_dir)
+
     script_dir = Path(__file__).parent
     pdfs_dir = script_dir / 'pdfs'
     output_dir = script_dir / 'output'
@@ -659,6 +791,7 @@ def main():
     }
 
     # معالجة المجلدات من 1 إلى 13 (14 هو الفهرس)
+    pdf_files = {}
     for vol in range(1, 14):
         pdf_file = pdfs_dir / f'vol_{vol:02d}.pdf'
 
@@ -666,37 +799,85 @@ def main():
             print(f"\n⚠ المجلد {vol} غير موجود: {pdf_file}")
             stats['errors'].append(f"المجلد {vol} غير موجود")
             continue
-
+        pdf_files[vol] = pdf_file
+
+    if args.jobs > 1:
+        print(f"\nقراءة صفحات {len(pdf_files)} مجلد بـ {args.jobs} عملية "
+              f"({args.chunk_pages} صفحة لكل مهمة)...")
+        volumes = read_volumes_parallel(pdf_files, args.jobs, args.chunk_pages, cache_dir)
+    else:
+        volumes = ((vol, None, None) for vol in sorted(pdf_files))
+
+    # وضع البث: كل حكم يُكتب سطراً في JSONL فور بنائه، ويُفرَّغ الملف بعد كل مجلد
+    writer = JsonlJudgmentWriter(output_dir / 'all_moj_judgments.jsonl') if args.jsonl else None
+
+    # التحميل المباشر في SQLite: نفس منطق import_moj_judgments.ts (استبدال المصدر، تخطي النصوص < 100 حرف)
+    loader = None
+    if args.sqlite:
+        from judgments_db import JudgmentsLoader
+        loader = JudgmentsLoader(args.sqlite, source='moj_research', replace='source',
+                                 min_text_length=100, dedup=not args.no_dedup,
+                                 duplicates_report=args.dedup_report)
+
+    for vol, raw_pages, read_error in volumes:
+        pdf_file = pdf_files[vol]
         try:
-            judgments = extract_judgments_from_volume(str(pdf_file), vol)
-            all_judgments.extend(judgments)
-
-            stats['volumes_processed'] += 1
-            stats['total_judgments'] += len(judgments)
-            stats['by_volume'][vol] = len(judgments)
-
+            if read_error is not None:
+                raise read_error
+            judgments = iter_judgments_from_volume(str(pdf_file), vol, raw_pages, cache_dir)
+            if writer is None:
+                judgments = list(judgments)
+                all_judgments.extend(judgments)
+
+            vol_count = 0
             for j in judgments:
+                if writer is not None:
+                    writer.write(j)
+                if loader is not None:
+                    loader.add(j)
+                vol_count += 1
                 cat = j.get('circuit_type', 'غير محدد')
                 stats['by_category'][cat] = stats['by_category'].get(cat, 0) + 1
                 city = j.get('city', 'غير محدد')
                 stats['by_city'][city] = stats['by_city'].get(city, 0) + 1
 
-            # حفظ مجلد فردي
-            vol_output = output_dir / f'vol_{vol:02d}_judgments.json'
-            with open(vol_output, 'w', encoding='utf-8') as f:
-                json.dump(judgments, f, ensure_ascii=False, indent=2)
-            print(f"  ✓ تم حفظ {len(judgments)} حكم في {vol_output.name}")
+            stats['volumes_processed'] += 1
+            stats['total_judgments'] += vol_count
+            stats['by_volume'][vol] = vol_count
+
+            if loader is not None:
+                loader.flush()
+            if writer is not None:
+                writer.flush()
+                print(f"  ✓ تم بث {vol_count} حكم إلى {writer.path.name}")
+            else:
+                # حفظ مجلد فردي
+                vol_output = output_dir / f'vol_{vol:02d}_judgments.json'
+                with open(vol_output, 'w', encoding='utf-8') as f:
+                    json.dump(judgments, f, ensure_ascii=False, indent=2)
+                print(f"  ✓ تم حفظ {len(judgments)} حكم في {vol_output.name}")
 
         except Exception as e:
+            # أحكام المجلد الفاشل لا تُكتب جزئيًا في JSONL
+            if writer is not None:
+                writer.discard()
             print(f"\n✗ خطأ في المجلد {vol}: {e}")
             import traceback
-            traceback.print_exc()
+            traceback.print_exception(type(e), e, e.__traceback__)
             stats['errors'].append(f"المجلد {vol}: {str(e)}")
 
-    # حفظ كل الأحكام في ملف واحد
-    all_output = output_dir / 'all_moj_judgments.json'
-    with open(all_output, 'w', encoding='utf-8') as f:
-        json.dump(all_judgments, f, ensure_ascii=False, indent=2)
+    if loader is not None:
+        loader.close()
+        print(f"\n  SQLite: {loader.summary()}")
+
+    if writer is not None:
+        writer.close()
+        all_output = writer.path
+    else:
+        # حفظ كل الأحكام في ملف واحد
+        all_output = output_dir / 'all_moj_judgments.json'
+        with open(all_output, 'w', encoding='utf-8') as f:
+            json.dump(all_judgments, f, ensure_ascii=False, indent=2)
 
     # حفظ الإحصائيات
     stats_output = output_dir / 'extraction_stats.json'
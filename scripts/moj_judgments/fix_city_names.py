@@ -7,110 +7,30 @@
 2. أسماء تحتوي على "رقم" بالخطأ
 3. أسماء مدن ناقصة
 4. محاكم بأنماط مختلفة (محكمة محافظة X العامة بدلاً من المحكمة العامة بX)
+
+يقرأ الملف حكمًا حكمًا ويكتب الناتج في المرور نفسه (JSON أو JSONL):
+    python scripts/moj_judgments/fix_city_names.py [--input output/all_moj_judgments.jsonl]
 """
 
+import argparse
 import json
-import re
+import os
 import sys
 from pathlib import Path
 
 # Force UTF-8 output on Windows
 sys.stdout = open(sys.stdout.fileno(), mode='w', encoding='utf-8', buffering=1)
 
-# =============================================================================
-# قاموس تصحيح أسماء المدن الشامل
-# =============================================================================
-
-CITY_CORRECTIONS = {
-    # أسماء مشوهة بـ OCR (حرف الـ "ال" يظهر كـ "امل" أو "اجل" أو "اإل" أو "اخل" أو "األ")
-    'املذنب': 'المذنب',
-    'املويه': 'المويه',
-    'املظيلف': 'المظيلف',
-    'اجلبيل': 'الجبيل',
-    'اجلموم': 'الجموم',
-    'اجلفر': 'الجفر',
-    'اإلحساء': 'الأحساء',
-    'األسياح': 'الأسياح',
-    'اخلرمة': 'الخرمة',
-
-    # أسماء ناقصة بسبب OCR (حرف مفقود)
-    'ربيدة': 'بريدة',  # الباء اختفت
-
-    # أسماء بها "رقم" بالخطأ (regex لم يقطع بشكل صحيح)
-    'الرياض رقم القضية': 'الرياض',
-    'جدة رقم': 'جدة',
-    'جازان رقم': 'جازان',
-    'الدمام رقم': 'الدمام',
-    'نجران رقم': 'نجران',
-
-    # أسماء بها اسم المحكمة كاملاً
-    'المحكمة العامة بجدة': 'جدة',
-
-    # أسماء مشوهة أخرى
-    'دائع العامة': 'البدائع',  # من "محكمة البدائع العامة"
-    'أحد املسارحة': 'أحد المسارحة',
-    'وادي الدوارس': 'وادي الدواسر',
-    'البكريية': 'البكيرية',
-    'العرضية الشاملية': 'العرضية الشمالية',
-    'النامص': 'النماص',
-    'رجال أملع': 'رجال ألمع',
-    'حوطة بني متيم': 'حوطة بني تميم',
-    'دومة اجلندل': 'دومة الجندل',
-
-    # أسماء صحيحة (للتأكيد)
-    'العامر': 'العامرية',
-    'الشعف': 'الشعف',  # مدينة حقيقية - محافظة في الباحة
-}
-
-# =============================================================================
-# استخراج المدينة من أنماط المحكمة المختلفة
-# =============================================================================
-
-# نمط: "محكمة محافظة X العامة" أو "محكمة X العامة"
-COURT_CITY_PATTERNS = [
-    # محكمة محافظة X العامة / الجزائية
-    re.compile(r'محكمة\s+محافظة\s+(.+?)\s+(?:العامة|الجزائية|الجزئية)'),
-    # محكمة X العامة / الجزائية (بدون "محافظة")
-    re.compile(r'محكمة\s+(.+?)\s+(?:العامة|الجزائية|الجزئية)'),
-    # المحكمة العامة بـ X / الجزائية بـ X
-    re.compile(r'(?:المحكمة|املحكمة)\s+(?:العامة|الجزائية|الجزئية)\s+ب(.+?)(?:\s*$|\s*[،,])'),
-    # دوائر ... بـ X
-    re.compile(r'دوائر\s+.+?\s+ب(.+?)(?:\s*$|\s*[،,])'),
-]
-
-# أسماء مدن معروفة لاستخراجها من اسم المحكمة
-KNOWN_CITIES = [
-    'شرورة', 'أحد رفيدة', 'العيون', 'رفحاء', 'الرياض', 'جدة', 'مكة',
-    'المدينة المنورة', 'الدمام', 'الطائف', 'تبوك', 'حائل', 'عرعر',
-    'أبها', 'نجران', 'جازان', 'الباحة', 'الأحساء', 'القطيف', 'الخبر',
-    'بريدة', 'عنيزة', 'سكاكا', 'ينبع', 'خميس مشيط', 'الخرج',
-]
+# جداول التصحيح والأنماط وذاكرة أسماء المحاكم في court_gazetteer (مشتركة مع extract_moj_judgments)
+from court_gazetteer import CITY_CORRECTIONS, city_from_court, city_id, fix_court_name, memo_info  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from judgment_stream import JsonArrayWriter, JsonlJudgmentWriter, iter_json_array, iter_jsonl  # noqa: E402
 
 
 def extract_city_from_court_advanced(court_name: str) -> str:
-    """استخراج المدينة من اسم المحكمة بأنماط متعددة"""
-    if not court_name:
-        return ''
-
-    # محاولة الأنماط المختلفة
-    for pattern in COURT_CITY_PATTERNS:
-        m = pattern.search(court_name)
-        if m:
-            city = m.group(1).strip()
-            # تنظيف
-            city = re.sub(r'\s+', ' ', city)
-            # تصحيح OCR
-            city = city.replace('رشورة', 'شرورة')
-            city = city.replace('األحوال', '')
-            if city and len(city) > 1:
-                return city
-
-    # البحث عن أسماء مدن معروفة في اسم المحكمة
-    for known_city in KNOWN_CITIES:
-        if known_city in court_name:
-            return known_city
-
-    return ''
+    """استخراج المدينة من اسم المحكمة بأنماط متعددة (النتيجة محفوظة لكل اسم محكمة)"""
+    return city_from_court(court_name)
 
 
 def fix_judgment(j: dict) -> dict:
@@ -130,12 +50,7 @@ def fix_judgment(j: dict) -> dict:
 
     # 3. إصلاح اسم المحكمة أيضاً (حرف الـ "ال" المشوه)
     if court:
-        court = court.replace('حمكمة', 'محكمة')
-        court = court.replace('املحكمة', 'المحكمة')
-        court = court.replace('اجلزائية', 'الجزائية')
-        court = court.replace('اجلنائية', 'الجنائية')
-        court = court.replace('حمافظة', 'محافظة')
-        court = court.replace('رشورة', 'شرورة')
+        court = fix_court_name(court)
         j['court_body'] = court
 
     # 4. إصلاح اسم المحكمة لـ "دائع العامة" -> "البدائع"
@@ -145,39 +60,86 @@ def fix_judgment(j: dict) -> dict:
     return j
 
 
+def iter_judgments(path: Path):
+    """قراءة الأحكام حكمًا حكمًا من ملف JSON (قائمة) أو JSONL دون تحميل الملف كاملاً"""
+    return iter_jsonl(path) if path.suffix == '.jsonl' else iter_json_array(path)
+
+
+def open_writer(path: Path):
+    # ملف كامل بلا مجلدات: يُكتب كل 1000 حكم ويُزامَن مرة واحدة عند الإغلاق
+    return JsonlJudgmentWriter(path, flush_every=1000) if path.suffix == '.jsonl' else JsonArrayWriter(path)
+
+
 def main():
-    json_path = Path(__file__).parent / 'output' / 'all_moj_judgments.json'
+    parser = argparse.ArgumentParser(description='إصلاح أسماء المدن والمحاكم في الأحكام المستخرجة')
+    parser.add_argument('--input', type=str, default=None,
+                        help='ملف الأحكام (.json أو .jsonl)، افتراضيًا output/all_moj_judgments.json')
+    args = parser.parse_args()
+
+    json_path = Path(args.input) if args.input else Path(__file__).parent / 'output' / 'all_moj_judgments.json'
+    output_dir = json_path.parent
+    tmp_path = json_path.with_name(json_path.name + '.tmp')
 
     print(f"📂 قراءة ملف الأحكام: {json_path}")
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    print(f"   {len(data)} حكم")
 
-    # إحصائيات قبل الإصلاح
-    empty_before = sum(1 for j in data if not j.get('city'))
-    print(f"\n📊 قبل الإصلاح:")
-    print(f"   أحكام بدون مدينة: {empty_before}")
+    # ملفات المجلدات الفردية الموجودة تُعاد كتابتها في المرور نفسه
+    vol_paths = {vol: output_dir / f'vol_{vol:02d}_judgments.json' for vol in range(1, 14)}
+    vol_writers = {vol: JsonArrayWriter(path.with_name(path.name + '.tmp'))
+                   for vol, path in vol_paths.items() if path.exists()}
 
-    # تطبيق الإصلاحات
-    fixes_applied = 0
-    for j in data:
-        old_city = j.get('city', '')
-        fix_judgment(j)
-        if j.get('city', '') != old_city:
-            fixes_applied += 1
+    stats = {
+        'volumes_processed': 13,
+        'total_judgments': 0,
+        'by_volume': {},
+        'by_category': {},
+        'by_city': {},
+        'errors': [],
+    }
+    empty_before = empty_after = fixes_applied = 0
+    city_counts = {}
 
-    # إحصائيات بعد الإصلاح
-    empty_after = sum(1 for j in data if not j.get('city'))
+    # مرور واحد: إصلاح كل حكم وكتابته فورًا مع تحديث الإحصائيات
+    writer = open_writer(tmp_path)
+    try:
+        for j in iter_judgments(json_path):
+            old_city = j.get('city', '')
+            if not old_city:
+                empty_before += 1
+            fix_judgment(j)
+            if j.get('city', '') != old_city:
+                fixes_applied += 1
+            if not j.get('city'):
+                empty_after += 1
+
+            writer.write(j)
+            vol = j.get('volume', 0)
+            if vol in vol_writers:
+                vol_writers[vol].write(j)
+
+            city = j.get('city', '') or '(فارغ)'
+            city_counts[city] = city_counts.get(city, 0) + 1
+            stats['total_judgments'] += 1
+            stats['by_volume'][str(vol)] = stats['by_volume'].get(str(vol), 0) + 1
+            cat = j.get('circuit_type', 'غير محدد')
+            stats['by_category'][cat] = stats['by_category'].get(cat, 0) + 1
+            city = j.get('city', 'غير محدد') or 'غير محدد'
+            stats['by_city'][city] = stats['by_city'].get(city, 0) + 1
+    except BaseException:
+        # لا يُمس الملف الأصلي إن توقف الإصلاح في المنتصف
+        for w in (writer, *vol_writers.values()):
+            w.close()
+            w.path.unlink(missing_ok=True)
+        raise
+    for w in (writer, *vol_writers.values()):
+        w.close()
+
+    print(f"   {stats['total_judgments']} حكم")
+    print(f"\n📊 قبل الإصلاح:")
+    print(f"   أحكام بدون مدينة: {empty_before}")
     print(f"\n✅ بعد الإصلاح:")
     print(f"   تم إصلاح: {fixes_applied} حكم")
     print(f"   أحكام بدون مدينة: {empty_after}")
 
-    # عرض جميع المدن بعد الإصلاح
-    city_counts = {}
-    for j in data:
-        city = j.get('city', '') or '(فارغ)'
-        city_counts[city] = city_counts.get(city, 0) + 1
-
     print(f"\n📍 جميع المدن بعد الإصلاح:")
     for city, count in sorted(city_counts.items(), key=lambda x: -x[1]):
         print(f"   [{count}x] {city}")
@@ -194,37 +156,23 @@ def main():
     else:
         print(f"\n✓ لا توجد مدن مشبوهة متبقية")
 
-    # حفظ الملف المصحح
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    unlisted = sorted(c for c in city_counts if c != '(فارغ)' and city_id(c) is None)
+    if unlisted:
+        print(f"\nℹ مدن خارج جدول المدن المعتمدة ({len(unlisted)}): {unlisted[:20]}")
+
+    info = memo_info()['city_from_court']
+    print(f"\n🗂 أسماء محاكم مختلفة: {info['currsize']} (من الذاكرة: {info['hits']} مرة)")
+
+    # حفظ الملف المصحح (استبدال ذري بعد اكتمال الكتابة)
+    os.replace(tmp_path, json_path)
     print(f"\n💾 تم حفظ الملف المصحح: {json_path}")
 
     # تحديث ملفات المجلدات الفردية
-    for vol in range(1, 14):
-        vol_path = Path(__file__).parent / 'output' / f'vol_{vol:02d}_judgments.json'
-        if vol_path.exists():
-            vol_judgments = [j for j in data if j.get('volume') == vol]
-            with open(vol_path, 'w', encoding='utf-8') as f:
-                json.dump(vol_judgments, f, ensure_ascii=False, indent=2)
+    for vol, w in vol_writers.items():
+        os.replace(w.path, vol_paths[vol])
 
     # تحديث الإحصائيات
-    stats = {
-        'volumes_processed': 13,
-        'total_judgments': len(data),
-        'by_volume': {},
-        'by_category': {},
-        'by_city': {},
-        'errors': [],
-    }
-    for j in data:
-        vol = j.get('volume', 0)
-        stats['by_volume'][str(vol)] = stats['by_volume'].get(str(vol), 0) + 1
-        cat = j.get('circuit_type', 'غير محدد')
-        stats['by_category'][cat] = stats['by_category'].get(cat, 0) + 1
-        city = j.get('city', 'غير محدد') or 'غير محدد'
-        stats['by_city'][city] = stats['by_city'].get(city, 0) + 1
-
-    stats_path = Path(__file__).parent / 'output' / 'extraction_stats.json'
+    stats_path = output_dir / 'extraction_stats.json'
     with open(stats_path, 'w', encoding='utf-8') as f:
         json.dump(stats, f, ensure_ascii=False, indent=2)
 
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Regression test for boe_parser.apply_amendments on the real amended articles.
+
+Runs every amended article in client/public/data/laws/*_boe.json that has
+paragraph amendments (affected_paragraph + new_text) through the
+paragraph-keyed apply_amendments and the regex patcher it replaced, and
+checks that:
+  - split_paragraphs/key_paragraphs + render_paragraphs give back the
+    original text exactly, and an amendment that matches no paragraph
+    leaves the text untouched;
+  - amendments that match no paragraph, with the HTML `paragraphs` list
+    keying the list items the text shows without numbers, are listed and
+    stay within MAX_UNMATCHED (they name a paragraph the original does not
+    have: mostly added paragraphs);
+  - the new text of the last amendment of each paragraph is in the result,
+    and every marked line of the original outside the amended paragraphs is
+    still there (the regex patcher swallowed following "2-" lines and
+    matched markers in the middle of lines);
+  - where the regex patcher did keep those lines, both give the same text
+    (up to spacing around the marker);
+  - apply_paragraph_amendments on the stored `paragraphs` list replaces only
+    the targeted entries;
+  - for articles whose last amendment rewrites the whole article,
+    amendment_timeline's last version (decoded from its stored rows) is the
+    new text of that amendment, without the "بالنص التالي :" lead-in, and
+    that text is in the amendment note.
+Prints the timings of both implementations at the end.
+
+Usage:
+    python scripts/test_apply_amendments.py
+"""
+
+import glob
+import json
+import re
+import sys
+import timeit
+from pathlib import Path
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent))
+from amendment_timeline import decode_version, encode_versions, materialize, order_amendments, whole_article_text
+from boe_parser import (
+    _PARA_MARKER_RE, _QUOTES, apply_amendments, apply_paragraph_amendments, index_paragraphs, key_paragraphs,
+    marker_key, render_paragraphs, split_paragraphs,
+)
+
+# Amendments naming a paragraph the original article does not have
+MAX_UNMATCHED = 66
+
+LAWS_GLOB = str(Path(__file__).resolve().parent.parent / 'client' / 'public' / 'data' / 'laws' / '*_boe.json')
+
+
+def legacy_apply_amendments(original_text, amendments):
+    """The regex patcher apply_amendments used before (one search + replace per amendment)."""
+    if not original_text or not amendments:
+        return original_text
+    current_text = original_text
+    for amendment in amendments:
+        if 'paragraph' not in amendment or 'new_text' not in amendment:
+            continue
+        para = amendment['paragraph'].strip()
+        new_text = amendment['new_text'].strip()
+        starts_with_para = new_text.startswith(f'{para} -') or new_text.startswith(f'{para}-')
+        para_pattern = rf'{re.escape(para)}\s*-\s*([^\n]+(?:\n(?![أ-ي]+\s*-)[^\n]+)*)'
+        match = re.search(para_pattern, current_text, re.MULTILINE)
+        if match:
+            old_para_full = match.group(0)
+            new_para_full = new_text if starts_with_para else f'{para} - {new_text}'
+            current_text = current_text.replace(old_para_full, new_para_full, 1)
+    return current_text
+
+
+def load_cases():
+    """(label, article, paragraph amendments) for every amended article that has some."""
+    cases = []
+    for path in sorted(glob.glob(LAWS_GLOB)):
+        with open(path, encoding='utf-8') as f:
+            law = json.load(f)
+        for art in law.get('articles') or []:
+            amendments = [{'paragraph': a['affected_paragraph'], 'new_text': a['new_text']}
+                          for a in art.get('amendments') or []
+                          if a.get('affected_paragraph') and a.get('new_text')]
+            if amendments and art.get('original_text'):
+                cases.append((f"{Path(path).name} {art.get('number_text')}", art, amendments))
+    return cases
+
+
+def spacing(text):
+    """Text with spacing around dashes and line ends folded."""
+    return re.sub(r'\s*([-–—])\s*', r'\1', '\n'.join(l.strip() for l in text.split('\n')))
+
+
+def kept_marker_lines(original, result, amendments):
+    """Marked lines of the original, outside the amended paragraphs, missing from result."""
+    paragraphs = split_paragraphs(original)
+    index = index_paragraphs(paragraphs)
+    targets = {index.get(marker_key(a['paragraph'])) for a in amendments}
+    result_lines = set(l.strip() for l in result.split('\n'))
+    return [p['raw'] for pos, p in enumerate(paragraphs)
+            if pos not in targets and p['marker'] and p['raw'].split('\n')[0].strip() not in result_lines]
+
+
+def check(cases):
+    failures = 0
+    applied = legacy_agree = legacy_dropped = legacy_only = untouched = 0
+    unmatched = []
+    for label, art, amendments in cases:
+        original = art['original_text']
+        keyed = key_paragraphs(split_paragraphs(original), art['paragraphs'])
+        if render_paragraphs(split_paragraphs(original)) != original or render_paragraphs(keyed) != original:
+            failures += 1
+            print(f"FAIL round trip: {label}")
+            continue
+        index = index_paragraphs(keyed)
+        unmatched += [(label, a['paragraph']) for a in amendments if marker_key(a['paragraph']) not in index]
+
+        result = apply_amendments(original, amendments, art['paragraphs'])
+        legacy = legacy_apply_amendments(original, amendments)
+        if result == original:
+            untouched += 1
+            legacy_only += legacy != original
+            continue
+        applied += 1
+
+        # The last amendment of a paragraph is the one in force
+        last = {marker_key(a['paragraph']): a for a in amendments}
+        for key, a in last.items():
+            body = a['new_text'].strip().lstrip(_QUOTES)
+            m = _PARA_MARKER_RE.match(body)
+            body = body[m.end():] if m else body
+            if key in index and body.split('\n')[0] not in result:
+                failures += 1
+                print(f"FAIL new text missing: {label} ({a['paragraph']})")
+        missing = kept_marker_lines(original, result, amendments)
+        if missing:
+            failures += 1
+            print(f"FAIL {len(missing)} untouched marker lines lost: {label}")
+
+        if kept_marker_lines(original, legacy, amendments):
+            legacy_dropped += 1
+        elif spacing(legacy) == spacing(result):
+            legacy_agree += 1
+
+        paragraphs, n = apply_paragraph_amendments(art['paragraphs'], amendments)
+        changed = sum(1 for old, new in zip(art['paragraphs'], paragraphs) if old is not new)
+        if len(paragraphs) != len(art['paragraphs']) or changed > n:
+            failures += 1
+            print(f"FAIL paragraphs list: {label} ({changed} entries changed, {n} applied)")
+
+    print(f"  {len(cases)} amended articles with paragraph amendments")
+    print(f"  applied: {applied}, no matching paragraph: {untouched} "
+          f"(regex patcher changed {legacy_only} of those)")
+    print(f"  {len(unmatched)} amendments match no paragraph (at most {MAX_UNMATCHED}):")
+    for label, paragraph in unmatched:
+        print(f"    {label}: {paragraph!r}")
+    if len(unmatched) > MAX_UNMATCHED:
+        failures += 1
+        print(f"FAIL {len(unmatched)} unmatched amendments, more than {MAX_UNMATCHED}")
+    print(f"  regex patcher on the applied ones: {legacy_agree} same text, "
+          f"{legacy_dropped} lost other marked lines, "
+          f"{applied - legacy_agree - legacy_dropped} other differences")
+    return failures
+
+
+def load_rewritten():
+    """(label, article, new text) for articles whose last amendment rewrites the whole article."""
+    rewritten = []
+    for path in sorted(glob.glob(LAWS_GLOB)):
+        with open(path, encoding='utf-8') as f:
+            law = json.load(f)
+        for art in law.get('articles') or []:
+            if not art.get('amendments') or not art.get('original_text'):
+                continue
+            _, last = order_amendments(art['amendments'])[-1]
+            new_text = None if last.get('affected_paragraph') else whole_article_text(last)
+            if new_text:
+                rewritten.append((f"{Path(path).name} {art.get('number_text')}", art, last, new_text))
+    return rewritten
+
+
+def check_rewritten(rewritten):
+    failures = 0
+    for label, art, last, new_text in rewritten:
+        versions = materialize(art['original_text'], art['amendments'])
+        text = decode_version(encode_versions(versions), len(versions) - 1)
+        if text != new_text or not versions[-1]['applied']:
+            failures += 1
+            print(f"FAIL last version is not the rewritten article: {label}")
+        elif re.match(r'(?:بالنص|كما\s+يل)', text) or text.split('\n')[0] not in last['description']:
+            failures += 1
+            print(f"FAIL rewritten text not taken from the amendment note: {label} {text[:40]!r}")
+    print(f"  {len(rewritten)} articles rewritten as a whole by their last amendment")
+    return failures
+
+
+def benchmark(cases):
+    number = 5
+    t_legacy = timeit.timeit(lambda: [legacy_apply_amendments(a['original_text'], am) for _, a, am in cases],
+                             number=number) / number
+    t_new = timeit.timeit(lambda: [apply_amendments(a['original_text'], am, a['paragraphs']) for _, a, am in cases],
+                          number=number) / number
+    # The keyed update alone, on paragraphs split once (what amendment_timeline holds)
+    held = [(split_paragraphs(a['original_text']), am) for _, a, am in cases]
+    t_held = timeit.timeit(lambda: [apply_paragraph_amendments(p, am) for p, am in held], number=number) / number
+    print(f"\n  regex patcher {t_legacy * 1e3:.1f}ms, keyed {t_new * 1e3:.1f}ms "
+          f"(split once, then {t_held * 1e3:.1f}ms of keyed updates) for {len(cases)} articles")
+
+
+if __name__ == '__main__':
+    cases = load_cases()
+    if not cases:
+        print("No amended articles found")
+        sys.exit(1)
+    print("Amended articles:")
+    failed = check(cases)
+    failed += check_rewritten(load_rewritten())
+    benchmark(cases)
+    sys.exit(1 if failed else 0)
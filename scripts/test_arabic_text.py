@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test and micro-benchmark the shared arabic_text normalizers.
+
+Each normalizer is checked against the per-script code it replaced
+(replace loops, chained regexes, ad-hoc maketrans tables) on generated
+judgment-like text, then both are timed on short strings (case numbers,
+dates) and on page-sized texts.
+
+Usage:
+    python scripts/test_arabic_text.py
+"""
+
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent))
+import arabic_text
+from arabic_text import (
+    collapse_spacing, compose_hamza, fold_for_matching, replace_all, strip_control_chars,
+    strip_diacritics, to_western_digits,
+)
+
+
+# ─── The implementations arabic_text replaced ─────────────────────────
+
+def legacy_convert_arabic_numerals(text):
+    for i, d in enumerate('٠١٢٣٤٥٦٧٨٩'):
+        text = text.replace(d, str(i))
+    return text
+
+
+def legacy_normalize_arabic(text):
+    text = text.replace('�', '')
+    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', text)
+    text = re.sub(r'[ \t]+', ' ', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+
+def new_normalize_arabic(text):
+    return collapse_spacing(compose_hamza(strip_control_chars(text))).strip()
+
+
+LEGACY_DIACRITICS_RE = re.compile(
+    r'[ً-ٰٟۖ-ۜ۟-ۤۧ-۪ۨ-ۭ]')
+
+LEGACY_FOLD_TABLE = str.maketrans({
+    **{c: None for c in "ًٌٍَُِّْٰـ"},
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي", "ة": "ه", "ؤ": "و", "ئ": "ي",
+    **{chr(0x0660 + d): str(d) for d in range(10)},
+    **{chr(0x06F0 + d): str(d) for d in range(10)},
+})
+
+COURT_FIXES = [('حمكمة', 'محكمة'), ('املحكمة', 'المحكمة'), ('اجلزائية', 'الجزائية'),
+               ('اجلنائية', 'الجنائية'), ('حمافظة', 'محافظة'), ('رشورة', 'شرورة')]
+
+
+def legacy_court_fix(court):
+    for old, new in COURT_FIXES:
+        court = court.replace(old, new)
+    return court
+
+
+# (name, legacy, new)
+PAIRS = [
+    ('digits', legacy_convert_arabic_numerals, to_western_digits),
+    ('digits (translate)', lambda t: t.translate(str.maketrans('٠١٢٣٤٥٦٧٨٩', '0123456789')), to_western_digits),
+    ('normalize_arabic', legacy_normalize_arabic, new_normalize_arabic),
+    ('diacritics', lambda t: LEGACY_DIACRITICS_RE.sub('', t), strip_diacritics),
+    ('match fold', lambda t: t.translate(LEGACY_FOLD_TABLE), fold_for_matching),
+    ('court fixes', legacy_court_fix, lambda t: replace_all(t, COURT_FIXES)),
+]
+
+WORDS = ['وحيث', 'إن', 'المدعي', 'تقدم', 'بدعواه', 'أمام', 'املحكمة', 'الإدارية', 'بتاريخ', '١٤٤٢/٣/٥هـ',
+         'وقد', 'نظرت', 'الدائرة', 'الدعوى', 'رقم', '(١٢٣)', 'حُكِمَ', 'بــــ', 'مسؤولية', 'القضائية', '۱۴۳۵',
+         'ٱلله', 'مستشفى', 'حمافظة', 'اجلزائية', 'قُرْآنٌ']
+NOISE = ['  ', '\t', ' \t ', '\n', '\n\n\n\n', '�', '\x0c', '‏']
+
+
+def make_text(rng, words):
+    parts = []
+    for _ in range(words):
+        parts.append(rng.choice(WORDS))
+        parts.append(rng.choice(NOISE) if rng.random() < 0.05 else ' ')
+    return ''.join(parts)
+
+
+def check(samples):
+    failures = 0
+    for name, legacy, new in PAIRS:
+        bad = sum(1 for t in samples if legacy(t) != new(t))
+        failures += bad
+        print(f"  {name:<20} {len(samples) - bad}/{len(samples)} identical")
+
+    # The old normalize_arabic replaced each hamza letter with itself (a no-op);
+    # compose_hamza composes alef/waw/ya + combining hamza or madda instead
+    for decomposed, composed in (('\u0627\u0654حمد', 'أحمد'), ('\u0627\u0655سلام', 'إسلام'),
+                                 ('\u0627\u0653ية', 'آية'), ('مس\u0648\u0654ول', 'مسؤول'),
+                                 ('ش\u064a\u0654', 'شئ'), ('أحمد', 'أحمد'), ('\u0654', '\u0654')):
+        if compose_hamza(decomposed) != composed:
+            failures += 1
+            print(f"FAIL compose_hamza({decomposed!r}) = {compose_hamza(decomposed)!r}")
+        elif decomposed != composed and legacy_normalize_arabic(decomposed) != decomposed:
+            failures += 1
+            print(f"FAIL the old normalize_arabic changed {decomposed!r}")
+    return failures
+
+
+def benchmark(rng):
+    inputs = [('case number', '١٤٣٥/٣/١٢'), ('title (60 chars)', make_text(rng, 10)),
+              ('article (2k chars)', make_text(rng, 300)), ('page (25k chars)', make_text(rng, 4000))]
+    print(f"\n  {'normalizer':<20} {'input':<20} {'legacy':>10} {'arabic_text':>12}")
+    for name, legacy, new in PAIRS:
+        for label, text in inputs:
+            number = max(20, 200_000 // len(text))
+            t_legacy = timeit.timeit(lambda: legacy(text), number=number) / number
+            t_new = timeit.timeit(lambda: new(text), number=number) / number
+            print(f"  {name:<20} {label:<20} {t_legacy * 1e6:>8.1f}us {t_new * 1e6:>10.1f}us"
+                  f"  ({t_legacy / max(t_new, 1e-12):.1f}x)")
+
+
+def crossover():
+    """Where the replace chain starts to beat the single pass (translate, or a
+    regex sub for deletion maps), against each map's short_len."""
+    rng = random.Random(7)
+    text = make_text(rng, 1000)
+    lengths = (4, 8, 16, 32, 64, 128, 256, 512, 1024)
+    for name in ('DIGITS', 'ALL_DIGITS', 'DIACRITICS_MAP', 'TATWEEL_MAP', 'ZERO_WIDTH_MAP',
+                 'CONTROL_CHARS_MAP', 'MATCH_FOLD', 'SEARCH_FOLD'):
+        cmap = getattr(arabic_text, name)
+        pairs = cmap._pairs
+        single = (lambda t: cmap._sub('', t)) if cmap.deletes else (lambda t: t.translate(cmap.table))
+
+        def chain(t):
+            for char, repl in pairs:
+                if char in t:
+                    t = t.replace(char, repl)
+            return t
+
+        measured = 0
+        for n in lengths:
+            s = text[:n]
+            number = max(200, 100_000 // n)
+            if timeit.timeit(lambda: single(s), number=number) >= timeit.timeit(lambda: chain(s), number=number):
+                break
+            measured = n
+        kind = 'sub' if cmap.deletes else 'translate'
+        print(f"  {name:<18} {len(pairs):>3} entries: {kind:<9} wins up to ~{measured:>4} chars, "
+              f"short_len {cmap.short_len}")
+
+
+if __name__ == '__main__':
+    rng = random.Random(1442)
+    samples = [make_text(rng, rng.choice([1, 3, 8, 40, 400])) for _ in range(500)]
+    samples += ['', '١', 'abc', '\n\n\n', ' \t ']
+    print("Equivalence:")
+    failed = check(samples)
+    print("\nBenchmark:", end='')
+    benchmark(rng)
+    print("\nCrossover:")
+    crossover()
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test and benchmark extract_judgments.clean_html.
+
+Checks HTML snippets of the kind found in judgmentTextofRulling (named and
+numeric entities, nested spans, paragraph breaks, stray '<' / '&'), then
+times it against the original regex + replace chain on a sample of
+payloads.
+
+Usage:
+    python scripts/test_clean_html.py                     # synthetic payloads
+    python scripts/test_clean_html.py --input_dir DIR     # sample real judgment files
+"""
+
+import sys
+import re
+import json
+import random
+import time
+import argparse
+from pathlib import Path
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from extract_judgments import clean_html
+
+
+def legacy_clean_html(raw_html):
+    """The original tag regex + six entity replaces (reference for timing)."""
+    if not raw_html:
+        return ""
+    cleantext = re.sub(re.compile('<.*?>'), '', raw_html)
+    cleantext = cleantext.replace('&nbsp;', ' ').replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&').replace('&quot;', '"').replace('&hellip;', '...')
+    return re.sub(r'\s+', ' ', cleantext).strip()
+
+
+# (HTML input, expected text)
+CASES = [
+    ('', ''),
+    ('<p>حكمت الدائرة</p>', 'حكمت الدائرة'),
+    ('<p>  حكمت&nbsp;&nbsp;الدائرة  </p>', 'حكمت الدائرة'),
+    ('<p>الفقرة الأولى</p><p>الفقرة الثانية</p>', 'الفقرة الأولى الفقرة الثانية'),
+    ('السطر الأول<br/>السطر الثاني', 'السطر الأول السطر الثاني'),
+    ('<span>المد</span><span>عي</span>', 'المدعي'),
+    ('&quot;القرار&quot; &amp; &lt;الحكم&gt;', '"القرار" & <الحكم>'),
+    ('&#1604;&#x627; &hellip;', 'لا …'),
+    ('رقم&nbsp;(١٢)&#160;لعام ١٤٤٢هـ', 'رقم (١٢) لعام ١٤٤٢هـ'),
+    ('<p style="text-align: justify;" dir="rtl"><span style="font-size:14pt">نص</span></p>', 'نص'),
+    ('<style>p { color: red }</style><p>نص</p>', 'نص'),
+    ('<!-- تعليق --><p>نص</p>', 'نص'),
+    ('أ < ب & ج', 'أ < ب & ج'),
+    ('&unknown; &nbsp', '&unknown;'),
+    ('\r\n<p>\r\n\tنص\r\n</p>\r\n', 'نص'),
+]
+
+
+def check_cases():
+    failures = 0
+    for html_text, expected in CASES:
+        got = clean_html(html_text)
+        if got != expected:
+            failures += 1
+            print(f"FAIL: {html_text!r}\n  expected: {expected!r}\n  got:      {got!r}")
+    print(f"Cases: {len(CASES) - failures}/{len(CASES)} passed")
+    return failures
+
+
+def synthetic_payloads(count=50, seed=1442):
+    rng = random.Random(seed)
+    common = ['وحيث', 'إن', 'المدعي', 'تقدم', 'بدعواه', 'أمام', 'المحكمة', 'الإدارية',
+              'بتاريخ', '١٤٤٢/٣/٥هـ', 'وقد', 'نظرت', 'الدائرة', 'الدعوى']
+    rare = ['&quot;القرار&quot;', '&nbsp;', '&#1604;', '(', ')', '،']
+
+    def para():
+        words = (rng.choice(rare) if rng.random() < 0.1 else rng.choice(common) for _ in range(120))
+        return ('<p dir="rtl" style="text-align: justify;"><span style="font-size:14pt">'
+                + ' '.join(words) + '</span></p>\n')
+
+    return [''.join(para() for _ in range(rng.randint(5, 40))) for _ in range(count)]
+
+
+def sample_payloads(input_dir, count=200, seed=1442):
+    files = sorted(Path(input_dir).glob('*.json'))
+    random.Random(seed).shuffle(files)
+    payloads = []
+    for f in files:
+        try:
+            details = json.loads(f.read_text(encoding='utf-8')).get('details', {})
+        except (OSError, ValueError):
+            continue
+        raw = details.get('judgmentTextofRulling')
+        if raw:
+            payloads.append(raw)
+            if len(payloads) >= count:
+                break
+    return payloads
+
+
+def benchmark(payloads, repeat=5):
+    total_chars = sum(len(p) for p in payloads)
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for p in payloads:
+            legacy_clean_html(p)
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for p in payloads:
+            clean_html(p)
+    t_new = time.perf_counter() - t0
+
+    print(f"Benchmark ({len(payloads)} payloads, {total_chars:,} chars x {repeat}): "
+          f"legacy {t_legacy * 1000:.1f} ms, new {t_new * 1000:.1f} ms "
+          f"({t_legacy / max(t_new, 1e-9):.1f}x)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Test and benchmark clean_html')
+    parser.add_argument('--input_dir', help='Directory of judgment JSON files to sample payloads from')
+    args = parser.parse_args()
+
+    failed = check_cases()
+    payloads = sample_payloads(args.input_dir) if args.input_dir else synthetic_payloads()
+    if payloads:
+        benchmark(payloads)
+    else:
+        print(f"No judgmentTextofRulling payloads found in {args.input_dir}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Test and benchmark the legal_compliance_monitor rule engine.
+
+Checks the fused placeholder patterns against the original per-pattern
+searches, then scans the whole laws directory with both the rule engine
+and the original scan loop, asserts identical findings and reports timings.
+
+Usage:
+    python scripts/test_compliance_rules.py [--laws-glob GLOB]
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict
+from pathlib import Path
+
+if sys.platform == "win32":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+sys.path.insert(0, str(Path(__file__).parent))
+import legal_compliance_monitor as monitor
+from legal_compliance_monitor import Finding, normalize_digits, parse_article_number
+
+LAWS_GLOB = str(Path(__file__).resolve().parent.parent / "client" / "public" / "data" / "laws" / "*.json")
+
+LEGACY_PLACEHOLDER_PATTERNS = [
+    r"\bTODO\b",
+    r"\bFIXME\b",
+    r"\.{3,}",
+    r"غير\s+متوفر",
+    r"يُضاف\s+لاحقًا",
+]
+
+PLACEHOLDER_SAMPLES = [
+    "TODO", "todo: مراجعة", "xTODO", "TODOs", "_TODO", "(FIXME)", "fixme", "FIXMEE",
+    "نص...", "نص..", "غير  متوفر", "غيرمتوفر", "يُضاف لاحقًا", "يضاف لاحقًا",
+    "المادة ١٢", "", "T", "...TODO",
+]
+
+
+def legacy_has_placeholder(text: str) -> bool:
+    normalized_text = normalize_digits(text)
+    return any(
+        re.search(p, normalized_text, flags=re.IGNORECASE) for p in LEGACY_PLACEHOLDER_PATTERNS
+    )
+
+
+def legacy_scan_file(path: str) -> list[Finding]:
+    """The original scan loop (one uncompiled re.search per pattern per article)."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    law_id = str(data.get("law_id", os.path.basename(path)))
+    law_name = str(data.get("law_name", "(unknown)"))
+    findings: list[Finding] = []
+
+    def add(severity, code, message, location):
+        findings.append(Finding(severity, code, law_id, law_name, message, location))
+
+    for field in monitor.MANDATORY_FIELDS:
+        value = data.get(field)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            add("high", "MISSING_MANDATORY_FIELD", f"الحقل الإلزامي `{field}` مفقود أو فارغ.", f"$.{field}")
+
+    articles = data.get("articles") if isinstance(data.get("articles"), list) else []
+    total_articles = data.get("total_articles")
+    if isinstance(total_articles, int) and total_articles != len(articles):
+        add("medium", "TOTAL_ARTICLES_MISMATCH",
+            "قيمة `total_articles` لا تطابق عدد المواد الفعلي "
+            f"({total_articles} != {len(articles)}).", "$.total_articles")
+
+    numbers: list[int] = []
+    for idx, article in enumerate(articles):
+        location = f"$.articles[{idx}]"
+        number = parse_article_number(article.get("number"))
+        if number is None:
+            add("medium", "INVALID_ARTICLE_NUMBER", "رقم المادة غير قابل للتحليل كرقم صحيح.", f"{location}.number")
+        else:
+            numbers.append(number)
+        text = article.get("text")
+        if not isinstance(text, str) or not text.strip():
+            add("high", "EMPTY_ARTICLE_TEXT", "نص المادة فارغ أو مفقود.", f"{location}.text")
+        elif legacy_has_placeholder(text):
+            add("low", "PLACEHOLDER_TEXT", "تم اكتشاف مؤشر نص تجريبي/غير نهائي داخل المادة.", f"{location}.text")
+        status = article.get("status")
+        if status not in monitor.ALLOWED_ARTICLE_STATUSES:
+            add("low", "UNKNOWN_ARTICLE_STATUS", f"حالة المادة غير معروفة: `{status}`.", f"{location}.status")
+
+    if numbers:
+        for n in sorted(n for n, c in Counter(numbers).items() if c > 1):
+            add("high", "DUPLICATE_ARTICLE_NUMBER", f"رقم المادة `{n}` مكرر أكثر من مرة.", "$.articles[*].number")
+        missing = sorted(set(range(1, max(numbers) + 1)) - set(numbers))
+        if missing:
+            preview = ", ".join(map(str, missing[:10]))
+            suffix = " ..." if len(missing) > 10 else ""
+            add("medium", "ARTICLE_NUMBER_GAPS", f"توجد فجوات في ترقيم المواد: {preview}{suffix}", "$.articles[*].number")
+    return findings
+
+
+def check_placeholders() -> int:
+    regex, _groups = monitor.get_engine().fused["text"]
+    failures = 0
+    for text in PLACEHOLDER_SAMPLES:
+        expected = legacy_has_placeholder(text)
+        got = regex.search(text) is not None
+        if got != expected:
+            failures += 1
+            print(f"FAIL: {text!r} expected {expected}, got {got}")
+    print(f"Placeholder samples: {len(PLACEHOLDER_SAMPLES) - failures}/{len(PLACEHOLDER_SAMPLES)} passed")
+    return failures
+
+
+def check_corpus(law_paths: list[str]) -> int:
+    t0 = time.perf_counter()
+    legacy = [asdict(f) for p in law_paths for f in legacy_scan_file(p)]
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    engine = [asdict(f) for p in law_paths for f in monitor.scan_file(p)]
+    t_engine = time.perf_counter() - t0
+
+    same = legacy == engine
+    print(f"Corpus ({len(law_paths)} files): {len(engine)} findings, "
+          f"{'identical to' if same else 'DIFFERENT from'} the original scan")
+    print(f"Benchmark: original {t_legacy:.2f}s, rule engine {t_engine:.2f}s "
+          f"({t_legacy / max(t_engine, 1e-9):.1f}x)")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test and benchmark the compliance rule engine")
+    parser.add_argument("--laws-glob", default=LAWS_GLOB)
+    args = parser.parse_args()
+
+    failed = check_placeholders()
+    law_paths = sorted(glob.glob(args.laws_glob))
+    if law_paths:
+        failed += check_corpus(law_paths)
+    else:
+        print(f"No law files matched {args.laws_glob}")
+    sys.exit(1 if failed else 0)
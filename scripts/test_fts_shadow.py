@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test the normalized shadow FTS indexes (fts_shadow.py).
+
+Loads generated judgments into a temporary data.db through JudgmentsLoader,
+builds judgments_norm_fts, then checks that:
+  - spelling variants (ة/ه, hamza forms, vocalized words, LEGAL_CORRECTIONS
+    entries) find the same rows once the query is normalized;
+  - snippet() highlights, computed on the original text, land on a word
+    whose normalized form is the query term (token positions line up);
+  - the `stem` column finds prefixed/suffixed forms (للمحكمة, والمحكمة,
+    المدعين ...) through one stem term, again highlighted on the right word;
+  - rows replaced by a second load leave no stale terms behind.
+Prints the build throughput at the end.
+
+Usage:
+    python scripts/test_fts_shadow.py
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent))
+import fts_shadow
+from arabic_stemmer import stem_word
+from fts_shadow import normalize_for_search
+from judgments_db import JudgmentsLoader
+
+WORDS = ['المحكمة', 'المحكمه', 'الاستئناف', 'الاستئناق', 'الإستئناف', 'قُدِّم', 'قدم', 'إنَّ', 'ان',
+         'الإجراءات', 'الاجراءات', 'الجزائيــة', 'مسؤولية', 'الدعوى', 'رقم', '١٤٤٢/٣/٥هـ',
+         'فنسختتم الحكيان', 'مستند الحكم', 'الشريعه', 'وحيث', 'التعويض', 'للمحكمة', 'والمحكمة',
+         'بالمحكمه', 'المدعي', 'المدعين', 'للمدعين', 'والمدعون']
+
+# query -> raw spellings it must find (after normalize_for_search)
+VARIANTS = {
+    'المحكمه': ('المحكمة', 'المحكمه'),
+    'الاستئناف': ('الاستئناف', 'الاستئناق', 'الإستئناف'),
+    'قدم': ('قُدِّم', 'قدم'),
+    'الاجراءات': ('الإجراءات', 'الاجراءات'),
+    'الجزائية': ('الجزائيــة',),
+    'ان': ('إنَّ', 'ان'),
+}
+
+# stem -> raw forms the stem column must find
+STEM_VARIANTS = {
+    'محكم': ('المحكمة', 'المحكمه', 'للمحكمة', 'والمحكمة', 'بالمحكمه'),
+    'مدع': ('المدعي', 'المدعين', 'للمدعين', 'والمدعون'),
+}
+
+
+def make_judgments(rng, count):
+    return [{'case_id': str(i), 'court_body': rng.choice(WORDS[:3]) + ' العامة',
+             'text': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 60)))}
+            for i in range(count)]
+
+
+def search(conn, query, snippets=False, column='text'):
+    q = normalize_for_search(query)
+    match = f'{column}: "{q}"'
+    if snippets:
+        col = 2 if column == 'stem' else 0
+        return conn.execute(
+            f"SELECT j.case_id, j.text, highlight(judgments_norm_fts, {col}, '【', '】') "
+            "FROM judgments j JOIN judgments_norm_fts f ON j.id = f.rowid "
+            "WHERE judgments_norm_fts MATCH ?", (match,)).fetchall()
+    return {r[0] for r in conn.execute(
+        "SELECT j.case_id FROM judgments j JOIN judgments_norm_fts f ON j.id = f.rowid "
+        "WHERE judgments_norm_fts MATCH ?", (match,))}
+
+
+def check_highlights(conn, query, column, key):
+    """Every highlighted word maps back to the query term under `key`."""
+    target = key(normalize_for_search(query))
+    for case_id, text, marked in search(conn, query, snippets=True, column=column):
+        for part in marked.split('【')[1:]:
+            word = part.split('】', 1)[0]
+            if key(normalize_for_search(word)) != target:
+                print(f"FAIL highlight in {case_id}: {word!r} for {column}: {query!r}")
+                return 1
+    return 0
+
+
+def check(conn):
+    failures = 0
+    rows = conn.execute("SELECT case_id, text FROM judgments").fetchall()
+    for query, spellings in VARIANTS.items():
+        expected = {case_id for case_id, text in rows if any(s in text.split() for s in spellings)}
+        got = search(conn, query)
+        if not expected <= got:
+            failures += 1
+            print(f"FAIL {query!r}: {len(expected - got)} rows with a variant spelling not found")
+        print(f"  {query:<12} {len(got)} rows (variants: {', '.join(spellings)})")
+
+        failures += check_highlights(conn, query, 'text', lambda w: w)
+
+    for stem, forms in STEM_VARIANTS.items():
+        expected = {case_id for case_id, text in rows if any(f in text.split() for f in forms)}
+        got = search(conn, stem, column='stem')
+        if expected != got:
+            failures += 1
+            print(f"FAIL stem {stem!r}: {len(expected - got)} missing, {len(got - expected)} extra")
+        print(f"  stem {stem:<7} {len(got)} rows (forms: {', '.join(forms)})")
+        failures += check_highlights(conn, stem, 'stem', stem_word)
+    return failures
+
+
+def main():
+    rng = random.Random(1445)
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / 'data.db'
+        with JudgmentsLoader(db, source='sa_judicial', replace='case_id', dedup=False) as loader:
+            for j in make_judgments(rng, 5_000):
+                loader.add(j)
+
+        conn = fts_shadow.open_db(db)
+        t0 = time.perf_counter()
+        total = fts_shadow.rebuild(conn, 'judgments', verbose=False)
+        elapsed = time.perf_counter() - t0
+
+        print("Variants and highlights:")
+        failures += check(conn)
+
+        # Replace half the cases: the loader keeps the current shadow index in sync
+        with JudgmentsLoader(db, source='sa_judicial', replace='case_id', dedup=False) as loader:
+            for j in make_judgments(rng, 2_500):
+                j['text'] = 'التعويض ' + j['text'].replace('وحيث', 'حيث')
+                loader.add(j)
+        print("After replacing 2,500 cases:")
+        failures += check(conn)
+        stale = search(conn, 'وحيث') & {str(i) for i in range(2_500)}
+        if stale:
+            failures += 1
+            print(f"FAIL {len(stale)} replaced rows still match a removed word")
+        state = conn.execute("SELECT row_count, max_id FROM fts_shadow_state "
+                             "WHERE base_table = 'judgments'").fetchone()
+        live = conn.execute("SELECT count(*), MAX(id) FROM judgments").fetchone()
+        if tuple(state) != tuple(live):
+            failures += 1
+            print(f"FAIL state {state} does not match the table {live}")
+        conn.close()
+
+    print(f"\nBuild: {total:,} judgments in {elapsed:.2f}s ({total / elapsed:,.0f} rows/s)")
+    return failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if main() else 0)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test and benchmark the paragraph line classifiers (boe_parser.MarkerGrammar).
+
+Runs every line of every article text in client/public/data/laws/*.json
+through each MarkerGrammar and the per-extractor regexes it replaced, and
+checks that they accept the same lines with the same marker and body:
+  - BOE_MARKERS: extract_all_boe._paras_from_text / _parse_li, which tried
+    _RE_ORD, _RE_NUM and _RE_LET one after another;
+  - TEXT_MARKERS: boe_parser.extract_paragraphs (para_pattern);
+  - NUMBERED_MARKERS / LETTER_MARKERS: boe_parser.extract_paragraphs_from_html.
+Prints the time of both over the corpus (matching every line and unpacking
+the marked ones), and of extract_paragraphs and _paras_from_text.
+
+Usage:
+    python scripts/test_line_classifier.py
+"""
+
+import glob
+import json
+import re
+import sys
+import timeit
+from pathlib import Path
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent))
+from extract_all_boe import _paras_from_text
+from boe_parser import BOE_MARKERS, LETTER_MARKERS, NUMBERED_MARKERS, TEXT_MARKERS, extract_paragraphs, marker_parts
+
+LAWS_GLOB = str(Path(__file__).resolve().parent.parent / 'client' / 'public' / 'data' / 'laws' / '*.json')
+
+_RE_NUM = re.compile(r"^[\(]?([0-9]+|[٠-٩]+)[\)]?\s*[-–—.]\s*(.+)$")
+_RE_LET = re.compile(r"^[\(]?([أ-ي]|جـ)[\)]?\s*[-–—.]\s*(.+)$")
+_RE_ORD = re.compile(
+    r"^(أولاً?|ثانياً?|ثالثاً?|رابعاً?|خامساً?|سادساً?|سابعاً?|ثامناً?|تاسعاً?|عاشراً?)"
+    r"\s*[:–—-]\s*(.+)$"
+)
+_PARA = re.compile(r'^([أ-ي]|جـ|[٠-٩]+|[0-9]+|أولاً|ثانياً|ثالثاً|رابعاً|خامساً|سادساً|سابعاً|ثامناً|تاسعاً|عاشراً)'
+                   r'\s*[-:]\s*(.+)$')
+_NUMBERED = re.compile(r'^([0-9]+|[٠-٩]+|[أ-ي]|جـ)\s*[-:]\s*(.+)$')
+_LETTER = re.compile(r'^([أ-ي]|جـ)\s*-\s*(.+)$')
+
+
+def legacy_boe(line):
+    for regex in (_RE_ORD, _RE_NUM, _RE_LET):
+        m = regex.match(line)
+        if m:
+            return m
+    return None
+
+
+GRAMMARS = [
+    ('BOE_MARKERS', BOE_MARKERS, legacy_boe),
+    ('TEXT_MARKERS', TEXT_MARKERS, _PARA.match),
+    ('NUMBERED_MARKERS', NUMBERED_MARKERS, _NUMBERED.match),
+    ('LETTER_MARKERS', LETTER_MARKERS, _LETTER.match),
+]
+
+
+def load_texts():
+    texts = []
+    for path in sorted(glob.glob(LAWS_GLOB)):
+        with open(path, encoding='utf-8') as f:
+            law = json.load(f)
+        for art in law.get('articles') or []:
+            if isinstance(art, dict) and isinstance(art.get('text'), str):
+                texts.append(art['text'])
+    return texts
+
+
+def check(lines):
+    failures = 0
+    for name, grammar, legacy in GRAMMARS:
+        accepted = 0
+        for line in lines:
+            found = grammar.match(line)
+            found = found and marker_parts(found)
+            m = legacy(line)
+            expected = (m.group(1), m.group(2).strip()) if m else None
+            if (found and found[1:]) != expected:
+                failures += 1
+                if failures <= 10:
+                    print(f"FAIL {name}: {line[:60]!r} -> {found} (expected {expected})")
+            accepted += bool(found)
+        print(f"  {name:<17} {accepted:>7,} marker lines")
+    return failures
+
+
+def unpack_legacy(m):
+    return m.group(1), m.group(2).strip()
+
+
+def benchmark(texts, lines):
+    print(f"\n  {len(lines):,} lines, best of 3:")
+    for name, grammar, legacy in GRAMMARS:
+        t_legacy = min(timeit.repeat(lambda: [unpack_legacy(m) for m in map(legacy, lines) if m],
+                                     number=1, repeat=3))
+        t_new = min(timeit.repeat(lambda: [marker_parts(m) for m in map(grammar.match, lines) if m],
+                                  number=1, repeat=3))
+        print(f"  {name:<17} separate regexes {t_legacy * 1e3:5.0f}ms, grammar {t_new * 1e3:5.0f}ms")
+    for extract in (extract_paragraphs, _paras_from_text):
+        t = min(timeit.repeat(lambda: [extract(text) for text in texts], number=1, repeat=3))
+        print(f"  {extract.__name__} over {len(texts):,} articles: {t * 1e3:.0f}ms")
+
+
+if __name__ == '__main__':
+    texts = load_texts()
+    if not texts:
+        print("No article texts found")
+        sys.exit(1)
+    lines = [line.strip() for text in texts for line in text.split('\n') if line.strip()]
+    print("Line classifier:")
+    failed = check(lines)
+    benchmark(texts, lines)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test the OCR date repair engine (arabic_ocr_cleaner.fix_ocr_dates).
+
+Checks a corpus of real OCR date variants against expected output, then
+fuzzes the span-based engine against the original 11-pass re.sub cascade
+and compares their speed on a judgment-sized text.
+
+Usage:
+    python scripts/test_ocr_dates.py
+"""
+
+import sys
+import re
+import random
+import time
+from pathlib import Path
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent))
+from arabic_ocr_cleaner import fix_ocr_dates
+
+
+def legacy_fix_ocr_dates(text):
+    """The original whole-text cascade (reference implementation)."""
+    t = text
+    t = re.sub(r'ه/ه(/[١][٣٤][٠-٩]{2})', r'٥/٥\1', t)
+    t = re.sub(r'ه(/[٠-٩]{1,2}/[١][٣٤][٠-٩]{2})', r'٥\1', t)
+    t = re.sub(r'([٠-٩]{1,2}/)ه(/[١][٣٤][٠-٩]{2})', r'\g<1>٥\2', t)
+    t = re.sub(r'([١][٣٤][٠-٩]{2}/[٠-٩]{1,2}/)ه(?=[^٠-٩\d]|$)', r'\g<1>٥', t)
+    t = re.sub(r'([١][٣٤][٠-٩]{2}/)ه(/[٠-٩]{1,2})', r'\g<1>٥\2', t)
+    t = re.sub(r'ه/ه(/1[34]\d{2})', r'5/5\1', t)
+    t = re.sub(r'ه(/\d{1,2}/1[34]\d{2})', r'5\1', t)
+    t = re.sub(r'(\d{1,2}/)ه(/1[34]\d{2})', r'\g<1>5\2', t)
+    t = re.sub(r'(1[34]\d{2}/\d{1,2}/)ه(?=[^\d٠-٩]|$)', r'\g<1>5', t)
+    t = re.sub(r'(1[34]\d{2}/)ه(/\d{1,2})', r'\g<1>5\2', t)
+    t = re.sub(r'([\d٠-٩]+[/\-.][\d٠-٩]+[/\-.][\d٠-٩]+)\s*هو(?=[^٠-٩\w]|$)', r'\1هـ', t)
+    return t
+
+
+# (OCR input, expected output)
+CORPUS = [
+    # ه→٥ in Arabic-Indic dates
+    ('تاريخ الجلسة ه/ه/١٤٤٢هـ', 'تاريخ الجلسة ٥/٥/١٤٤٢هـ'),
+    ('تاريخ الجلسة ه/٣/١٤٤٢هـ', 'تاريخ الجلسة ٥/٣/١٤٤٢هـ'),
+    ('بتاريخ ١٢/ه/١٤٣٥هـ', 'بتاريخ ١٢/٥/١٤٣٥هـ'),
+    ('بتاريخ ١٤٣٥/١٢/ه', 'بتاريخ ١٤٣٥/١٢/٥'),
+    ('بتاريخ ١٤٣٥/١٢/ه وقد', 'بتاريخ ١٤٣٥/١٢/٥ وقد'),
+    ('بتاريخ ١٤٣٥/ه/١٢', 'بتاريخ ١٤٣٥/٥/١٢'),
+    ('في ١٣٩٩/ه/٢ هـ', 'في ١٣٩٩/٥/٢ هـ'),
+    # ه→5 in Western digit dates
+    ('الجلسة ه/ه/1440هـ', 'الجلسة 5/5/1440هـ'),
+    ('الجلسة ه/7/1440هـ', 'الجلسة 5/7/1440هـ'),
+    ('الجلسة 21/ه/1440هـ', 'الجلسة 21/5/1440هـ'),
+    ('الجلسة 1440/2/ه', 'الجلسة 1440/2/5'),
+    ('الجلسة 1440/ه/17', 'الجلسة 1440/5/17'),
+    # هو→هـ after dates
+    ('بتاريخ ٧/١/١٤٤٢هو', 'بتاريخ ٧/١/١٤٤٢هـ'),
+    ('بتاريخ 7/1/1442 هو.', 'بتاريخ 7/1/1442هـ.'),
+    ('بتاريخ ٢٣-١-١٣٩٥ هو،', 'بتاريخ ٢٣-١-١٣٩٥هـ،'),
+    ('بتاريخ ه/١/١٤٤٢هو', 'بتاريخ ٥/١/١٤٤٢هـ'),
+    ('بتاريخ 1442/1/ه هو', 'بتاريخ 1442/1/5هـ'),
+    # Must NOT change: no Hijri year, real words, هوية
+    ('قرار ه/٢/١ لعام ١٤٠٢هـ', 'قرار ه/٢/١ لعام ١٤٠٢هـ'),
+    ('ه/ه/١٢٥٠', 'ه/ه/١٢٥٠'),
+    ('وجه/الدعوى', 'وجه/الدعوى'),
+    ('بتاريخ ٧/١/١٤٤٢ هوية', 'بتاريخ ٧/١/١٤٤٢ هوية'),
+    ('هو الذي قضى في ١٤٤٢', 'هو الذي قضى في ١٤٤٢'),
+    ('الجلسة 1440/2/ه1', 'الجلسة 1440/2/ه1'),
+    ('', ''),
+]
+
+
+def check_corpus():
+    failures = 0
+    for text, expected in CORPUS:
+        got = fix_ocr_dates(text)
+        legacy = legacy_fix_ocr_dates(text)
+        if got != expected or legacy != expected:
+            failures += 1
+            print(f"FAIL: {text!r}\n  expected: {expected!r}\n  engine:   {got!r}\n  legacy:   {legacy!r}")
+    print(f"Corpus: {len(CORPUS) - failures}/{len(CORPUS)} passed")
+    return failures
+
+
+def check_fuzz(rounds=20000, seed=1435):
+    """Random strings over the characters the rules care about."""
+    rng = random.Random(seed)
+    tokens = ['ه', 'و', 'هو', '/', '-', '.', ' ', '\n', 'ـ', 'ي', 'ة', 'ال',
+              '١', '٣', '٤', '٥', '٢', '1', '3', '4', '2', '14', '13', '١٤', '١٣',
+              '١٤٤٢', '1440', '١٣٩٩', '12', '١٢']
+    failures = 0
+    for _ in range(rounds):
+        text = ''.join(rng.choice(tokens) for _ in range(rng.randint(0, 25)))
+        if fix_ocr_dates(text) != legacy_fix_ocr_dates(text):
+            failures += 1
+            if failures <= 5:
+                print(f"FUZZ MISMATCH: {text!r}\n  engine: {fix_ocr_dates(text)!r}\n"
+                      f"  legacy: {legacy_fix_ocr_dates(text)!r}")
+    print(f"Fuzz: {rounds - failures}/{rounds} identical to legacy cascade")
+    return failures
+
+
+def benchmark(repeat=50):
+    paragraph = ('وحيث إن المدعي تقدم بدعواه بتاريخ ه/٣/١٤٤٢هو إلى المحكمة الإدارية، '
+                 'وقد نظرت الدائرة الدعوى على النحو المبين بمحضر الجلسة، وهو ما ')
+    plain = 'وحيث إن الثابت من الأوراق أن الجهة الإدارية أصدرت قرارها محل الطعن. ' * 20
+    text = (paragraph + plain) * 40
+    assert fix_ocr_dates(text) == legacy_fix_ocr_dates(text)
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        legacy_fix_ocr_dates(text)
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fix_ocr_dates(text)
+    t_engine = time.perf_counter() - t0
+
+    print(f"Benchmark ({len(text):,} chars x {repeat}): legacy {t_legacy * 1000:.1f} ms, "
+          f"engine {t_engine * 1000:.1f} ms ({t_legacy / max(t_engine, 1e-9):.1f}x)")
+
+
+if __name__ == '__main__':
+    failed = check_corpus() + check_fuzz()
+    benchmark()
+    sys.exit(1 if failed else 0)
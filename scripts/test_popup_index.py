@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test boe_parser.PopupIndex against the per-article searches it replaced.
+
+Builds a synthetic BOE law page (articles, some amended with a popup-list of
+previous versions, the popup id in data-articleid) and checks that:
+  - PopupIndex.popup(id) is the div soup.find('div', class_=id) returns,
+    for every amended article and for ids with no popup;
+  - PopupIndex.in_popup_list(c) agrees with find_parent('div',
+    class_='popup-list') for every HTMLContainer on the page;
+  - parse_law_html gives the original text and amendment count per article.
+Prints the lookup timings of both at the end.
+
+Usage:
+    python scripts/test_popup_index.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent))
+from bs4 import BeautifulSoup
+from boe_parser import PopupIndex, parse_law_html
+
+ARTICLES = 600
+AMENDED_EVERY = 2
+VERSIONS = 3
+
+
+def make_page(articles=ARTICLES):
+    parts = ['<html><head><title>نظام تجريبي</title></head><body><div class="law-body">',
+             '<div class="HTMLContainer">بعون الله تعالى<br>مرسوم ملكي رقم م/1 بتاريخ 1/1/1440</div>']
+    for n in range(1, articles + 1):
+        amended = n % AMENDED_EVERY == 0
+        cls = 'article_item changed-article' if amended else 'article_item'
+        parts.append(f'<div class="{cls}"><h3>المادة ({n})</h3>')
+        if amended:
+            parts.append(f'<a class="ancArticlePrevVersions" data-articleid="art{n}">التعديلات</a>'
+                         f'<div class="popup-list art{n}">')
+            for v in range(VERSIONS):
+                parts.append(f'<div class="article_item_popup"><h3>المادة ({n})</h3>'
+                             f'<div class="HTMLContainer">عدلت الفقرة (أ) بموجب المرسوم الملكي رقم (م/{v}) '
+                             f'وتاريخ 1/{v + 1}/1441 لتكون بالنص الآتي: "نص معدل {v}"</div></div>')
+            parts.append('</div>')
+        parts.append(f'<div class="HTMLContainer">أ- نص الفقرة الأولى من المادة {n}<br>'
+                     f'ب- نص الفقرة الثانية</div></div>')
+    parts.append('</div></body></html>')
+    return ''.join(parts)
+
+
+def check(soup, popups):
+    failures = 0
+    ids = [a['data-articleid'] for a in soup.find_all('a', class_='ancArticlePrevVersions')]
+    for aid in ids + ['art0', 'missing']:
+        if popups.popup(aid) is not soup.find('div', class_=aid):
+            failures += 1
+            print(f"FAIL popup({aid!r}) differs from soup.find")
+    containers = soup.find_all('div', class_='HTMLContainer')
+    for c in containers:
+        if popups.in_popup_list(c) != (c.find_parent('div', class_='popup-list') is not None):
+            failures += 1
+            print(f"FAIL in_popup_list differs from find_parent: {c.get_text()[:40]!r}")
+    print(f"  {len(ids)} popups, {len(containers)} HTMLContainers")
+    return failures
+
+
+def check_parse(html):
+    failures = 0
+    law = parse_law_html(html)
+    if len(law['articles']) != ARTICLES:
+        failures += 1
+        print(f"FAIL {len(law['articles'])} articles parsed, expected {ARTICLES}")
+    for n, art in enumerate(law['articles'], 1):
+        expected = VERSIONS if n % AMENDED_EVERY == 0 else 0
+        if not art['original_text'].startswith(f'أ- نص الفقرة الأولى من المادة {n}\n'):
+            failures += 1
+            print(f"FAIL article {n}: original text taken from a popup")
+        if len(art['amendments']) != expected:
+            failures += 1
+            print(f"FAIL article {n}: {len(art['amendments'])} amendments, expected {expected}")
+    return failures
+
+
+def benchmark(soup):
+    ids = [a['data-articleid'] for a in soup.find_all('a', class_='ancArticlePrevVersions')]
+    containers = soup.find_all('div', class_='HTMLContainer')
+    t0 = time.perf_counter()
+    for aid in ids:
+        soup.find('div', class_=aid)
+    for c in containers:
+        c.find_parent('div', class_='popup-list')
+    t_search = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    popups = PopupIndex(soup)
+    for aid in ids:
+        popups.popup(aid)
+    for c in containers:
+        popups.in_popup_list(c)
+    t_index = time.perf_counter() - t0
+    print(f"\n  {len(ids)} popup lookups + {len(containers)} container checks: "
+          f"searches {t_search * 1e3:.0f}ms, index (build included) {t_index * 1e3:.0f}ms")
+
+
+if __name__ == '__main__':
+    html = make_page()
+    soup = BeautifulSoup(html, 'html.parser')
+    print("Popup index:")
+    failed = check(soup, PopupIndex(soup))
+    failed += check_parse(html)
+    benchmark(soup)
+    sys.exit(1 if failed else 0)
@@ -12,6 +12,8 @@
 
 // Each entry: [wrong, right]
 // Ordered: longer patterns first to avoid partial matches
+// scripts/fts_shadow.py parses this table for the normalized FTS indexes;
+// re-run it after editing (keep the one-pair-per-line ['wrong', 'right'] form)
 const LEGAL_CORRECTIONS: [string, string][] = [
   // === استئناف variants (most critical) ===
   ['الاستئناق', 'الاستئناف'],
@@ -176,7 +176,8 @@ try {
         );
     `);
 
-    // Populate from law JSON files if table is empty
+    // Populate from law JSON files if table is empty. The shipped data.db is prebuilt
+    // (and kept current per law) by scripts/law_articles_index.py, so this is only a fallback.
     const laCount = sqlite.prepare("SELECT count(*) as cnt FROM law_articles").get() as any;
     if (laCount.cnt === 0) {
         const libraryPath = path.join(process.cwd(), "client", "public", "data", "library.json");
@@ -253,6 +254,30 @@ try {
     console.warn("Law articles FTS setup:", e.message);
 }
 
+// Normalized shadow FTS indexes (law_articles_norm_fts / judgments_norm_fts),
+// built by scripts/fts_shadow.py. Used only while fts_shadow_state still
+// matches the base table; rows written by anything else (TS importers, the
+// reindex above) leave them stale, and search falls back to the plain index.
+export const normalizedFts = { lawArticles: false, judgments: false, stems: false };
+try {
+    const hasState = sqlite.prepare("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'fts_shadow_state'").get();
+    if (hasState) {
+        for (const [key, base] of [["lawArticles", "law_articles"], ["judgments", "judgments"]] as const) {
+            const state = sqlite.prepare("SELECT row_count, max_id FROM fts_shadow_state WHERE base_table = ?").get(base) as any;
+            if (!state) continue;
+            const live = sqlite.prepare(`SELECT count(*) as cnt, COALESCE(MAX(id), 0) as maxId FROM ${base}`).get() as any;
+            normalizedFts[key] = state.row_count === live.cnt && state.max_id === live.maxId;
+            console.log(normalizedFts[key]
+                ? `Normalized FTS: ${base}_norm_fts (${live.cnt} rows)`
+                : `Normalized FTS: ${base}_norm_fts is stale — run scripts/fts_shadow.py; using ${base}_fts`);
+        }
+        // Word -> stem dictionary for queries on the `stem` column of the shadow indexes
+        normalizedFts.stems = !!sqlite.prepare("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'fts_stems'").get();
+    }
+} catch (e: any) {
+    console.warn("Normalized FTS check:", e.message);
+}
+
 // ============================================
 // Search Analytics Tables
 // ============================================
@@ -5,12 +5,12 @@ import path from "path";
 import { storage } from "./storage";
 import { api } from "@shared/routes";
 import { registerAuthRoutes, isAuthenticated, isAdmin, setupAuthSchema } from "./authSystem";
-import { db, sqlite } from "./db";
+import { db, sqlite, normalizedFts } from "./db";
 import { articleOverrides, errorReports, judgments, gazetteIndex, crsdPrinciples, crsdDecisions } from "@shared/schema";
 import { eq, and, desc, sql, like } from "drizzle-orm";
 import { readLatestLegalMonitoringReport, runLegalMonitoringScan } from "./legalMonitoring";
 import { setupAnalyticsSchema, recordAnalyticsEvent } from "./analytics";
-import { buildLegalFtsQuery, buildLiteralFtsQuery } from "./searchUtils";
+import { buildLegalFtsQuery, buildLiteralFtsQuery, buildNormalizedFtsQuery, buildStemmedFtsQuery } from "./searchUtils";
 import { arabicNormalizerMiddleware } from "./arabicTextNormalizer";
 
 const saudiGazetteCategoryCaseSql = (alias: string) => `
@@ -609,41 +609,64 @@ export async function registerRoutes(
     return mainQuery || raw.trim().split(/\s+/).map(w => `${w}*`).join(" ");
   }
 
+  // Normalized shadow indexes (scripts/fts_shadow.py) when server/db.ts found them current.
+  // law_articles_norm_fts has no law_id / article_number columns: article_text is column 1
+  const LAWS_FTS = normalizedFts.lawArticles ? "law_articles_norm_fts" : "law_articles_fts";
+  const LAWS_TEXT_COL = normalizedFts.lawArticles ? 1 : 3;
+  const JUDGMENTS_FTS = normalizedFts.judgments ? "judgments_norm_fts" : "judgments_fts";
+  // The last column of both shadow indexes is `stem` (the stemmed article/judgment
+  // text); stemmed queries match only there, so their snippets are taken from it
+  const LAWS_STEM_COL = 3;
+  const JUDGMENTS_STEM_COL = 2;
+  const judgmentsSnippetCol = (stemmed: boolean) => stemmed ? JUDGMENTS_STEM_COL : 0;
+
+  // Word -> stem dictionary written by scripts/fts_shadow.py; words it does not
+  // list are their own stem (or were never indexed)
+  const stemLookupStmt = normalizedFts.stems ? sqlite.prepare("SELECT stem FROM fts_stems WHERE word = ?").pluck() : null;
+  const stemOf = (word: string) => stemLookupStmt?.get(word) as string | undefined;
+  // Stemmed form of a query, or "" when the stem column is not available
+  const buildStemQuery = (raw: string, build: (query: string) => string) =>
+    normalizedFts.stems ? buildStemmedFtsQuery(raw, build, stemOf) : "";
+
   // Prepared statements for search (faster than building each time)
-  const searchLawsStmt = sqlite.prepare(`
+  const lawsSearchSql = (snippetCol: number) => `
     SELECT la.law_id, la.law_name, la.article_number, la.article_heading,
-           snippet(law_articles_fts, 3, '【', '】', '...', 40) as textSnippet,
-           bm25(law_articles_fts) as rank
+           snippet(${LAWS_FTS}, ${snippetCol}, '【', '】', '...', 40) as textSnippet,
+           bm25(${LAWS_FTS}) as rank
     FROM law_articles la
-    INNER JOIN law_articles_fts fts ON la.id = fts.rowid
-    WHERE law_articles_fts MATCH ?
+    INNER JOIN ${LAWS_FTS} fts ON la.id = fts.rowid
+    WHERE ${LAWS_FTS} MATCH ?
     ORDER BY rank
     LIMIT ? OFFSET ?
-  `);
+  `;
+  const searchLawsStmt = sqlite.prepare(lawsSearchSql(LAWS_TEXT_COL));
+  const searchLawsStemStmt = normalizedFts.stems ? sqlite.prepare(lawsSearchSql(LAWS_STEM_COL)) : searchLawsStmt;
 
   const countLawsStmt = sqlite.prepare(`
     SELECT count(*) as count
     FROM law_articles la
-    INNER JOIN law_articles_fts fts ON la.id = fts.rowid
-    WHERE law_articles_fts MATCH ?
+    INNER JOIN ${LAWS_FTS} fts ON la.id = fts.rowid
+    WHERE ${LAWS_FTS} MATCH ?
   `);
 
-  const searchJudgmentsStmt = sqlite.prepare(`
+  const judgmentsSearchSql = (snippetCol: number, where = "") => `
     SELECT j.id, j.case_id, j.year_hijri, j.city, j.court_body, j.judgment_date, j.source,
-           snippet(judgments_fts, 0, '【', '】', '...', 40) as textSnippet,
-           bm25(judgments_fts) as rank
+           snippet(${JUDGMENTS_FTS}, ${snippetCol}, '【', '】', '...', 40) as textSnippet,
+           bm25(${JUDGMENTS_FTS}) as rank
     FROM judgments j
-    INNER JOIN judgments_fts fts ON j.id = fts.rowid
-    WHERE judgments_fts MATCH ?
+    INNER JOIN ${JUDGMENTS_FTS} fts ON j.id = fts.rowid
+    WHERE ${JUDGMENTS_FTS} MATCH ?${where}
     ORDER BY rank
     LIMIT ? OFFSET ?
-  `);
+  `;
+  const searchJudgmentsStmt = sqlite.prepare(judgmentsSearchSql(0));
+  const searchJudgmentsStemStmt = normalizedFts.stems ? sqlite.prepare(judgmentsSearchSql(JUDGMENTS_STEM_COL)) : searchJudgmentsStmt;
 
   const countJudgmentsStmt = sqlite.prepare(`
     SELECT count(*) as count
     FROM judgments j
-    INNER JOIN judgments_fts fts ON j.id = fts.rowid
-    WHERE judgments_fts MATCH ?
+    INNER JOIN ${JUDGMENTS_FTS} fts ON j.id = fts.rowid
+    WHERE ${JUDGMENTS_FTS} MATCH ?
   `);
 
   const searchGazetteStmt = sqlite.prepare(`
@@ -764,9 +787,18 @@ export async function registerRoutes(
       const intent = detectSearchIntent(q);
       const effectiveType = type !== "all" ? type : intent.type;
       // Use literal FTS query for exact mode, otherwise smart query with synonym expansion
-      const ftsQuery = exact === "true"
-        ? buildLiteralFtsQuery(q)
-        : buildFtsQuery(q, intent.expandedTerms);
+      const buildQuery = (raw: string) => exact === "true"
+        ? buildLiteralFtsQuery(raw)
+        : buildFtsQuery(raw, intent.expandedTerms);
+      const ftsQuery = buildQuery(q);
+      // The normalized indexes need the corrected, folded form of the same query;
+      // outside exact mode it is matched on stems (one term per word, no prefix scans)
+      const normFtsQuery = buildNormalizedFtsQuery(q, buildQuery);
+      const stemFtsQuery = exact === "true" ? "" : buildStemQuery(q, buildQuery);
+      const lawsStemmed = normalizedFts.lawArticles && stemFtsQuery !== "";
+      const judgmentsStemmed = normalizedFts.judgments && stemFtsQuery !== "";
+      const lawsFtsQuery = normalizedFts.lawArticles ? stemFtsQuery || normFtsQuery : ftsQuery;
+      const judgmentsFtsQuery = normalizedFts.judgments ? stemFtsQuery || normFtsQuery : ftsQuery;
 
       // Search all sources — fetch limit+1 rows to detect "has more" without COUNT(*)
       const searchWithEstimate = (stmt: any, ftsQ: string, lim: number, off: number) => {
@@ -778,7 +810,7 @@ export async function registerRoutes(
 
       const searchLaws = () => {
         if (type !== "all" && type !== "laws") return { items: [], total: 0 };
-        try { return searchWithEstimate(searchLawsStmt, ftsQuery, limit, offset); }
+        try { return searchWithEstimate(lawsStemmed ? searchLawsStemStmt : searchLawsStmt, lawsFtsQuery, limit, offset); }
         catch { return { items: [], total: 0 }; }
       };
 
@@ -786,19 +818,10 @@ export async function registerRoutes(
         if (type !== "all" && type !== "judgments") return { items: [], total: 0 };
         try {
           if (saudiOnly) {
-            const saudiStmt = sqlite.prepare(`
-              SELECT j.id, j.case_id, j.year_hijri, j.city, j.court_body, j.judgment_date, j.source,
-                     snippet(judgments_fts, 0, '【', '】', '...', 40) as textSnippet,
-                     bm25(judgments_fts) as rank
-              FROM judgments j
-              INNER JOIN judgments_fts fts ON j.id = fts.rowid
-              WHERE judgments_fts MATCH ? AND j.source != 'eg_naqd'
-              ORDER BY rank
-              LIMIT ? OFFSET ?
-            `);
-            return searchWithEstimate(saudiStmt, ftsQuery, limit, offset);
+            const saudiStmt = sqlite.prepare(judgmentsSearchSql(judgmentsSnippetCol(judgmentsStemmed), " AND j.source != 'eg_naqd'"));
+            return searchWithEstimate(saudiStmt, judgmentsFtsQuery, limit, offset);
           }
-          return searchWithEstimate(searchJudgmentsStmt, ftsQuery, limit, offset);
+          return searchWithEstimate(judgmentsStemmed ? searchJudgmentsStemStmt : searchJudgmentsStmt, judgmentsFtsQuery, limit, offset);
         } catch { return { items: [], total: 0 }; }
       };
 
@@ -868,19 +891,19 @@ export async function registerRoutes(
             const yearFacets = sqlite.prepare(`
               SELECT j.year_hijri as year, count(*) as count
               FROM judgments j
-              INNER JOIN judgments_fts fts ON j.id = fts.rowid
-              WHERE judgments_fts MATCH ? AND j.year_hijri IS NOT NULL
+              INNER JOIN ${JUDGMENTS_FTS} fts ON j.id = fts.rowid
+              WHERE ${JUDGMENTS_FTS} MATCH ? AND j.year_hijri IS NOT NULL
               GROUP BY j.year_hijri ORDER BY count DESC LIMIT 10
-            `).all(ftsQuery) as any[];
+            `).all(judgmentsFtsQuery) as any[];
             facets.years = yearFacets;
 
             const cityFacets = sqlite.prepare(`
               SELECT j.city as city, count(*) as count
               FROM judgments j
-              INNER JOIN judgments_fts fts ON j.id = fts.rowid
-              WHERE judgments_fts MATCH ? AND j.city IS NOT NULL AND j.city != ''
+              INNER JOIN ${JUDGMENTS_FTS} fts ON j.id = fts.rowid
+              WHERE ${JUDGMENTS_FTS} MATCH ? AND j.city IS NOT NULL AND j.city != ''
               GROUP BY j.city ORDER BY count DESC LIMIT 10
-            `).all(ftsQuery) as any[];
+            `).all(judgmentsFtsQuery) as any[];
             facets.cities = cityFacets;
           }
 
@@ -961,7 +984,12 @@ export async function registerRoutes(
 
       if (!lawName && !lawId) return res.json({ judgments: [], gazette: [] });
 
-      const searchTerm = (lawName || "").split(/\s+/).slice(0, 4).map(w => `${w}*`).join(" ");
+      const buildTerm = (name: string) => name.split(/\s+/).slice(0, 4).map(w => `${w}*`).join(" ");
+      const searchTerm = buildTerm(lawName || "");
+      const stemTerm = normalizedFts.judgments ? buildStemQuery(lawName || "", buildTerm) : "";
+      const judgmentsTerm = normalizedFts.judgments
+        ? stemTerm || buildNormalizedFtsQuery(lawName || "", buildTerm)
+        : searchTerm;
 
       let relatedJudgments: any[] = [];
       let relatedGazette: any[] = [];
@@ -970,13 +998,13 @@ export async function registerRoutes(
         try {
           relatedJudgments = sqlite.prepare(`
             SELECT j.id, j.court_body, j.city, j.year_hijri,
-                   snippet(judgments_fts, 0, '【', '】', '...', 30) as textSnippet
+                   snippet(${JUDGMENTS_FTS}, ${judgmentsSnippetCol(stemTerm !== "")}, '【', '】', '...', 30) as textSnippet
             FROM judgments j
-            INNER JOIN judgments_fts fts ON j.id = fts.rowid
-            WHERE judgments_fts MATCH ?
-            ORDER BY bm25(judgments_fts)
+            INNER JOIN ${JUDGMENTS_FTS} fts ON j.id = fts.rowid
+            WHERE ${JUDGMENTS_FTS} MATCH ?
+            ORDER BY bm25(${JUDGMENTS_FTS})
             LIMIT ?
-          `).all(searchTerm, limit) as any[];
+          `).all(judgmentsTerm, limit) as any[];
         } catch {}
 
         try {
@@ -1005,6 +1033,106 @@ export async function registerRoutes(
     }
   });
 
+  // ============================================
+  // Law Citations API - laws a law cites and laws citing it
+  // (law_citations is built offline by scripts/law_citations.py)
+  // ============================================
+  app.get("/api/laws/:lawId/citations", async (req, res) => {
+    try {
+      const { lawId } = req.params;
+      const limit = Math.min(parseInt(req.query.limit as string) || 50, 500);
+      const toEdge = (row: any) => ({
+        lawId: row.lawId,
+        lawName: row.lawName,
+        mentions: row.mentions,
+        citingArticles: JSON.parse(row.srcArticles),
+        citedArticles: JSON.parse(row.dstArticles),
+      });
+
+      const outbound = sqlite.prepare(`
+        SELECT dst_law_id as lawId, dst_name as lawName, mentions,
+               src_articles as srcArticles, dst_articles as dstArticles
+        FROM law_citations WHERE src_law_id = ?
+        ORDER BY mentions DESC LIMIT ?
+      `).all(lawId, limit) as any[];
+      const inbound = sqlite.prepare(`
+        SELECT src_law_id as lawId, src_name as lawName, mentions,
+               src_articles as srcArticles, dst_articles as dstArticles
+        FROM law_citations WHERE dst_law_id = ?
+        ORDER BY mentions DESC LIMIT ?
+      `).all(lawId, limit) as any[];
+
+      res.set("Cache-Control", "public, max-age=3600");
+      res.json({ cites: outbound.map(toEdge), citedBy: inbound.map(toEdge) });
+    } catch {
+      res.json({ cites: [], citedBy: [] });
+    }
+  });
+
+  // ============================================
+  // Article Versions API - text of an amended article as of a Hijri date
+  // (article_versions is built offline by scripts/amendment_timeline.py:
+  // full snapshots every few versions, line diffs in between)
+  // ============================================
+  // "1440/11/27" or "27/11/1440" (Arabic-Indic digits too) -> "1440/11/27", else null;
+  // same rules as amendment_timeline.hijri_key + format_hijri
+  const hijriDateKey = (date: string): string | null => {
+    const western = date.replace(/[٠-٩]/g, (d) => String(d.charCodeAt(0) - 0x0660))
+      .replace(/[۰-۹]/g, (d) => String(d.charCodeAt(0) - 0x06F0));
+    const m = western.match(/(\d+)\s*\/\s*(\d+)\s*\/\s*(\d+)/);
+    if (!m) return null;
+    let [a, b, c] = [parseInt(m[1]), parseInt(m[2]), parseInt(m[3])];
+    if (c > 31 && a <= 31) [a, c] = [c, a];
+    if (a < 1000 || b < 1 || b > 12) return null;
+    return `${String(a).padStart(4, "0")}/${String(b).padStart(2, "0")}/${String(c).padStart(2, "0")}`;
+  };
+
+  app.get("/api/laws/:lawId/articles/:index/versions", async (req, res) => {
+    try {
+      const { lawId } = req.params;
+      const index = parseInt(req.params.index);
+      // Same YYYY/MM/DD form as article_versions.date_hijri
+      const rawAsOf = ((req.query.asOf as string) || "").trim();
+      const asOf = rawAsOf ? hijriDateKey(rawAsOf) : "";
+      if (asOf === null) {
+        return res.status(400).json({ message: "asOf must be a Hijri date (YYYY/MM/DD or DD/MM/YYYY)" });
+      }
+
+      const rows = sqlite.prepare(`
+        SELECT version, date_hijri as dateHijri, decree, applied, snapshot, diff
+        FROM article_versions WHERE law_id = ? AND article_index = ?
+        ORDER BY version
+      `).all(lawId, index) as any[];
+      if (rows.length === 0) return res.json({ versions: [], version: null, text: null });
+
+      // Undated amendments go with the version before them
+      let target = rows.length - 1;
+      if (asOf) {
+        target = 0;
+        for (const row of rows.slice(1)) {
+          if (row.dateHijri && row.dateHijri > asOf) break;
+          target = row.version;
+        }
+      }
+      let start = target;
+      while (rows[start].snapshot === null) start--;
+      const lines: string[] = rows[start].snapshot.split("\n");
+      for (const row of rows.slice(start + 1, target + 1)) {
+        const ops = JSON.parse(row.diff) as [number, number, string[]][];
+        for (const [from, to, repl] of ops.reverse()) lines.splice(from, to - from, ...repl);
+      }
+
+      res.set("Cache-Control", "public, max-age=3600");
+      res.json({
+        versions: rows.map(({ version, dateHijri, decree, applied }) => ({ version, dateHijri, decree, applied: !!applied })),
+        version: target,
+        text: lines.join("\n"),
+      });
+    } catch {
+      res.json({ versions: [], version: null, text: null });
+    }
+  });
+
   // ============================================
   // Search Statistics API
   // ============================================
@@ -1345,9 +1473,15 @@ export async function registerRoutes(
           else if (sort === "court") orderSQL = "ORDER BY j.court_body";
 
           // Better Arabic search: use exact/literal search or legal synonym-expanded search
-          const ftsQuery = exact === "true"
-            ? buildLiteralFtsQuery(q)
-            : buildLegalFtsQuery(q) || q.trim().split(/\s+/).map((w: string) => `${w}*`).join(" ");
+          const buildQuery = (raw: string) => exact === "true"
+            ? buildLiteralFtsQuery(raw)
+            : buildLegalFtsQuery(raw) || raw.trim().split(/\s+/).map((w: string) => `${w}*`).join(" ");
+          const ftsQuery = buildQuery(q);
+          const stemFtsQuery = exact === "true" || !normalizedFts.judgments ? "" : buildStemQuery(q, buildQuery);
+          const judgmentsFtsQuery = normalizedFts.judgments
+            ? stemFtsQuery || buildNormalizedFtsQuery(q, buildQuery)
+            : ftsQuery;
+          const snippetCol = judgmentsSnippetCol(stemFtsQuery !== "");
 
           // Include CRSD decisions via UNION ALL when applicable
           if (includeCrsd) {
@@ -1361,14 +1495,14 @@ export async function registerRoutes(
             const countResult = sqlite.prepare(`
               SELECT (
                 SELECT count(*) FROM judgments j
-                INNER JOIN judgments_fts fts ON j.id = fts.rowid
-                WHERE judgments_fts MATCH ? ${filterSQL}
+                INNER JOIN ${JUDGMENTS_FTS} fts ON j.id = fts.rowid
+                WHERE ${JUDGMENTS_FTS} MATCH ? ${filterSQL}
               ) + (
                 SELECT count(*) FROM crsd_decisions d
                 INNER JOIN crsd_decisions_fts cfts ON d.id = cfts.rowid
                 WHERE crsd_decisions_fts MATCH ?${crsdFilterSQL}
               ) as count
-            `).get(ftsQuery, ...params, ftsQuery, ...crsdParams) as any;
+            `).get(judgmentsFtsQuery, ...params, ftsQuery, ...crsdParams) as any;
 
             const results = sqlite.prepare(`
               SELECT * FROM (
@@ -1376,11 +1510,11 @@ export async function registerRoutes(
                        j.court_body as courtBody, j.circuit_type as circuitType,
                        j.judgment_number as judgmentNumber, j.judgment_date as judgmentDate,
                        j.source, j.appeal_type as appealType,
-                       snippet(judgments_fts, 0, '【', '】', '...', 40) as textSnippet,
-                       bm25(judgments_fts) as rank
+                       snippet(${JUDGMENTS_FTS}, ${snippetCol}, '【', '】', '...', 40) as textSnippet,
+                       bm25(${JUDGMENTS_FTS}) as rank
                 FROM judgments j
-                INNER JOIN judgments_fts fts ON j.id = fts.rowid
-                WHERE judgments_fts MATCH ? ${filterSQL}
+                INNER JOIN ${JUDGMENTS_FTS} fts ON j.id = fts.rowid
+                WHERE ${JUDGMENTS_FTS} MATCH ? ${filterSQL}
                 UNION ALL
                 SELECT d.id + 10000000 as id, 'crsd-' || d.id as caseId, d.year_hijri as yearHijri,
                        '' as city, d.committee_ar as courtBody,
@@ -1396,7 +1530,7 @@ export async function registerRoutes(
               ) combined
               ORDER BY rank
               LIMIT ? OFFSET ?
-            `).all(ftsQuery, ...params, ftsQuery, ...crsdParams, limit, offset);
+            `).all(judgmentsFtsQuery, ...params, ftsQuery, ...crsdParams, limit, offset);
 
             return res.json({
               data: results,
@@ -1412,25 +1546,25 @@ export async function registerRoutes(
           // Standard FTS query (specific source or city/judge filter active)
           const countStmt = sqlite.prepare(`
             SELECT count(*) as count FROM judgments j
-            INNER JOIN judgments_fts fts ON j.id = fts.rowid
-            WHERE judgments_fts MATCH ? ${filterSQL}
+            INNER JOIN ${JUDGMENTS_FTS} fts ON j.id = fts.rowid
+            WHERE ${JUDGMENTS_FTS} MATCH ? ${filterSQL}
           `);
-          const countResult = countStmt.get(ftsQuery, ...params) as any;
+          const countResult = countStmt.get(judgmentsFtsQuery, ...params) as any;
 
           const dataStmt = sqlite.prepare(`
             SELECT j.id, j.case_id as caseId, j.year_hijri as yearHijri, j.city,
                    j.court_body as courtBody, j.circuit_type as circuitType,
                    j.judgment_number as judgmentNumber, j.judgment_date as judgmentDate,
                    j.source, j.appeal_type as appealType,
-                   snippet(judgments_fts, 0, '【', '】', '...', 40) as textSnippet,
-                   bm25(judgments_fts) as rank
+                   snippet(${JUDGMENTS_FTS}, ${snippetCol}, '【', '】', '...', 40) as textSnippet,
+                   bm25(${JUDGMENTS_FTS}) as rank
             FROM judgments j
-            INNER JOIN judgments_fts fts ON j.id = fts.rowid
-            WHERE judgments_fts MATCH ? ${filterSQL}
+            INNER JOIN ${JUDGMENTS_FTS} fts ON j.id = fts.rowid
+            WHERE ${JUDGMENTS_FTS} MATCH ? ${filterSQL}
             ORDER BY rank
             LIMIT ? OFFSET ?
           `);
-          const results = dataStmt.all(ftsQuery, ...params, limit, offset);
+          const results = dataStmt.all(judgmentsFtsQuery, ...params, limit, offset);
 
           return res.json({
             data: results,
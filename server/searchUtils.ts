@@ -1,3 +1,5 @@
+import { normalizeArabicText } from "./arabicTextNormalizer";
+
 const ARABIC_STOP_WORDS = new Set([
   "في", "من", "على", "الى", "إلى", "عن", "مع", "ثم", "أو", "او", "و", "ال", "أن", "ان", "ما", "لا", "لم", "لن", "قد", "هذا", "هذه",
 ]);
@@ -69,3 +71,41 @@ export function buildLiteralFtsQuery(rawQuery: string): string {
   if (!normalized) return "";
   return `"${normalized.replace(/"/g, "").trim()}"`;
 }
+
+/**
+ * FTS5 query for the normalized shadow indexes built by scripts/fts_shadow.py
+ * (law_articles_norm_fts, judgments_norm_fts). Those hold text passed through
+ * LEGAL_CORRECTIONS and then the same fold as normalizeArabic, so the raw query
+ * gets the corrections before it is built and the built query gets the fold.
+ * The `stem` column is left out: this is the exact-word form.
+ */
+export function buildNormalizedFtsQuery(rawQuery: string, build: (query: string) => string): string {
+  const query = normalizeArabic(build(normalizeArabicText(rawQuery).text));
+  return query ? `- stem : (${query})` : "";
+}
+
+const ARABIC_WORD = /"([^"]*)"|[\u0621-\u064A]+\*?/g;
+
+/**
+ * Same as buildNormalizedFtsQuery, but matched against the `stem` column of the
+ * shadow indexes: every word with an entry in fts_stems (the stem dictionary
+ * scripts/arabic_stemmer.py wrote while indexing) becomes one exact stem term,
+ * so "المحكمة*" no longer expands to every word starting with it. Words without
+ * an entry keep their own (prefix) form; quoted phrases are stemmed word by word.
+ */
+export function buildStemmedFtsQuery(
+  rawQuery: string,
+  build: (query: string) => string,
+  stemOf: (word: string) => string | undefined,
+): string {
+  const query = normalizeArabic(build(normalizeArabicText(rawQuery).text));
+  if (!query) return "";
+  const stemmed = query.replace(ARABIC_WORD, (match: string, phrase?: string) => {
+    if (phrase !== undefined) {
+      return `"${phrase.replace(/[\u0621-\u064A]+/g, (w) => stemOf(w) ?? w)}"`;
+    }
+    const word = match.endsWith("*") ? match.slice(0, -1) : match;
+    return stemOf(word) ?? match;
+  });
+  return `stem : (${stemmed})`;
+}